@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Recall/speed check of token-blocked dedup against the exact O(n^2) matcher.
+
+Record a corpus of candidate titles (every entry of every configured feed,
+grouped by region), then compare both matchers on it:
+
+    python benchmarks/dedup_recall.py --record benchmarks/corpus.json.gz
+    python benchmarks/dedup_recall.py benchmarks/corpus.json.gz
+
+A generated output/data.json also works as a corpus, though it only holds
+already-deduplicated headlines.
+
+Without a corpus, a synthetic one is generated from --seed: sets of 300 to
+10,000 titles drawn from a small news vocabulary or a 6,000-word Zipf
+vocabulary, where about a third rework an earlier title (shuffled, one word
+swapped or added, or a "BREAKING:" prefix). It exercises the blocking
+logic at sizes no single run reaches, but its titles are word salad, so
+only a recorded corpus says anything about recall on real headlines.
+
+Recall is the share of the exact matcher's duplicate decisions that the
+blocked matcher also makes. Because both are keep-first, a miss can change
+later decisions too, so the kept-list agreement is reported as well.
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import yaml  # noqa: E402
+from src.deduplicator import ArticleDeduplicator  # noqa: E402
+from src.fetcher import FeedFetcher  # noqa: E402
+from src.parser import Article, FeedParser  # noqa: E402
+
+
+def record(path: Path, config_path: Path) -> None:
+    """Fetch every configured feed and save all entry titles by region."""
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f)
+    fetcher = FeedFetcher(
+        user_agent=config['settings']['user_agent'],
+        timeout=config['settings']['request_timeout']
+    )
+    parser = FeedParser(max_entries=0)
+
+    regions = config['regions']
+    urls = [feed['url'] for region in regions.values() for feed in region['feeds']]
+    responses = fetcher.fetch_all(urls)
+
+    corpus = {}
+    for region_id, region in regions.items():
+        titles = []
+        for feed in region['feeds']:
+            response = responses.get(feed['url'])
+            if response:
+                titles.extend(a.title for a in parser.parse(response.content, feed['name'], response.headers))
+        corpus[region_id] = titles
+
+    with _open(path, 'w') as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=1)
+    print(f"Recorded {sum(len(t) for t in corpus.values())} titles to {path}")
+
+
+def _open(path: Path, mode: str):
+    """Open a corpus file, gzipped if it ends in .gz."""
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def load(path: Path) -> dict:
+    """Load {region: [title, ...]}, a data.json, or a plain list of titles."""
+    with _open(path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return {'all': data}
+    corpus = {}
+    for region_id, value in data.items():
+        if isinstance(value, dict):
+            value = [article['title'] for article in value.get('articles', [])]
+        corpus[region_id] = value
+    return corpus
+
+
+NEWS_WORDS = (
+    'president senate vote budget storm flood court judge ruling election minister talks peace deal '
+    'trade tariffs china ukraine russia israel gaza market stocks rally oil prices inflation fed rates '
+    'bank crisis school fire rescue police arrest suspect shooting team coach wins final cup record '
+    'apple google ai chip launch city mayor council plan housing rent climate heat wave drought '
+    'wildfire evacuate quake tsunami warning nasa rocket'
+).split()
+
+
+def synthetic_titles(count: int, rng: random.Random, words: list, weights: list = None) -> list:
+    """Titles where about a third rework an earlier original one."""
+    originals, titles = [], []
+    for _ in range(count):
+        if originals and rng.random() < 0.35:
+            title = rng.choice(originals).split()
+            operation = rng.random()
+            if operation < 0.3:
+                rng.shuffle(title)
+            elif operation < 0.6:
+                title[rng.randrange(len(title))] = rng.choices(words, weights)[0]
+            elif operation < 0.8:
+                title.append(rng.choices(words, weights)[0])
+            else:
+                title.insert(0, 'BREAKING:')
+        else:
+            title = rng.choices(words, weights, k=rng.randint(5, 12))
+            originals.append(' '.join(title))
+        titles.append(' '.join(title).capitalize())
+    return titles
+
+
+def synthetic(seed: int) -> dict:
+    """Generate the synthetic corpus: news-vocabulary and Zipf-vocabulary title sets."""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choices('abcdefghijklmnoprstuvw', k=rng.randint(3, 9))) for _ in range(6000)]
+    zipf = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    return {
+        'news-300': synthetic_titles(300, rng, NEWS_WORDS),
+        'news-3k': synthetic_titles(3000, rng, NEWS_WORDS),
+        'zipf-300': synthetic_titles(300, rng, vocabulary, zipf),
+        'zipf-3k': synthetic_titles(3000, rng, vocabulary, zipf),
+        'zipf-10k': synthetic_titles(10000, rng, vocabulary, zipf),
+    }
+
+
+def compare(name: str, titles: list, threshold: float) -> tuple:
+    now = datetime.now(timezone.utc)
+    articles = [Article(title, f'corpus:{i}', 'corpus', now) for i, title in enumerate(titles)]
+
+    results = {}
+    for index in ('exact', 'token'):
+        dedup = ArticleDeduplicator(similarity_threshold=threshold, index=index)
+        start = time.perf_counter()
+        ids = dedup.cluster(articles)
+        elapsed = time.perf_counter() - start
+        first = {}
+        duplicates = set()
+        for i, cluster_id in enumerate(ids):
+            if cluster_id in first:
+                duplicates.add(i)
+            else:
+                first[cluster_id] = i
+        results[index] = (duplicates, elapsed)
+
+    exact_dups, exact_time = results['exact']
+    token_dups, token_time = results['token']
+    found = len(exact_dups & token_dups)
+    recall = found / len(exact_dups) if exact_dups else 1.0
+    agree = exact_dups == token_dups
+    print(f"{name:<10} {len(titles):>6} {len(exact_dups):>6} {len(token_dups):>6} "
+          f"{recall:>7.1%} {'yes' if agree else 'no':>6} "
+          f"{exact_time * 1000:>9.1f} {token_time * 1000:>9.1f}")
+    return len(exact_dups), found
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('corpus', type=Path, nargs='?',
+                            help='corpus file (default: generate a synthetic corpus)')
+    arg_parser.add_argument('--record', action='store_true',
+                            help='fetch the configured feeds and write the corpus file')
+    arg_parser.add_argument('--config', type=Path, default=BASE_DIR / 'config' / 'feeds.yaml')
+    arg_parser.add_argument('--seed', type=int, default=1, help='seed of the synthetic corpus')
+    arg_parser.add_argument('--threshold', type=float, default=None,
+                            help='similarity threshold (default: from config)')
+    args = arg_parser.parse_args()
+
+    if args.record:
+        if args.corpus is None:
+            arg_parser.error('--record needs a corpus path to write')
+        record(args.corpus, args.config)
+        return
+
+    threshold = args.threshold
+    if threshold is None:
+        with open(args.config, 'r') as f:
+            settings = yaml.safe_load(f)['settings']
+        threshold = settings.get('deduplication', {}).get('similarity_threshold', 0.85)
+
+    if args.corpus is None:
+        print(f"Synthetic corpus, seed {args.seed} (record real feeds for meaningful recall)")
+        corpus = synthetic(args.seed)
+    else:
+        corpus = load(args.corpus)
+    print(f"{'region':<10} {'titles':>6} {'exact':>6} {'token':>6} {'recall':>7} {'same':>6} "
+          f"{'exact ms':>9} {'token ms':>9}")
+    total_dups = total_found = 0
+    for region_id, titles in corpus.items():
+        dups, found = compare(region_id, titles, threshold)
+        total_dups += dups
+        total_found += found
+    if len(corpus) > 1:
+        compare('pooled', [t for titles in corpus.values() for t in titles], threshold)
+    print(f"Per-region recall: {total_found / total_dups if total_dups else 1.0:.1%}")
+
+
+if __name__ == '__main__':
+    main()
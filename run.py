@@ -50,22 +50,30 @@ def main():
             output_dir=BASE_DIR / 'output'
         )
         generator.generate(data, default_region='us')
+        # Everything else in output/ goes through the same writer: atomic,
+        # skipped when unchanged, precompressed where useful
+        writer = generator.writer
 
         # Create CNAME file for custom domain
-        cname_path = BASE_DIR / 'output' / 'CNAME'
-        cname_path.write_text('knightlyread.com')
+        writer.write('CNAME', 'knightlyread.com')
 
         # Copy days.json to output for special day banner
-        import shutil
         days_source = BASE_DIR / 'data' / 'days.json'
         if days_source.exists():
-            shutil.copy(days_source, BASE_DIR / 'output' / 'days.json')
-            logger.info("Copied days.json to output")
+            if writer.copy('days.json', days_source):
+                logger.info("Copied days.json to output")
 
         # Generate logo and favicon from source image
         logo_source = BASE_DIR / 'assets' / 'logo-source.png'
         if logo_source.exists():
             from PIL import Image
+            from io import BytesIO
+
+            def write_png(name, image):
+                buffer = BytesIO()
+                image.save(buffer, format='PNG')
+                writer.write(name, buffer.getvalue())
+
             img = Image.open(logo_source)
             if img.mode != 'RGBA':
                 img = img.convert('RGBA')
@@ -75,7 +83,7 @@ def main():
             new_height = 120
             new_width = int(width * new_height / height)
             logo_dark = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            logo_dark.save(BASE_DIR / 'output' / 'logo-dark.png')
+            write_png('logo-dark.png', logo_dark)
 
             # Create inverted version for dark mode
             pixel_data = list(img.getdata())
@@ -83,15 +91,15 @@ def main():
             img_light = img.copy()
             img_light.putdata(inv_data)
             logo_light = img_light.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            logo_light.save(BASE_DIR / 'output' / 'logo-light.png')
+            write_png('logo-light.png', logo_light)
 
             # Favicon - crop to square then resize
             crop_size = min(width, height)
             left = (width - crop_size) // 2
             top = (height - crop_size) // 2
             knight_sq = img.crop((left, top, left + crop_size, top + crop_size))
-            knight_sq.resize((32, 32), Image.Resampling.LANCZOS).save(BASE_DIR / 'output' / 'favicon.png')
-            knight_sq.resize((180, 180), Image.Resampling.LANCZOS).save(BASE_DIR / 'output' / 'apple-touch-icon.png')
+            write_png('favicon.png', knight_sq.resize((32, 32), Image.Resampling.LANCZOS))
+            write_png('apple-touch-icon.png', knight_sq.resize((180, 180), Image.Resampling.LANCZOS))
             logger.info("Generated logo and favicon images")
 
         # Generate quiz if enabled and API key available
@@ -124,10 +132,9 @@ def main():
                     from src.quiz_generator import QuizGenerator
                     logger.info("Generating weekly quiz...")
                     quiz_gen = QuizGenerator(api_key)
-                    quiz_data = quiz_gen.generate_quiz(data, aggregator.config['settings'])
+                    quiz_data = quiz_gen.generate_quiz(data, aggregator.config['settings'], store=aggregator.store)
                     if quiz_data:
-                        with open(output_quiz_path, 'w') as f:
-                            json.dump(quiz_data, f, indent=2)
+                        writer.write('quiz.json', json.dumps(quiz_data, indent=2))
                         logger.info(f"Quiz generated: {output_quiz_path}")
                     else:
                         logger.warning("Quiz generation failed")
@@ -1,21 +1,46 @@
 """Main aggregation logic - combines feeds by region."""
+import copy
+import hashlib
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
 import yaml
+import json
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List
-from .fetcher import FeedFetcher, RetryConfig
-from .parser import FeedParser, Article
+from typing import Dict, List, Optional
+from .fetcher import FeedFetcher, PendingFetches, RetryConfig, ConcurrencyConfig
+from .feed_cache import FeedCache
+from .feed_history import FeedHistory
+from .parse_cache import ParseCache
+from .story_index import StoryIndex
+from .article_store import ArticleStore
+from .paywall_cache import PaywallVerdictCache
+from .urls import URLCanonicalizer
+from .parser import FeedParser, Article, ArticleBatch
 from .deduplicator import ArticleDeduplicator
 from .paywall import PaywallDetector
-from .country_detector import detect_country
+from .country_detector import detect_country, use_table
+from .features import title_features
+from .ranking import Ranker
+from .singleflight import SingleFlight
+from .parallel import parse_rows, select_rows, start_pool, worker_count
+from .pipeline import (
+    Pipeline, FetchStage, MapStage, ParallelMapStage, DedupStage, RankStage, FeedBatch, TimingHook,
+    log_timing
+)
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
+# Parses in flight (or recently finished) in this process, keyed by parse cache key
+_PARSES = SingleFlight()
+
 
 class NewsAggregator:
     def __init__(self, config_path: str):
         self.config = self._load_config(config_path)
+        # Relative cache paths are resolved against the project root
+        self.base_dir = Path(config_path).resolve().parent.parent
 
         # Build retry config from settings
         retry_settings = self.config['settings'].get('retry', {})
@@ -25,150 +50,467 @@ class NewsAggregator:
             multiplier=retry_settings.get('multiplier', 2.0)
         )
 
+        # Concurrency limits; rate_limit_delay now spaces requests per host
+        self.rate_limit_delay = self.config['settings'].get('rate_limit_delay', 0.5)
+        concurrency_settings = self.config['settings'].get('concurrency', {})
+        concurrency_config = ConcurrencyConfig(
+            max_workers=concurrency_settings.get('max_workers', 16),
+            per_host=concurrency_settings.get('per_host', 2),
+            host_delay=self.rate_limit_delay,
+            host_limits=concurrency_settings.get('host_limits', {}),
+            share_window=concurrency_settings.get('share_window', 0.0)
+        )
+
+        # Conditional-GET cache with stale-if-error fallback
+        cache_settings = self.config['settings'].get('cache', {})
+        feed_cache = None
+        if cache_settings.get('enabled', True):
+            feed_cache = FeedCache(
+                cache_dir=self._resolve_path(cache_settings.get('dir', '.cache/feeds')),
+                stale_if_error=cache_settings.get('stale_if_error', 86400)
+            )
+
+        # Per-feed latency/failure history for adaptive timeouts and circuit breaking
+        history_settings = self.config['settings'].get('history', {})
+        self.history = None
+        if history_settings.get('enabled', True):
+            self.history = FeedHistory(
+                path=self._resolve_path(history_settings.get('path', '.cache/feed_history.json')),
+                window=history_settings.get('window', 20),
+                timeout_multiplier=history_settings.get('timeout_multiplier', 3.0),
+                min_timeout=history_settings.get('min_timeout', 5.0),
+                failure_threshold=history_settings.get('failure_threshold', 5),
+                probe_interval=history_settings.get('probe_interval', 6 * 3600)
+            )
+
         self.fetcher = FeedFetcher(
             user_agent=self.config['settings']['user_agent'],
             timeout=self.config['settings']['request_timeout'],
-            retry_config=retry_config
+            retry_config=retry_config,
+            concurrency=concurrency_config,
+            cache=feed_cache,
+            max_bytes=self.config['settings'].get('max_feed_bytes', 2 * 1024 * 1024),
+            history=self.history
+        )
+        parser_settings = self.config['settings'].get('parser', {})
+        self._parser_options = dict(
+            fast_path=parser_settings.get('fast_path', True),
+            max_entries=parser_settings.get('max_entries', 0)
+        )
+        self.parser = FeedParser(**self._parser_options)
+
+        # Worker processes for parsing and per-region dedup/ranking (0 = in-process)
+        self.processes = self.config['settings'].get('processes', 0)
+
+        # Precompiled country matcher, built and saved on first use
+        country_table = self.config['settings'].get('country_table', '.cache/country_matcher.json')
+        if country_table:
+            use_table(self._resolve_path(country_table))
+
+        # Canonical URL keys for exact dedup, the parse cache and paywall lookups
+        url_settings = self.config['settings'].get('canonical_urls', {})
+        self.canonicalizer = URLCanonicalizer(
+            strip_params=list(URLCanonicalizer.DEFAULT_STRIP_PARAMS) + url_settings.get('strip_params', []),
+            domains=url_settings.get('domains', {})
         )
-        self.parser = FeedParser()
-        self.rate_limit_delay = self.config['settings'].get('rate_limit_delay', 0.5)
 
         # Initialize deduplicator
         dedup_settings = self.config['settings'].get('deduplication', {})
+        story_settings = dedup_settings.get('story_index', {})
+        self.story_index = None
+        if story_settings.get('enabled', False):
+            # Cross-run story clusters; only newly seen titles get fuzzy-matched
+            self.story_index = StoryIndex(
+                path=self._resolve_path(story_settings.get('path', '.cache/story_index.json')),
+                similarity_threshold=dedup_settings.get('similarity_threshold', 0.85),
+                max_age=story_settings.get('max_age', 3 * 86400),
+                index=dedup_settings.get('index', 'exact')
+            )
         self.deduplicator = ArticleDeduplicator(
-            similarity_threshold=dedup_settings.get('similarity_threshold', 0.85)
+            similarity_threshold=dedup_settings.get('similarity_threshold', 0.85),
+            workers=dedup_settings.get('workers', 1),
+            index=dedup_settings.get('index', 'exact'),
+            story_index=self.story_index
+        )
+        # Worker processes dedup one region each, single-threaded
+        self._dedup_options = dict(
+            similarity_threshold=self.deduplicator.similarity_threshold / 100,
+            workers=1,
+            index=self.deduplicator.index
         )
 
         # Initialize paywall detector
         paywall_settings = self.config['settings'].get('paywall', {})
         if paywall_settings.get('enabled', True):
             domains = set(paywall_settings.get('known_paywalled_domains', []))
+            probe_settings = paywall_settings.get('probe', {})
+            verdict_settings = paywall_settings.get('verdict_cache', {})
+            inference_settings = paywall_settings.get('domain_inference', {})
+            verdict_cache = None
+            if verdict_settings.get('enabled', True):
+                verdict_cache = PaywallVerdictCache(
+                    path=self._resolve_path(verdict_settings.get('path', '.cache/paywall_verdicts.json')),
+                    ttl=verdict_settings.get('ttl', 7 * 86400),
+                    max_entries=verdict_settings.get('max_entries', 20000),
+                    window=inference_settings.get('window', 20),
+                    min_samples=inference_settings.get('min_samples', 5),
+                    confidence=inference_settings.get('confidence', 0.9),
+                    reprobe_interval=inference_settings.get('reprobe_interval', 6 * 3600)
+                )
+            # Verdicts reused from the article store expire like cached probe verdicts
+            self._verdict_ttl = verdict_settings.get('ttl', 7 * 86400)
             self.paywall_detector = PaywallDetector(
                 paywalled_domains=domains if domains else None,
-                check_meta=paywall_settings.get('check_meta_tags', False)
+                check_meta=paywall_settings.get('check_meta_tags', False),
+                timeout=probe_settings.get('timeout', 5),
+                max_bytes=probe_settings.get('max_bytes', 50 * 1024),
+                workers=probe_settings.get('workers', 8),
+                per_host=probe_settings.get('per_host', 2),
+                verdict_cache=verdict_cache,
+                infer_domains=inference_settings.get('enabled', True)
             )
         else:
             self.paywall_detector = None
 
+        # Parsed (not yet annotated) articles keyed by feed payload hash
+        parse_cache_settings = self.config['settings'].get('parse_cache', {})
+        self.parse_cache = None
+        if parse_cache_settings.get('enabled', True):
+            self.parse_cache = ParseCache(
+                cache_dir=self._resolve_path(parse_cache_settings.get('dir', '.cache/parsed')),
+                max_age=parse_cache_settings.get('max_age', 2 * 86400),
+                salt=json.dumps(['parsed', self.config['settings'].get('parser', {})], sort_keys=True)
+            )
+
+        # Every article seen, with first/last-seen and feed position history
+        store_settings = self.config['settings'].get('store', {})
+        self.store = None
+        if store_settings.get('enabled', False):
+            self.store = ArticleStore(
+                path=self._resolve_path(store_settings.get('path', '.cache/articles.db')),
+                retention=store_settings.get('retention', 30 * 86400)
+            )
+        self._annotation_key = hashlib.sha256(self._annotation_fingerprint().encode()).hexdigest()[:16]
+
+        # Called with (region, stage, seconds, items) after each region's pipeline
+        self.timing_hooks: List[TimingHook] = [log_timing]
+
+    def _annotation_fingerprint(self) -> str:
+        """Settings that change what parsing and annotation produce for a payload."""
+        settings = self.config['settings']
+        paywall = settings.get('paywall', {})
+        return json.dumps([
+            settings.get('parser', {}),
+            settings.get('canonical_urls', {}),
+            paywall.get('enabled', True),
+            paywall.get('check_meta_tags', False),
+            sorted(paywall.get('known_paywalled_domains', [])),
+        ], sort_keys=True)
+
     def _load_config(self, path: str) -> dict:
         with open(path, 'r') as f:
             return yaml.safe_load(f)
 
-    def aggregate(self) -> Dict[str, dict]:
-        """Aggregate headlines for all regions."""
+    def _resolve_path(self, path: str) -> Path:
+        """Resolve a configured path relative to the project root."""
+        path = Path(path)
+        return path if path.is_absolute() else self.base_dir / path
+
+    def aggregate(self, regions: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Aggregate headlines for all regions, or only the given ones.
+
+        A partial run fetches only the selected regions' feeds; merge its
+        results into existing output with HTMLGenerator.merge().
+
+        Args:
+            regions: Region IDs to aggregate (default: all, in config order)
+        """
         results = {}
-        default_limit = self.config['settings']['headlines_per_region']
-        sort_by = self.config['settings'].get('sort_by', 'published')
-        max_per_source = self.config['settings'].get('max_per_source', 0)
+        all_regions = self.config['regions']
+        if regions is None:
+            region_ids = list(all_regions)
+        else:
+            unknown = [region_id for region_id in regions if region_id not in all_regions]
+            if unknown:
+                raise ValueError(f"Unknown regions: {', '.join(unknown)}")
+            region_ids = [region_id for region_id in all_regions if region_id in regions]
+        survivors = {}  # feed URL -> articles that made the page
+        now = datetime.now(timezone.utc)  # One clock reading for every article's age
 
-        for region_id, region_data in self.config['regions'].items():
-            logger.info(f"Processing region: {region_data['name']}")
-            articles = self._process_region(region_data)
+        # Start every selected region's feeds at once; each region's pipeline
+        # consumes its feeds as they arrive
+        with self._start_fetches(all_regions[region_id] for region_id in region_ids) as pending, \
+                self._start_pool() as pool:
+            selections = {}
+            for position, region_id in enumerate(region_ids):
+                region_data = all_regions[region_id]
+                logger.info(f"Processing region: {region_data['name']}")
+                selections[region_id] = self._select(region_id, region_data, pending, pool, now)
 
-            # Apply country detection for global and odd_news regions
-            if region_id in ('global', 'odd_news'):
-                for article in articles:
-                    _, flag = detect_country(article.title)
-                    article.country_flag = flag
-
-            # Apply sport emojis for sports region
-            if region_id == 'sports':
-                sport_emojis = {
-                    'soccer': '⚽',
-                    'basketball': '🏀',
-                    'cricket': '🏏',
-                    'tennis': '🎾',
-                    'motorsport': '🏎️',
-                    'rugby': '🏉',
-                    'golf': '⛳',
-                    'combat': '🥊',
-                    'general': '🏆',
-                    '': '🏆'
+                # Cancel fetches that no later region needs (left over if quotas filled early)
+                later_urls = {
+                    feed['url'] for later in region_ids[position + 1:] for feed in all_regions[later]['feeds']
                 }
-                for article in articles:
-                    sport = article.sport or 'general'
-                    article.country_flag = sport_emojis.get(sport, '🏆')
-
-            # Sort based on config
-            if sort_by == 'popularity':
-                articles.sort(key=lambda a: a.popularity_score, reverse=True)
-            else:
-                articles.sort(key=lambda a: a.published, reverse=True)
-
-            # Apply per-source limit if configured
-            if max_per_source > 0:
-                articles = self._limit_per_source(articles, max_per_source)
-
-            # Apply per-sport limit if configured (for sports section)
-            max_per_sport = region_data.get('max_per_sport', 0)
-            if max_per_sport > 0:
-                articles = self._limit_per_sport(articles, max_per_sport)
-
-            # Use headlines_override if specified, otherwise default
-            limit = region_data.get('headlines_override', default_limit)
-
-            results[region_id] = {
-                'name': region_data['name'],
-                'articles': [a.to_dict() for a in articles[:limit]]
+                pending.cancel([feed['url'] for feed in region_data['feeds'] if feed['url'] not in later_urls])
+
+            for region_id in region_ids:
+                region_data = all_regions[region_id]
+                articles, job = selections[region_id]
+                if job is not None:
+                    articles = self._collect_selection(articles, job)
+
+                self._decorate(region_id, articles)
+                self._count_survivors(region_data, articles, survivors)
+                if self.store:
+                    self.store.record_selection(region_id, articles, now.timestamp())
+
+                results[region_id] = {
+                    'name': region_data['name'],
+                    'articles': ArticleBatch(articles).to_dicts(now=now)
+                }
+
+        if self.history:
+            # Feeds also listed by regions left out of this run would only get a partial count
+            skipped_urls = {
+                feed['url'] for region_id, region_data in all_regions.items()
+                if region_id not in results for feed in region_data['feeds']
             }
+            for url, count in survivors.items():
+                if url not in skipped_urls:
+                    self.history.record_survivors(url, count)
+            self.history.save()
+        if self.parse_cache:
+            self.parse_cache.prune()
+        if self.story_index:
+            self.story_index.save()
+        if self.paywall_detector:
+            self.paywall_detector.save()
+        if self.store:
+            self.store.prune()
 
         return results
 
-    def _limit_per_source(self, articles: List[Article], max_per: int) -> List[Article]:
-        """Limit articles per source while preserving sort order."""
-        source_counts = {}
-        limited = []
-        for article in articles:
-            count = source_counts.get(article.source, 0)
-            if count < max_per:
-                limited.append(article)
-                source_counts[article.source] = count + 1
-        return limited
-
-    def _limit_per_sport(self, articles: List[Article], max_per: int) -> List[Article]:
-        """Limit articles per sport category while preserving sort order."""
-        sport_counts = {}
-        limited = []
-        for article in articles:
-            sport = article.sport or 'general'
-            count = sport_counts.get(sport, 0)
-            if count < max_per:
-                limited.append(article)
-                sport_counts[sport] = count + 1
-        return limited
+    def _start_pool(self):
+        """Worker process pool if configured, otherwise a no-op context yielding None."""
+        if not self.processes:
+            return nullcontext()
+        return start_pool(self.processes, self._parser_options)
+
+    def _select(
+        self,
+        region_id: str,
+        region_data: dict,
+        pending: PendingFetches,
+        pool: Optional[ProcessPoolExecutor],
+        now: datetime
+    ) -> tuple:
+        """
+        Run a region's pipeline. Returns (articles, None) with the final
+        selection, or, when dedup and ranking go to a worker process,
+        (candidates, job) to be resolved by _collect_selection().
+        """
+        # The story index is shared state, so with one dedup stays in this process
+        if pool is None or self.story_index is not None:
+            return self._build_pipeline(region_id, region_data, pending, now, pool).run(), None
+
+        batches = self._build_pipeline(region_id, region_data, pending, now, pool, select=False).run()
+        candidates = [article for batch in batches for article in batch.articles]
+        job = pool.submit(
+            select_rows, ArticleBatch(candidates).to_rows(), self._dedup_options,
+            self.config['settings'], region_data, now
+        )
+        return candidates, job
+
+    def _collect_selection(self, candidates: List[Article], job: Future) -> List[Article]:
+        """Map a worker's selection back onto this process's articles."""
+        picks, kept = job.result()
+        logger.info(f"Deduplication: {len(candidates)} -> {kept} articles")
+        articles = []
+        for index, cluster_id in picks:
+            article = candidates[index]
+            article.cluster_id = cluster_id
+            articles.append(article)
+        return articles
+
+    def _build_pipeline(
+        self,
+        region_id: str,
+        region_data: dict,
+        pending: PendingFetches,
+        now: datetime,
+        pool: Optional[ProcessPoolExecutor] = None,
+        select: bool = True
+    ) -> Pipeline:
+        """
+        fetch -> parse -> annotate -> dedup -> rank for one region.
+
+        With a pool, feeds are parsed in worker processes. With select=False
+        the pipeline stops after annotation and returns the feed batches.
+        """
+        if pool is not None:
+            parse = ParallelMapStage(
+                'parse', lambda batch: self._submit_parse(pool, batch), self._finish_parse,
+                lookahead=worker_count(self.processes)
+            )
+        else:
+            parse = MapStage('parse', self._parse_batch)
+        stages = [
+            FetchStage(region_data['feeds'], pending),
+            parse,
+            MapStage('annotate', lambda batch: self._annotate_batch(batch, now)),
+        ]
+        if select:
+            stages += [
+                DedupStage(self.deduplicator.session()),
+                RankStage(Ranker.from_config(self.config['settings'], region_data, now)),
+            ]
+        return Pipeline(region_id, stages, hooks=self.timing_hooks)
 
-    def _process_region(self, region_data: dict) -> List[Article]:
-        """Process all feeds for a region."""
-        all_articles = []
+    def _decorate(self, region_id: str, articles: List[Article]) -> None:
+        """Set the flag shown next to each selected article."""
+        # Apply country detection for global and odd_news regions
+        if region_id in ('global', 'odd_news'):
+            for article in articles:
+                _, flag = detect_country(article.title, article.features)
+                article.country_flag = flag
 
+        # Apply sport emojis for sports region
+        if region_id == 'sports':
+            sport_emojis = {
+                'soccer': '⚽',
+                'basketball': '🏀',
+                'cricket': '🏏',
+                'tennis': '🎾',
+                'motorsport': '🏎️',
+                'rugby': '🏉',
+                'golf': '⛳',
+                'combat': '🥊',
+                'general': '🏆',
+                '': '🏆'
+            }
+            for article in articles:
+                sport = article.sport or 'general'
+                article.country_flag = sport_emojis.get(sport, '🏆')
+
+    def _count_survivors(self, region_data: dict, articles: List[Article], survivors: Dict[str, int]) -> None:
+        """Add how many of each feed's articles made the region's final list."""
+        per_source = {}
+        for article in articles:
+            per_source[article.source] = per_source.get(article.source, 0) + 1
         for feed_config in region_data['feeds']:
             url = feed_config['url']
-            name = feed_config['name']
-            timeout = feed_config.get('timeout')  # Per-feed timeout override
-            sport = feed_config.get('sport', '')  # Sport category for sports section
+            survivors[url] = survivors.get(url, 0) + per_source.get(feed_config['name'], 0)
+
+    def _start_fetches(self, regions) -> PendingFetches:
+        """Start fetching all feeds for the given regions concurrently."""
+        urls = []
+        timeouts = {}
+        for region_data in regions:
+            for feed_config in region_data['feeds']:
+                url = feed_config['url']
+                urls.append(url)
+                # Per-feed timeout override (first listing wins for shared URLs)
+                timeouts.setdefault(url, feed_config.get('timeout'))
+
+        logger.info(f"Fetching {len(set(urls))} feeds concurrently")
+        return self.fetcher.start_all(urls, timeouts=timeouts)
+
+    def _from_parse_cache(self, batch: FeedBatch) -> bool:
+        """Set the batch's parse key and, on a hit, its parsed articles."""
+        if not self.parse_cache:
+            return False
+        response = batch.response
+        name = batch.feed['name']
+        batch.parse_key = self.parse_cache.key(response.content, name, response.headers.get('content-type', ''))
+        articles = self.parse_cache.get(batch.parse_key)
+        if articles is None:
+            return False
+        logger.debug(f"Parse cache hit for {name}")
+        batch.articles = articles
+        return True
+
+    def _submit_parse(self, pool: ProcessPoolExecutor, batch: FeedBatch) -> Optional[Future]:
+        """Start parsing a feed in a worker process, unless the parse cache has it."""
+        if self._from_parse_cache(batch):
+            return None
+        response = batch.response
+        return pool.submit(parse_rows, response.content, batch.feed['name'], response.headers)
 
-            logger.debug(f"Fetching {name}: {url}")
-            content = self.fetcher.fetch(url, timeout=timeout)
+    def _finish_parse(self, batch: FeedBatch, job: Optional[Future]) -> FeedBatch:
+        if job is not None:
+            batch.articles = ArticleBatch.from_rows(job.result()).articles
+            if batch.parse_key:
+                self.parse_cache.put(batch.parse_key, batch.articles)
+        return batch
 
-            if content:
-                articles = self.parser.parse(content, name)
+    def _parse_batch(self, batch: FeedBatch) -> FeedBatch:
+        """Parse a feed, or take its parsed articles from the parse cache."""
+        if self._from_parse_cache(batch):
+            return batch
+        response = batch.response
+        name = batch.feed['name']
+        if batch.parse_key:
+            def parse_and_store() -> List[Article]:
+                articles = self.parser.parse(response.content, name, response.headers)
+                self.parse_cache.put(batch.parse_key, articles)
+                return articles
 
-                # Set sport category if specified
-                if sport:
-                    for article in articles:
-                        article.sport = sport
+            # Concurrent runs parsing the same payload share one parse; each
+            # gets its own copies since later stages modify articles in place
+            shared = _PARSES.do(batch.parse_key, parse_and_store, window=self.fetcher.concurrency.share_window)
+            batch.articles = [copy.copy(article) for article in shared]
+            return batch
 
-                # Check for paywalls
-                if self.paywall_detector:
-                    for article in articles:
-                        article.is_paywalled = self.paywall_detector.is_paywalled(article.url)
+        batch.articles = self.parser.parse(response.content, name, response.headers)
+        return batch
 
-                all_articles.extend(articles)
-                logger.info(f"Got {len(articles)} articles from {name}")
-            else:
-                logger.warning(f"No content from {name}")
+    def _annotate_batch(self, batch: FeedBatch, now: datetime) -> FeedBatch:
+        """Canonical URLs, sport tags and paywall verdicts, then title features."""
+        articles = batch.articles
+        for article in articles:
+            article.canonical_url = self.canonicalizer.canonicalize(article.url)
+
+        # Set sport category if specified
+        sport = batch.feed.get('sport', '')
+        if sport:
+            for article in articles:
+                article.sport = sport
 
-            time.sleep(self.rate_limit_delay)
+        # Check for paywalls
+        reused = set()
+        if self.paywall_detector:
+            # Articles the store already has, unchanged, annotated under the
+            # same settings and checked within the verdict TTL, keep their
+            # verdict; only the rest are checked
+            to_check = articles
+            if self.store:
+                known = self.store.known(article.url_key for article in articles)
+                fresh_after = now.timestamp() - self._verdict_ttl
+                to_check = []
+                for article in articles:
+                    entry = known.get(article.url_key)
+                    if (entry and entry[0] == article.title and entry[2] == self._annotation_key
+                            and entry[3] >= fresh_after):
+                        article.is_paywalled = entry[1]
+                        reused.add(article.url_key)
+                    else:
+                        to_check.append(article)
+            # Pages are probed at their real URL; the canonical URL only
+            # keys the verdict, since it isn't guaranteed to resolve
+            verdicts = self.paywall_detector.check_all(
+                [article.url for article in to_check],
+                [article.url_key for article in to_check]
+            )
+            for article in to_check:
+                article.is_paywalled = verdicts[article.url_key]
+
+        if self.store:
+            self.store.record_feed(articles, now.timestamp(), self._annotation_key, reused)
+
+        # Build title features once for dedup and country flags
+        for article in articles:
+            article.features = title_features(article.title)
 
-        # Deduplicate by URL and fuzzy title matching
-        return self.deduplicator.deduplicate(all_articles)
+        logger.info(f"Got {len(articles)} articles from {batch.feed['name']}")
+        return batch
@@ -1,13 +1,20 @@
 """Simple API server for Instapaper integration and news refresh."""
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, abort, request, jsonify, send_file, send_from_directory
 from flask_cors import CORS
+from werkzeug.security import safe_join
 from .instapaper import InstapaperClient
 from .aggregator import NewsAggregator
 from .generator import HTMLGenerator
+from .article_store import ArticleStore
+from .output import precompressed
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import logging
 import json
+import mimetypes
 import requests
+import threading
+import yaml
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +29,26 @@ CONFIG_PATH = BASE_DIR / 'config' / 'feeds.yaml'
 OUTPUT_DIR = BASE_DIR / 'output'
 TEMPLATE_DIR = BASE_DIR / 'templates'
 
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The article store configured in feeds.yaml, opened on first use (None if disabled)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            with open(CONFIG_PATH, 'r') as f:
+                store_settings = yaml.safe_load(f)['settings'].get('store', {})
+            if not store_settings.get('enabled', False):
+                return None
+            path = Path(store_settings.get('path', '.cache/articles.db'))
+            _store = ArticleStore(
+                str(path if path.is_absolute() else BASE_DIR / path),
+                retention=store_settings.get('retention', 30 * 86400)
+            )
+        return _store
+
 
 @app.route('/api/instapaper/status', methods=['GET'])
 def instapaper_status():
@@ -98,23 +125,27 @@ def refresh_news():
     try:
         logger.info(f"Refreshing news for region: {region_id or 'all'}")
         aggregator = NewsAggregator(str(CONFIG_PATH))
-        results = aggregator.aggregate()
+        if region_id and region_id not in aggregator.config['regions']:
+            return jsonify({
+                'success': False,
+                'message': f"Unknown region: {region_id}"
+            }), 400
+
+        # Only the requested region's feeds are fetched
+        results = aggregator.aggregate(regions=[region_id] if region_id else None)
 
-        # Generate new HTML and JSON
+        # Generate new HTML and JSON, splicing a single region into the existing output
         generator = HTMLGenerator(str(TEMPLATE_DIR), str(OUTPUT_DIR))
-        generator.generate(results)
+        if region_id:
+            generator.merge(results)
+        else:
+            generator.generate(results)
 
         # Return data for the requested region or all
-        if region_id and region_id in results:
-            return jsonify({
-                'success': True,
-                'data': {region_id: results[region_id]}
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'data': results
-            })
+        return jsonify({
+            'success': True,
+            'data': results
+        })
     except Exception as e:
         logger.error(f"Refresh failed: {e}")
         return jsonify({
@@ -135,6 +166,42 @@ def get_data():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/articles', methods=['GET'])
+def get_articles():
+    """
+    Query the article store.
+
+    Query parameters:
+        region: A region's latest page (other filters are ignored)
+        hours: Window of articles seen in the last N hours (default 24)
+        source: Only articles from this feed
+        new: If "1", only articles first seen inside the window
+        limit: Maximum number of articles (default 100)
+    """
+    store = get_store()
+    if store is None:
+        return jsonify({'error': 'Article store is disabled'}), 404
+
+    try:
+        region = request.args.get('region')
+        if region:
+            return jsonify({'region': region, 'articles': store.region_articles(region)})
+
+        hours = float(request.args.get('hours', 24))
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'error': 'hours and limit must be numbers'}), 400
+
+    since = (datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp()
+    articles = store.articles(
+        since,
+        source=request.args.get('source'),
+        new_only=request.args.get('new') == '1',
+        limit=limit
+    )
+    return jsonify({'articles': articles})
+
+
 @app.route('/api/local-news', methods=['GET'])
 def local_news():
     """Proxy Google News RSS to avoid CORS issues."""
@@ -164,16 +231,36 @@ def local_news():
         return jsonify({'error': 'Failed to fetch local news'}), 502
 
 
+def send_output(filename: str):
+    """Send a file from the output directory, as its precompressed .br/.gz sibling if the client accepts one."""
+    path = safe_join(str(OUTPUT_DIR), filename)
+    if path is None or not Path(path).is_file():
+        abort(404)
+
+    found = precompressed(Path(path), request.headers.get('Accept-Encoding', ''))
+    if found:
+        sibling, encoding = found
+        response = send_file(
+            str(sibling),
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        )
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(str(OUTPUT_DIR), filename)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
 @app.route('/')
 def serve_index():
     """Serve the main HTML page."""
-    return send_from_directory(str(OUTPUT_DIR), 'index.html')
+    return send_output('index.html')
 
 
 @app.route('/<path:filename>')
 def serve_static(filename):
     """Serve static files from output directory."""
-    return send_from_directory(str(OUTPUT_DIR), filename)
+    return send_output(filename)
 
 
 def run_server(host='127.0.0.1', port=5000):
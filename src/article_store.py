@@ -0,0 +1,309 @@
+"""Persistent SQLite store of every article seen, with sighting and selection history."""
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+from .parser import Article
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_key TEXT PRIMARY KEY,         -- Canonical URL
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    sport TEXT NOT NULL DEFAULT '',
+    published REAL NOT NULL,          -- Unix timestamps throughout
+    is_paywalled INTEGER NOT NULL DEFAULT 0,
+    annotation TEXT NOT NULL DEFAULT '',  -- Annotation settings the verdicts were made under
+    checked_at REAL NOT NULL DEFAULT 0,   -- When is_paywalled was last checked rather than reused
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    best_position INTEGER NOT NULL,
+    last_position INTEGER NOT NULL,
+    times_seen INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS articles_last_seen ON articles (last_seen);
+CREATE INDEX IF NOT EXISTS articles_first_seen ON articles (first_seen);
+CREATE INDEX IF NOT EXISTS articles_source ON articles (source, last_seen);
+
+-- Feed position of an article at every run that saw it
+CREATE TABLE IF NOT EXISTS sightings (
+    url_key TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (url_key, seen_at, source)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sightings_seen_at ON sightings (seen_at);
+
+-- Articles that made each region's page, in page order
+CREATE TABLE IF NOT EXISTS selections (
+    region TEXT NOT NULL,
+    run_at REAL NOT NULL,
+    rank INTEGER NOT NULL,
+    url_key TEXT NOT NULL,
+    country_flag TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (region, run_at, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS selections_run_at ON selections (run_at);
+"""
+
+ARTICLE_COLUMNS = (
+    'url_key', 'url', 'title', 'source', 'sport', 'published', 'is_paywalled',
+    'first_seen', 'last_seen', 'best_position', 'last_position', 'times_seen'
+)
+SELECT_ARTICLES = ', '.join(ARTICLE_COLUMNS)
+SELECT_JOINED = ', '.join(f'a.{column}' for column in ARTICLE_COLUMNS)
+
+# Keeps IN (...) lists under SQLite's host parameter limit
+QUERY_CHUNK = 500
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class ArticleStore:
+    """
+    Every article the aggregator has seen, keyed by canonical URL.
+
+    Each run upserts the articles of every feed it processes. An article
+    keeps its first-seen time and best feed position, and gets its
+    last-seen time, latest position and annotations updated. Every
+    sighting and every region's final selection is also recorded, so
+    later runs and readers can ask what is new, what was on a page at a
+    given time, and how a story moved through its feed.
+
+    The database runs in WAL mode, so the API and concurrent runs can
+    read while a run writes. History older than `retention` seconds is
+    dropped by prune().
+    """
+
+    def __init__(self, path: str, retention: float = 30 * 86400):
+        """
+        Initialize ArticleStore.
+
+        Args:
+            path: SQLite database file (created if missing).
+            retention: Seconds after which unseen articles and old history are dropped.
+        """
+        self.path = Path(path)
+        self.retention = retention
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Writes
+
+    def record_feed(
+        self,
+        articles: List[Article],
+        seen_at: float,
+        annotation: str = '',
+        reused: AbstractSet[str] = frozenset()
+    ) -> None:
+        """
+        Upsert one feed's articles and record where each appeared in the feed.
+
+        Args:
+            articles: Annotated articles (canonical URL, sport, paywall verdict set).
+            seen_at: Run timestamp shared by every sighting in the run.
+            annotation: Fingerprint of the settings the annotations were made under.
+            reused: URL keys whose paywall verdict was taken from the store;
+                    they keep their earlier check time.
+        """
+        rows = [
+            (
+                article.url_key, article.url, article.title, article.source, article.sport,
+                article.published.timestamp(), int(article.is_paywalled), annotation,
+                0.0 if article.url_key in reused else seen_at,
+                seen_at, seen_at, article.feed_position, article.feed_position
+            )
+            for article in articles
+        ]
+        sightings = [(article.url_key, seen_at, article.source, article.feed_position) for article in articles]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO articles (
+                    url_key, url, title, source, sport, published, is_paywalled, annotation,
+                    checked_at, first_seen, last_seen, best_position, last_position
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url_key) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    source = excluded.source,
+                    sport = excluded.sport,
+                    published = excluded.published,
+                    is_paywalled = excluded.is_paywalled,
+                    annotation = excluded.annotation,
+                    checked_at = MAX(checked_at, excluded.checked_at),
+                    last_seen = excluded.last_seen,
+                    best_position = MIN(best_position, excluded.best_position),
+                    last_position = excluded.last_position,
+                    times_seen = times_seen + (last_seen < excluded.last_seen)
+                """,
+                rows
+            )
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO sightings (url_key, seen_at, source, position) VALUES (?, ?, ?, ?)',
+                sightings
+            )
+
+    def record_selection(self, region: str, articles: List[Article], run_at: float) -> None:
+        """Record the articles that made a region's page, in page order."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM selections WHERE region = ? AND run_at = ?', (region, run_at))
+            self._conn.executemany(
+                'INSERT INTO selections (region, run_at, rank, url_key, country_flag) VALUES (?, ?, ?, ?, ?)',
+                [(region, run_at, rank, article.url_key, article.country_flag) for rank, article in enumerate(articles)]
+            )
+
+    def prune(self, now: Optional[float] = None) -> None:
+        """Drop articles not seen, and history recorded, more than `retention` seconds ago."""
+        cutoff = (now or time.time()) - self.retention
+        with self._lock, self._conn:
+            removed = self._conn.execute('DELETE FROM articles WHERE last_seen < ?', (cutoff,)).rowcount
+            self._conn.execute('DELETE FROM sightings WHERE seen_at < ?', (cutoff,))
+            self._conn.execute('DELETE FROM selections WHERE run_at < ?', (cutoff,))
+        if removed:
+            logger.info(f"Pruned {removed} articles from the article store")
+
+    # Reads
+
+    def known(self, url_keys: Iterable[str]) -> Dict[str, Tuple[str, bool, str, float]]:
+        """(title, is_paywalled, annotation, checked_at) of every given URL already in the store."""
+        url_keys = list(dict.fromkeys(url_keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(url_keys), QUERY_CHUNK):
+                chunk = url_keys[start:start + QUERY_CHUNK]
+                cursor = self._conn.execute(
+                    f"SELECT url_key, title, is_paywalled, annotation, checked_at FROM articles "
+                    f"WHERE url_key IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                for row in cursor:
+                    found[row['url_key']] = (
+                        row['title'], bool(row['is_paywalled']), row['annotation'], row['checked_at']
+                    )
+        return found
+
+    def latest_run(self, region: Optional[str] = None) -> Optional[float]:
+        """Timestamp of the most recent recorded selection (for a region, if given)."""
+        query = 'SELECT MAX(run_at) FROM selections'
+        params: tuple = ()
+        if region:
+            query += ' WHERE region = ?'
+            params = (region,)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def region_articles(self, region: str, run_at: Optional[float] = None) -> List[dict]:
+        """A region's page at a run (the latest by default), in page order."""
+        with self._lock:
+            if run_at is None:
+                run_at = self._conn.execute(
+                    'SELECT MAX(run_at) FROM selections WHERE region = ?', (region,)
+                ).fetchone()[0]
+                if run_at is None:
+                    return []
+            rows = self._conn.execute(
+                f"SELECT {SELECT_JOINED}, s.country_flag "
+                f"FROM selections s JOIN articles a ON a.url_key = s.url_key "
+                f"WHERE s.region = ? AND s.run_at = ? ORDER BY s.rank",
+                (region, run_at)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def region_history(self, region: str, since: float, until: Optional[float] = None) -> List[dict]:
+        """
+        Articles that made a region's page during [since, until], most
+        frequently selected first, then by best page position.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {SELECT_JOINED}, "
+                f"MAX(s.country_flag) AS country_flag, COUNT(*) AS times_selected, MIN(s.rank) AS best_rank "
+                f"FROM selections s JOIN articles a ON a.url_key = s.url_key "
+                f"WHERE s.region = ? AND s.run_at >= ? AND s.run_at <= ? "
+                f"GROUP BY s.url_key ORDER BY times_selected DESC, best_rank, a.first_seen",
+                (region, since, until if until is not None else float('inf'))
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def articles(
+        self,
+        since: float,
+        until: Optional[float] = None,
+        source: Optional[str] = None,
+        new_only: bool = False,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Articles seen during [since, until], most recently published first.
+
+        Args:
+            since: Window start (Unix timestamp).
+            until: Window end (default: now).
+            source: Only articles from this feed.
+            new_only: Only articles first seen inside the window.
+            limit: Maximum number of articles returned.
+        """
+        column = 'first_seen' if new_only else 'last_seen'
+        query = f"SELECT {SELECT_ARTICLES} FROM articles WHERE {column} >= ? AND {column} <= ?"
+        params: list = [since, until if until is not None else float('inf')]
+        if source:
+            query += ' AND source = ?'
+            params.append(source)
+        query += ' ORDER BY published DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def positions(self, url_key: str) -> List[Tuple[float, str, int]]:
+        """(seen_at, source, position) for every sighting of an article, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT seen_at, source, position FROM sightings WHERE url_key = ? ORDER BY seen_at',
+                (url_key,)
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        data = {
+            'title': row['title'],
+            'url': row['url'],
+            'canonical_url': row['url_key'],
+            'source': row['source'],
+            'sport': row['sport'],
+            'published': _isoformat(row['published']),
+            'is_paywalled': bool(row['is_paywalled']),
+            'first_seen': _isoformat(row['first_seen']),
+            'last_seen': _isoformat(row['last_seen']),
+            'best_position': row['best_position'],
+            'feed_position': row['last_position'],
+            'times_seen': row['times_seen'],
+        }
+        for extra in ('country_flag', 'times_selected'):
+            if extra in row.keys():
+                data[extra] = row[extra]
+        return data
@@ -1,5 +1,12 @@
 """Detects countries mentioned in article titles and returns flag emojis."""
-import re
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Country name to flag emoji mapping
 COUNTRY_FLAGS = {
@@ -146,29 +153,199 @@ COUNTRY_FLAGS = {
     'papua new guinea': '🇵🇬',
 }
 
-# Compile regex pattern for efficient matching
-_PATTERN = None
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over casefolded keywords.
+
+    One pass over a title finds every keyword in it regardless of how many
+    keywords there are. A match only counts when it is not directly preceded
+    or followed by a word character, and overlapping matches resolve like a
+    longest-first regex alternation: leftmost wins, then longest.
+
+    The automaton can be dumped with to_table() and restored with
+    from_table(), so a large gazetteer need not be rebuilt at startup.
+    """
+
+    TABLE_VERSION = 1
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self.keywords: List[str] = sorted({keyword.casefold() for keyword in keywords})
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]  # Keyword indexes ending in each state
+        if self.keywords:
+            self._build()
+
+    def _build(self) -> None:
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._out[state].append(index)
+
+        # Breadth-first failure links; outputs inherit their fallback's outputs
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def to_table(self) -> dict:
+        return {
+            'version': self.TABLE_VERSION,
+            'keywords': self.keywords,
+            'goto': self._goto,
+            'fail': self._fail,
+            'out': self._out,
+        }
+
+    @classmethod
+    def from_table(cls, table: dict) -> 'KeywordMatcher':
+        if table.get('version') != cls.TABLE_VERSION:
+            raise ValueError(f"unsupported table version {table.get('version')}")
+        matcher = cls()
+        matcher.keywords = table['keywords']
+        matcher._goto = table['goto']
+        matcher._fail = table['fail']
+        matcher._out = table['out']
+        return matcher
+
+    def find_all(self, text: str) -> List[str]:
+        """Every non-overlapping keyword match in text, in order of appearance."""
+        text = text.casefold()
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        length = len(text)
+        hits: List[Tuple[int, int, str]] = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < length and _is_word(text[end]):
+                continue
+            for index in out[state]:
+                keyword = keywords[index]
+                start = end - len(keyword)
+                if start == 0 or not _is_word(text[start - 1]):
+                    hits.append((start, -len(keyword), keyword))
+
+        hits.sort()
+        matches = []
+        position = 0
+        for start, neg_length, keyword in hits:
+            if start >= position:
+                matches.append(keyword)
+                position = start - neg_length
+        return matches
+
+
+_MATCHER: Optional[KeywordMatcher] = None
+_TABLE_PATH: Optional[Path] = None
 
-def _get_pattern():
-    global _PATTERN
-    if _PATTERN is None:
-        # Sort by length (longest first) to match "south korea" before "korea"
-        sorted_countries = sorted(COUNTRY_FLAGS.keys(), key=len, reverse=True)
-        escaped = [re.escape(c) for c in sorted_countries]
-        _PATTERN = re.compile(r'\b(' + '|'.join(escaped) + r')\b', re.IGNORECASE)
-    return _PATTERN
+
+def use_table(path: str) -> None:
+    """
+    Load the country automaton from a precompiled table at path, writing
+    the table there on first use if it is missing or out of date.
+    """
+    global _MATCHER, _TABLE_PATH
+    _TABLE_PATH = Path(path)
+    _MATCHER = None
+
+
+def _load_table(path: Path) -> Optional[KeywordMatcher]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            matcher = KeywordMatcher.from_table(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable country table {path}: {e}")
+        return None
+    if matcher.keywords != sorted({keyword.casefold() for keyword in COUNTRY_FLAGS}):
+        return None  # Gazetteer changed since the table was written
+    return matcher
+
+
+def _save_table(path: Path, matcher: KeywordMatcher) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(matcher.to_table(), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to save country table: {e}")
+
+
+def _get_matcher() -> KeywordMatcher:
+    """Build (or load) the country automaton on first use."""
+    global _MATCHER
+    if _MATCHER is None:
+        matcher = _load_table(_TABLE_PATH) if _TABLE_PATH else None
+        if matcher is None:
+            matcher = KeywordMatcher(COUNTRY_FLAGS)
+            if _TABLE_PATH:
+                _save_table(_TABLE_PATH, matcher)
+        _MATCHER = matcher
+    return _MATCHER
 
 
-def detect_country(title: str) -> tuple:
+def find_countries(title: str) -> list:
+    """Return every country keyword (lowercase) mentioned in title, in order."""
+    return _get_matcher().find_all(title)
+
+
+def detect_countries(titles: Iterable[str]) -> List[List[tuple]]:
+    """
+    Detect all countries mentioned in each title.
+
+    Returns one list per title of (country_name, flag_emoji) pairs in order
+    of first mention, with one entry per flag.
+    """
+    matcher = _get_matcher()
+    results = []
+    for title in titles:
+        countries = []
+        flags = set()
+        for keyword in matcher.find_all(title):
+            flag = COUNTRY_FLAGS[keyword]
+            if flag not in flags:
+                flags.add(flag)
+                countries.append((keyword.title(), flag))
+        results.append(countries)
+    return results
+
+
+def detect_country(title: str, features=None) -> tuple:
     """
     Detect country mentioned in title.
     Returns (country_name, flag_emoji) or (None, None) if not found.
+
+    Pass the title's TitleFeatures to reuse its precomputed matches.
     """
-    pattern = _get_pattern()
-    match = pattern.search(title)
+    countries = features.countries if features is not None else find_countries(title)
 
-    if match:
-        country = match.group(1).lower()
+    if countries:
+        country = countries[0]
         return (country.title(), COUNTRY_FLAGS.get(country, '🌍'))
 
     return (None, '🌍')  # Default globe emoji if no country detected
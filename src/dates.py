@@ -0,0 +1,126 @@
+"""Fast publication date parsing for feed entries.
+
+Feed dates come in two shapes in practice: RFC 822 (RSS pubDate) and
+ISO 8601 (Atom, dc:date). Both get a dedicated regex parser here, with
+results memoized because the same timestamp string repeats across
+entries and runs. dateutil is only used for strings neither parser
+recognizes.
+"""
+import calendar
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# Zone names allowed by RFC 822 plus a few common in the wild (hours from UTC)
+_ZONES = {
+    'gmt': 0, 'ut': 0, 'utc': 0, 'z': 0,
+    'est': -5, 'edt': -4, 'cst': -6, 'cdt': -5,
+    'mst': -7, 'mdt': -6, 'pst': -8, 'pdt': -7,
+}
+
+_RFC822_RE = re.compile(
+    r'^\s*(?:[a-z]{3,9},?\s+)?'          # Optional weekday
+    r'(\d{1,2})\s+([a-z]{3})[a-z]*\.?\s+(\d{2}|\d{4})\s+'
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?'
+    r'\s*(?:([+-])(\d{2}):?(\d{2})|([a-z]{1,4}))?\s*$',
+    re.IGNORECASE
+)
+
+_ISO8601_RE = re.compile(
+    r'^\s*(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[t ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?)?'
+    r'\s*(?:(z)|([+-])(\d{2}):?(\d{2}))?\s*$',
+    re.IGNORECASE
+)
+
+_UTC_OFFSETS = {}
+
+
+def _offset(sign: str, hours: str, minutes: str) -> timezone:
+    """Shared timezone objects for numeric offsets."""
+    key = (sign, hours, minutes)
+    tz = _UTC_OFFSETS.get(key)
+    if tz is None:
+        delta = timedelta(hours=int(hours), minutes=int(minutes))
+        tz = timezone(-delta if sign == '-' else delta)
+        _UTC_OFFSETS[key] = tz
+    return tz
+
+
+def _parse_rfc822(value: str) -> Optional[datetime]:
+    match = _RFC822_RE.match(value)
+    if not match:
+        return None
+    day, month, year, hour, minute, second, sign, off_h, off_m, zone = match.groups()
+
+    month_num = _MONTHS.get(month.lower())
+    if month_num is None:
+        return None
+    year_num = int(year)
+    if len(year) == 2:
+        year_num += 2000 if year_num < 50 else 1900
+
+    if sign:
+        tz = _offset(sign, off_h, off_m)
+    elif zone:
+        hours = _ZONES.get(zone.lower())
+        if hours is None:
+            return None  # Unknown zone name, leave it to dateutil
+        tz = _offset('+' if hours >= 0 else '-', str(abs(hours)), '0')
+    else:
+        tz = timezone.utc
+
+    return datetime(year_num, month_num, int(day), int(hour), int(minute),
+                    int(second or 0), tzinfo=tz)
+
+
+def _parse_iso8601(value: str) -> Optional[datetime]:
+    match = _ISO8601_RE.match(value)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction, zulu, sign, off_h, off_m = match.groups()
+
+    tz = _offset(sign, off_h, off_m) if sign else timezone.utc
+    microsecond = int(fraction.ljust(6, '0')) if fraction else 0
+    return datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                    int(second or 0), microsecond, tzinfo=tz)
+
+
+def _parse_fallback(value: str) -> Optional[datetime]:
+    from dateutil import parser as date_parser
+    parsed = date_parser.parse(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str) -> Optional[datetime]:
+    """
+    Parse a feed date string into an aware datetime (naive times are UTC).
+
+    Tries RFC 822, then ISO 8601, then dateutil. Returns None if the string
+    can't be parsed. Results are memoized in a bounded LRU cache.
+    """
+    for parse in (_parse_rfc822, _parse_iso8601, _parse_fallback):
+        try:
+            parsed = parse(value)
+        except (ValueError, TypeError, OverflowError):
+            continue
+        if parsed is not None:
+            return parsed
+    return None
+
+
+def from_struct(struct) -> Optional[datetime]:
+    """Convert a feedparser *_parsed struct (always UTC) to an aware datetime."""
+    try:
+        return datetime.fromtimestamp(calendar.timegm(struct), timezone.utc)
+    except (ValueError, TypeError, OverflowError):
+        return None
@@ -1,15 +1,27 @@
 """Handles article deduplication using both exact URL and fuzzy title matching."""
-from typing import List, Tuple
-from rapidfuzz import fuzz
+import bisect
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+from rapidfuzz import fuzz, process
+from .features import TitleFeatures, normalize_title, title_features
 from .parser import Article
+import numpy as np
 import logging
-import re
+
+if TYPE_CHECKING:
+    from .story_index import StoryIndex
 
 logger = logging.getLogger(__name__)
 
 
 class ArticleDeduplicator:
-    def __init__(self, similarity_threshold: float = 0.85):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.85,
+        workers: int = 1,
+        index: str = 'exact',
+        story_index: Optional['StoryIndex'] = None
+    ):
         """
         Initialize deduplicator.
 
@@ -17,76 +29,285 @@ class ArticleDeduplicator:
             similarity_threshold: Minimum similarity ratio (0-1) for titles to be
                                   considered duplicates. Default 0.85 works well
                                   for news headlines.
+            workers: Threads used to score title pairs (-1 = all cores).
+            index: 'exact' scores every pair; 'token' only scores pairs that
+                   share a block key (sub-quadratic, may miss some matches).
+            story_index: Persistent cross-run index. When given, articles are
+                         assigned to the stories it remembers and only new
+                         titles are fuzzy-matched, in its own `index` mode.
         """
         self.similarity_threshold = similarity_threshold * 100  # rapidfuzz uses 0-100 scale
+        self.workers = workers
+        self.index = index
+        self.story_index = story_index
 
     def _normalize_title(self, title: str) -> str:
         """Normalize title for comparison by removing noise."""
-        # Lowercase
-        normalized = title.lower()
-        # Remove common prefixes like "BREAKING:", "UPDATE:", etc.
-        prefixes = ['breaking:', 'update:', 'live:', 'exclusive:', 'watch:', 'video:']
-        for prefix in prefixes:
-            if normalized.startswith(prefix):
-                normalized = normalized[len(prefix):].strip()
-        # Remove punctuation for comparison
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        # Collapse whitespace
-        normalized = ' '.join(normalized.split())
-        return normalized
-
-    def _are_titles_similar(self, title1: str, title2: str) -> Tuple[bool, float]:
-        """Check if two titles are similar enough to be considered duplicates."""
-        norm1 = self._normalize_title(title1)
-        norm2 = self._normalize_title(title2)
-
-        # Use token_sort_ratio which handles word order differences
-        # e.g., "Biden meets Xi" vs "Xi meets Biden" will match
-        score = fuzz.token_sort_ratio(norm1, norm2)
-
-        return score >= self.similarity_threshold, score
+        return normalize_title(title)
+
+    def _features(self, article: Article) -> TitleFeatures:
+        """The article's precomputed title features, computing them if missing."""
+        return article.features or title_features(article.title)
 
     def deduplicate(self, articles: List[Article]) -> List[Article]:
         """
         Remove duplicate articles based on URL and fuzzy title matching.
 
         Strategy:
-        1. First pass: Remove exact URL duplicates
+        1. First pass: Remove exact URL duplicates (by canonical URL when set)
         2. Second pass: Remove fuzzy title duplicates (keep the one from
            higher-priority source or earlier in list)
+
+        Each returned article carries the story cluster_id it represents.
         """
         if not articles:
             return []
 
-        # Phase 1: URL-based deduplication
-        seen_urls = set()
-        url_unique = []
+        session = self.session()
+        unique_articles = session.keep(articles)
+        logger.info(f"Deduplication: {len(articles)} -> {len(unique_articles)} articles")
+        return unique_articles
+
+    def cluster(self, articles: List[Article]) -> List[int]:
+        """
+        Assign a story cluster ID to every article.
+
+        Clusters are keep-first: an article joins the cluster of the first
+        earlier representative whose title is similar enough (or that has
+        the same URL), otherwise it becomes the representative of a new
+        cluster. IDs are numbered in order of first appearance.
+
+        With a story index, IDs are persistent story IDs instead, and an
+        article joins the story its URL or normalized title was assigned to
+        in an earlier run, or the first indexed story it is similar to.
+        """
+        return self.session().add(articles)
+
+    def session(self) -> 'DedupSession':
+        """Start an incremental keep-first deduplication over batches of articles."""
+        return DedupSession(self)
+
+
+class DedupSession:
+    """
+    Keep-first clustering fed one batch at a time, e.g. feed by feed as
+    they arrive. Adding batches in order gives the same cluster IDs as
+    clustering their concatenation in one call.
+    """
+
+    def __init__(self, dedup: ArticleDeduplicator):
+        self.dedup = dedup
+        self.threshold = dedup.similarity_threshold
+        self.url_clusters: Dict[str, int] = {}
+        self.reps: List[Article] = []        # Representative of each cluster, by ID
+        self.rep_titles: List[str] = []      # Their sorted-token titles
+        self.blocks = BlockIndex(self.threshold) if dedup.index == 'token' else None
+        self.stories = dedup.story_index.session() if dedup.story_index is not None else None
+        self.seen_clusters: Set[int] = set()
+        self.total = 0
+
+    def keep(self, articles: List[Article]) -> List[Article]:
+        """Cluster a batch and return the articles starting a cluster not seen before."""
+        kept = []
+        for article, cluster_id in zip(articles, self.add(articles)):
+            article.cluster_id = cluster_id
+            if cluster_id not in self.seen_clusters:
+                self.seen_clusters.add(cluster_id)
+                kept.append(article)
+        return kept
+
+    def add(self, articles: List[Article]) -> List[int]:
+        """Assign cluster IDs to a batch, continuing from earlier batches."""
+        self.total += len(articles)
+        if self.stories is not None:
+            return self.stories.assign_all(
+                [article.url_key for article in articles],
+                [self.dedup._features(article).sorted_tokens for article in articles]
+            )
+
+        # Phase 1: URL-based deduplication against this and earlier batches
+        new_urls = {}
         for article in articles:
-            if article.url not in seen_urls:
-                seen_urls.add(article.url)
-                url_unique.append(article)
+            key = article.url_key
+            if key not in self.url_clusters and key not in new_urls:
+                new_urls[key] = article
+        logger.debug(f"URL dedup: {len(articles)} -> {len(new_urls)} new articles")
 
-        logger.debug(f"URL dedup: {len(articles)} -> {len(url_unique)} articles")
+        # Phase 2: Fuzzy title clustering of the new URLs
+        # token_sort_ratio is ratio() over sorted tokens, so the precomputed
+        # sorted-token strings let us use the faster plain scorer.
+        candidates = list(new_urls.values())
+        sorted_titles = [self.dedup._features(article).sorted_tokens for article in candidates]
+        if self.blocks is not None:
+            matches = self._match_blocked(sorted_titles)
+        else:
+            matches = self._match_exact(sorted_titles)
 
-        # Phase 2: Fuzzy title deduplication
-        unique_articles = []
+        for article, title, match in zip(candidates, sorted_titles, matches):
+            if match is None:
+                match = len(self.reps)
+                self.reps.append(article)
+                self.rep_titles.append(title)
+            else:
+                existing = self.reps[match]
+                logger.debug(
+                    f"Fuzzy duplicate: '{article.title}' ({article.source}) ~ "
+                    f"'{existing.title}' ({existing.source})"
+                )
+            self.url_clusters[article.url_key] = match
 
-        for article in url_unique:
-            is_duplicate = False
+        return [self.url_clusters[article.url_key] for article in articles]
 
-            for existing in unique_articles:
-                similar, score = self._are_titles_similar(article.title, existing.title)
-                if similar:
-                    logger.debug(
-                        f"Fuzzy duplicate ({score:.0f}%): "
-                        f"'{article.title}' ({article.source}) ~ "
-                        f"'{existing.title}' ({existing.source})"
-                    )
-                    is_duplicate = True
-                    break
+    def _match_exact(self, sorted_titles: List[str]) -> List[Optional[int]]:
+        """
+        Keep-first cluster for each title from full score matrices: against
+        earlier representatives, then against earlier titles of the batch.
+        None means the title starts a new cluster.
+        """
+        if not sorted_titles:
+            return []
+        scorer = dict(
+            scorer=fuzz.ratio,
+            score_cutoff=self.threshold,
+            dtype=np.float64,
+            workers=self.dedup.workers
+        )
+        if self.rep_titles:
+            prior = process.cdist(sorted_titles, self.rep_titles, **scorer) >= self.threshold
+        else:
+            prior = np.zeros((len(sorted_titles), 0), dtype=bool)
+        # Only similarity to earlier articles matters for keep-first
+        similar = np.tril(process.cdist(sorted_titles, sorted_titles, **scorer) >= self.threshold, k=-1)
+        has_prior_match = prior.any(axis=1)
+        has_earlier_match = similar.any(axis=1)
 
-            if not is_duplicate:
-                unique_articles.append(article)
+        matches: List[Optional[int]] = []
+        new_ids = np.full(len(sorted_titles), -1)  # Cluster ID of batch titles that start one
+        next_id = len(self.rep_titles)
+        for i in range(len(sorted_titles)):
+            if has_prior_match[i]:
+                matches.append(int(np.flatnonzero(prior[i])[0]))
+                continue
+            if has_earlier_match[i]:
+                earlier = np.flatnonzero(similar[i, :i] & (new_ids[:i] >= 0))
+                if earlier.size:
+                    matches.append(int(new_ids[earlier[0]]))
+                    continue
+            new_ids[i] = next_id
+            next_id += 1
+            matches.append(None)
+        return matches
 
-        logger.info(f"Deduplication: {len(articles)} -> {len(unique_articles)} articles")
-        return unique_articles
+    def _match_blocked(self, sorted_titles: List[str]) -> List[Optional[int]]:
+        """Keep-first cluster for each title, scoring only candidates sharing a block key."""
+        matches: List[Optional[int]] = []
+        next_id = len(self.rep_titles)
+        for title in sorted_titles:
+            match = self.blocks.find(title)
+            if match is None:
+                self.blocks.add(title, next_id)
+                next_id += 1
+            matches.append(match)
+        return matches
+
+
+class BlockIndex:
+    """
+    Inverted index from title block keys to cluster representatives.
+
+    A block key is the first BLOCK_PREFIX characters of a non-stopword
+    token, so "tariff" and "tariffs" share a key. Only representatives
+    that share at least one key with a title are scored against it, which
+    keeps matching sub-quadratic. Near-duplicates that share no
+    meaningful token are missed; benchmarks/dedup_recall.py measures how
+    often that happens against the exact matcher.
+    """
+
+    BLOCK_PREFIX = 5
+    PROBE_KEYS = 4  # Rarest keys of a title used to look up candidates
+    STOPWORDS = frozenset(
+        'the and for with from that this into over after about amid says said '
+        'are was were has have had its his her their not but who what how why '
+        'new can will may more out off you your our than'.split()
+    )
+
+    def __init__(self, threshold: float):
+        """
+        Args:
+            threshold: Minimum fuzz.ratio score (0-100) between sorted-token titles.
+        """
+        self.threshold = threshold
+        self.titles: Dict[int, str] = {}
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+    def block_keys(self, sorted_title: str) -> Set[str]:
+        keys = {
+            token[:self.BLOCK_PREFIX] for token in sorted_title.split()
+            if len(token) >= 3 and token not in self.STOPWORDS
+        }
+        # Titles with no usable token still get compared with each other
+        return keys or {''}
+
+    def find(self, sorted_title: str) -> Optional[int]:
+        """Lowest ID among representatives similar to the title, if any."""
+        # Probe only the rarest keys; common tokens alone rarely make a match.
+        # Ties go by key: set order varies with the string hash seed
+        keys = sorted(self.block_keys(sorted_title), key=lambda k: (len(self.postings.get(k, ())), k))
+        candidates = set()
+        for key in keys[:self.PROBE_KEYS]:
+            candidates.update(self.postings.get(key, ()))
+        if not candidates:
+            return None
+
+        candidates = sorted(candidates)
+        scores = process.cdist(
+            [sorted_title],
+            [self.titles[candidate] for candidate in candidates],
+            scorer=fuzz.ratio,
+            score_cutoff=self.threshold,
+            dtype=np.float64
+        )[0]
+        matches = np.flatnonzero(scores >= self.threshold)
+        return candidates[matches[0]] if matches.size else None
+
+    def add(self, sorted_title: str, item_id: int) -> None:
+        """Add a representative under an ID not used before."""
+        self.titles[item_id] = sorted_title
+        for key in self.block_keys(sorted_title):
+            self.postings[key].append(item_id)
+
+
+class ExactIndex:
+    """
+    Representatives scored exhaustively: the BlockIndex interface for
+    index: exact, where no near-duplicate may be missed.
+    """
+
+    def __init__(self, threshold: float):
+        """
+        Args:
+            threshold: Minimum fuzz.ratio score (0-100) between sorted-token titles.
+        """
+        self.threshold = threshold
+        self.ids: List[int] = []     # Kept sorted, so the first match has the lowest ID
+        self.titles: List[str] = []  # Title of each ID
+
+    def find(self, sorted_title: str) -> Optional[int]:
+        """Lowest ID among representatives similar to the title, if any."""
+        if not self.titles:
+            return None
+        scores = process.cdist(
+            [sorted_title],
+            self.titles,
+            scorer=fuzz.ratio,
+            score_cutoff=self.threshold,
+            dtype=np.float64
+        )[0]
+        matches = np.flatnonzero(scores >= self.threshold)
+        return self.ids[matches[0]] if matches.size else None
+
+    def add(self, sorted_title: str, item_id: int) -> None:
+        """Add a representative under an ID not used before."""
+        position = bisect.bisect(self.ids, item_id)
+        self.ids.insert(position, item_id)
+        self.titles.insert(position, sorted_title)
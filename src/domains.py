@@ -0,0 +1,144 @@
+"""Suffix-indexed lookup of per-domain attributes (paywalls, host limits)."""
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Multi-label public suffixes seen among news sites. Single-label TLDs
+# (com, uk, ...) are public suffixes implicitly.
+PUBLIC_SUFFIXES = frozenset({
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'plc.uk', 'me.uk',
+    'com.au', 'net.au', 'org.au', 'gov.au', 'edu.au',
+    'co.nz', 'org.nz', 'govt.nz', 'ac.nz',
+    'co.jp', 'ne.jp', 'or.jp', 'ac.jp', 'go.jp',
+    'co.kr', 'or.kr', 'go.kr',
+    'co.in', 'net.in', 'org.in', 'gov.in',
+    'co.za', 'org.za', 'gov.za',
+    'co.il', 'org.il', 'gov.il',
+    'com.ar', 'com.br', 'com.mx', 'com.co', 'com.pe', 'com.ve', 'com.uy',
+    'com.cn', 'com.hk', 'com.tw', 'com.sg', 'com.my', 'com.ph', 'com.pk',
+    'com.tr', 'com.sa', 'com.eg', 'com.ng', 'com.gh', 'co.ke',
+    'blogspot.com', 'github.io',
+})
+
+
+def host_of(url: str) -> str:
+    """Lowercase host of a URL, without port or a leading 'www.'."""
+    try:
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def is_public_suffix(domain: str) -> bool:
+    return '.' not in domain or domain in PUBLIC_SUFFIXES
+
+
+def registrable_domain(host: str) -> str:
+    """The host's domain one label below its public suffix ('feeds.bbci.co.uk' -> 'bbci.co.uk')."""
+    if host.replace('.', '').isdigit():
+        return host  # IPv4 address
+    labels = host.split('.')
+    for i in range(len(labels) - 1):
+        if is_public_suffix('.'.join(labels[i + 1:])):
+            return '.'.join(labels[i:])
+    return host
+
+
+class DomainIndex:
+    """
+    Maps domains to attribute dicts and answers "which entry covers this
+    host?" by walking the host's labels from most to least specific, so a
+    lookup costs one dict probe per label however many domains are indexed.
+
+    An entry for 'ft.com' covers 'ft.com' and every subdomain. Lookups stop
+    at public suffixes, so an entry can never cover all of 'co.uk'. Results
+    are memoized per host in a bounded LRU.
+    """
+
+    def __init__(self, domains: Optional[Dict[str, dict]] = None, memo_size: int = 4096):
+        """
+        Initialize DomainIndex.
+
+        Args:
+            domains: Initial {domain: attributes} entries.
+            memo_size: Maximum number of memoized host lookups.
+        """
+        self._entries: Dict[str, dict] = {}
+        self._memo: 'OrderedDict[str, Optional[dict]]' = OrderedDict()
+        self.memo_size = memo_size
+        for domain, attrs in (domains or {}).items():
+            self.add(domain, **attrs)
+
+    @classmethod
+    def from_domains(cls, domains: Iterable[str], **attrs) -> 'DomainIndex':
+        """Index every domain with the same attributes."""
+        index = cls()
+        for domain in domains:
+            index.add(domain, **attrs)
+        return index
+
+    @staticmethod
+    def _normalize(domain: str) -> str:
+        domain = domain.strip().lower().rstrip('.')
+        return domain[4:] if domain.startswith('www.') else domain
+
+    def add(self, domain: str, **attrs) -> None:
+        """Add or update a domain's attributes."""
+        domain = self._normalize(domain)
+        if is_public_suffix(domain):
+            logger.warning(f"Not indexing public suffix '{domain}'")
+            return
+        self._entries.setdefault(domain, {}).update(attrs)
+        self._memo.clear()
+
+    def remove(self, domain: str) -> None:
+        self._entries.pop(self._normalize(domain), None)
+        self._memo.clear()
+
+    def __contains__(self, domain: str) -> bool:
+        return self._normalize(domain) in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _find(self, host: str) -> Optional[dict]:
+        labels = host.split('.')
+        for i in range(len(labels) - 1):
+            candidate = '.'.join(labels[i:])
+            if is_public_suffix(candidate):
+                return None
+            entry = self._entries.get(candidate)
+            if entry is not None:
+                return entry
+        return None
+
+    def lookup(self, host: str) -> Optional[dict]:
+        """Attributes of the most specific entry covering host, or None."""
+        try:
+            entry = self._memo[host]
+            self._memo.move_to_end(host)
+            return entry
+        except KeyError:
+            pass
+        entry = self._find(host)
+        self._memo[host] = entry
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return entry
+
+    def lookup_url(self, url: str) -> Optional[dict]:
+        return self.lookup(host_of(url))
+
+    def get(self, host: str, attr: str, default: Any = None) -> Any:
+        """One attribute for host, falling back to default."""
+        entry = self.lookup(host)
+        if entry is None:
+            return default
+        return entry.get(attr, default)
@@ -0,0 +1,63 @@
+"""Per-title text features computed once and shared by dedup and country flags."""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+from .country_detector import find_countries
+
+# Prefixes that don't change what a headline is about
+NOISE_PREFIXES = ('breaking:', 'update:', 'live:', 'exclusive:', 'watch:', 'video:')
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, drop noise prefixes and punctuation, collapse whitespace."""
+    normalized = title.lower()
+    for prefix in NOISE_PREFIXES:
+        if normalized.startswith(prefix):
+            normalized = normalized[len(prefix):].strip()
+    normalized = _PUNCT_RE.sub('', normalized)
+    return ' '.join(normalized.split())
+
+
+@dataclass(frozen=True, slots=True)
+class TitleFeatures:
+    title: str                 # The headline as published
+    normalized: str            # Output of normalize_title()
+    tokens: FrozenSet[str]     # Distinct normalized tokens
+    sorted_tokens: str         # Tokens sorted and space-joined, as token_sort_ratio compares them
+
+    @property
+    def countries(self) -> Tuple[str, ...]:
+        """
+        Country keywords matched in the title, in order.
+
+        Matched on first use rather than up front: only the global and
+        odd_news flags read them, while every parsed article gets features.
+        """
+        return _title_countries(self.title)
+
+
+@lru_cache(maxsize=8192)
+def _title_countries(title: str) -> Tuple[str, ...]:
+    return tuple(find_countries(title))
+
+
+@lru_cache(maxsize=8192)
+def title_features(title: str) -> TitleFeatures:
+    """
+    Build the features record for a headline.
+
+    Memoized, since the same headline appears in several regions and in
+    consecutive runs of a long-lived process.
+    """
+    normalized = normalize_title(title)
+    words = normalized.split()
+    return TitleFeatures(
+        title=title,
+        normalized=normalized,
+        tokens=frozenset(words),
+        sorted_tokens=' '.join(sorted(words))
+    )
@@ -0,0 +1,143 @@
+"""Persistent on-disk HTTP cache for feed bodies with conditional GET support."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedFeed:
+    """Last good copy of a feed plus the validators needed to revalidate it."""
+    url: str
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)  # Decoding headers
+    etag: str = ''
+    last_modified: str = ''
+    validated_at: float = 0.0  # When the origin last confirmed this body
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that let the origin answer 304 if the feed is unchanged."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def age(self) -> float:
+        """Seconds since the origin last confirmed this body."""
+        return time.time() - self.validated_at
+
+
+class FeedCache:
+    """
+    Stores one entry per feed URL as a small JSON metadata file plus the body.
+
+    Entries are written atomically (temp file + rename) so a crashed or
+    concurrent run never leaves a half-written body behind.
+    """
+
+    def __init__(self, cache_dir: str, stale_if_error: float = 86400):
+        """
+        Initialize FeedCache.
+
+        Args:
+            cache_dir: Directory to keep cached feeds in (created if missing).
+            stale_if_error: Max age in seconds of a cached body that may be
+                            served when the feed cannot be fetched.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stale_if_error = stale_if_error
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.json', self.cache_dir / f'{key}.body'
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _write_meta(self, entry: CachedFeed) -> None:
+        meta_path, _ = self._paths(entry.url)
+        meta = asdict(entry)
+        del meta['body']
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def get(self, url: str) -> Optional[CachedFeed]:
+        """Return the cached entry for a URL, or None if there isn't one."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+            return None
+
+        return CachedFeed(
+            url=url,
+            body=body,
+            headers=meta.get('headers', {}),
+            etag=meta.get('etag', ''),
+            last_modified=meta.get('last_modified', ''),
+            validated_at=meta.get('validated_at', 0.0)
+        )
+
+    def store(self, url: str, body: bytes, headers: Dict[str, str], validators) -> None:
+        """
+        Save a freshly downloaded body.
+
+        Args:
+            url: Feed URL
+            body: Raw response body
+            headers: Headers needed to decode the body later
+            validators: Response headers carrying ETag/Last-Modified
+        """
+        entry = CachedFeed(
+            url=url,
+            body=body,
+            headers=headers,
+            etag=validators.get('ETag', ''),
+            last_modified=validators.get('Last-Modified', ''),
+            validated_at=time.time()
+        )
+        _, body_path = self._paths(url)
+        try:
+            self._write_atomic(body_path, body)
+            self._write_meta(entry)
+        except OSError as e:
+            logger.warning(f"Failed to cache {url}: {e}")
+
+    def revalidated(self, entry: CachedFeed, headers) -> None:
+        """Record a 304 response: the cached body is current again."""
+        entry.validated_at = time.time()
+        # Origins may rotate validators on a 304
+        entry.etag = headers.get('ETag', entry.etag)
+        entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+        try:
+            self._write_meta(entry)
+        except OSError as e:
+            logger.warning(f"Failed to update cache entry for {entry.url}: {e}")
+
+    def can_serve_stale(self, entry: Optional[CachedFeed]) -> bool:
+        """Whether a cached entry is young enough to serve when a fetch fails."""
+        return entry is not None and entry.age() <= self.stale_if_error
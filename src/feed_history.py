@@ -0,0 +1,157 @@
+"""Persistent per-feed performance history for adaptive fetching."""
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FeedStats:
+    """Rolling statistics for one feed URL."""
+    latencies: List[float] = field(default_factory=list)  # Recent successful fetches, oldest first
+    sizes: List[int] = field(default_factory=list)        # Bytes of those fetches
+    survivors: List[int] = field(default_factory=list)    # Articles that made the page, per run
+    consecutive_failures: int = 0
+    total_failures: int = 0
+    last_attempt: float = 0.0
+    last_success: float = 0.0
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of recent latencies, or None without data."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class FeedHistory:
+    """
+    Keeps a small JSON store of fetch latency, size, failures and article
+    survival per feed URL, and derives fetch policy from it:
+
+    - timeouts from observed p95 latency instead of one global value
+    - fetch order, slowest feeds first, so they don't finish last
+    - a circuit breaker that stops retrying chronically failing feeds and
+      only probes them once per probe_interval
+    """
+
+    MIN_SAMPLES = 3  # Latency samples needed before adapting the timeout
+
+    def __init__(
+        self,
+        path: str,
+        window: int = 20,
+        timeout_multiplier: float = 3.0,
+        min_timeout: float = 5.0,
+        failure_threshold: int = 5,
+        probe_interval: float = 6 * 3600
+    ):
+        """
+        Initialize FeedHistory.
+
+        Args:
+            path: JSON file to load from and save to.
+            window: Number of recent samples kept per feed.
+            timeout_multiplier: Adaptive timeout is p95 latency times this.
+            min_timeout: Lower bound for adaptive timeouts, in seconds.
+            failure_threshold: Consecutive failures before a feed is circuit-broken.
+            probe_interval: Seconds between probes of a circuit-broken feed.
+        """
+        self.path = Path(path)
+        self.window = window
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._stats: Dict[str, FeedStats] = self._load()
+
+    def _load(self) -> Dict[str, FeedStats]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            return {url: FeedStats(**data) for url, data in raw.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable feed history {self.path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Write the history to disk atomically."""
+        with self._lock:
+            data = {url: asdict(stats) for url, stats in self._stats.items()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.tmp-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save feed history: {e}")
+
+    def get(self, url: str) -> FeedStats:
+        with self._lock:
+            return self._stats.setdefault(url, FeedStats())
+
+    def _trim(self, values: list) -> None:
+        del values[:-self.window]
+
+    def record_success(self, url: str, latency: float, size: int) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(url, FeedStats())
+            stats.latencies.append(round(latency, 3))
+            stats.sizes.append(size)
+            self._trim(stats.latencies)
+            self._trim(stats.sizes)
+            stats.consecutive_failures = 0
+            stats.last_attempt = stats.last_success = time.time()
+
+    def record_failure(self, url: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(url, FeedStats())
+            stats.consecutive_failures += 1
+            stats.total_failures += 1
+            stats.last_attempt = time.time()
+
+    def record_survivors(self, url: str, count: int) -> None:
+        """Record how many of a feed's articles made it onto the page this run."""
+        with self._lock:
+            stats = self._stats.setdefault(url, FeedStats())
+            stats.survivors.append(count)
+            self._trim(stats.survivors)
+
+    def timeout_for(self, url: str, default: float) -> float:
+        """Timeout derived from the feed's p95 latency, capped at `default`."""
+        stats = self.get(url)
+        if len(stats.latencies) < self.MIN_SAMPLES:
+            return default
+        p95 = stats.percentile(95)
+        return min(default, max(self.min_timeout, p95 * self.timeout_multiplier))
+
+    def is_circuit_open(self, url: str) -> bool:
+        """Whether a feed has failed often enough to stop retrying it."""
+        return self.get(url).consecutive_failures >= self.failure_threshold
+
+    def should_skip(self, url: str) -> bool:
+        """Skip a circuit-broken feed unless its next probe is due."""
+        stats = self.get(url)
+        if stats.consecutive_failures < self.failure_threshold:
+            return False
+        return time.time() - stats.last_attempt < self.probe_interval
+
+    def order(self, urls: List[str]) -> List[str]:
+        """Order URLs slowest first; feeds without history count as slowest."""
+        def key(url):
+            p95 = self.get(url).percentile(95)
+            return -(p95 if p95 is not None else math.inf)
+        return sorted(urls, key=key)
@@ -1,9 +1,18 @@
 """Fetches RSS feeds with proper error handling, rate limiting, and retry logic."""
 import requests
 import logging
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Optional, Dict, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from .domains import DomainIndex, host_of
+from .feed_cache import FeedCache
+from .feed_history import FeedHistory
+from .singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +25,110 @@ class RetryConfig:
     multiplier: float = 2.0
 
 
+@dataclass
+class ConcurrencyConfig:
+    """Configuration for concurrent fetching with per-host politeness."""
+    max_workers: int = 16   # Requests in flight across all hosts
+    per_host: int = 2       # Requests in flight to any single host
+    host_delay: float = 0.5  # Minimum spacing between request starts on one host
+    host_limits: Dict[str, dict] = field(default_factory=dict)  # Per-domain per_host/delay overrides
+    share_window: float = 0.0  # Seconds a finished fetch is reused by later fetches of the URL
+
+
+@dataclass
+class FeedResponse:
+    """Raw feed payload plus the response headers needed to decode it."""
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)  # Lower-cased names
+    truncated: bool = False   # Body was cut off at max_bytes
+    from_cache: bool = False  # Served from the feed cache (304 or stale-if-error)
+
+
+# Response headers feedparser uses to decode and resolve a payload
+DECODE_HEADERS = ('content-type', 'content-location', 'content-language')
+
+
+def decode_headers(headers) -> Dict[str, str]:
+    """Pick the headers FeedParser needs, with lower-cased names."""
+    return {name: headers[name] for name in DECODE_HEADERS if name in headers}
+
+
+# Fetches in flight (or recently finished) anywhere in the process, keyed by URL
+_FLIGHTS = SingleFlight()
+
+# Feed URL -> URL it last redirected to, so aliases of one feed share a fetch
+_REDIRECTS: Dict[str, str] = {}
+_REDIRECTS_LOCK = threading.Lock()
+
+
+def _flight_key(url: str) -> str:
+    with _REDIRECTS_LOCK:
+        return _REDIRECTS.get(url, url)
+
+
+def _record_redirect(url: str, final_url: str) -> None:
+    with _REDIRECTS_LOCK:
+        if final_url == url:
+            _REDIRECTS.pop(url, None)
+        else:
+            _REDIRECTS[url] = final_url
+
+
+class HostThrottle:
+    """
+    Per-host politeness limits shared by all fetch threads.
+
+    Caps the number of in-flight requests to each host and spaces out
+    request starts on the same host by at least `delay` seconds. Requests
+    to different hosts never wait on each other. A DomainIndex of limits
+    can override `per_host` and `delay` for a domain and its subdomains.
+    """
+
+    def __init__(self, per_host: int = 2, delay: float = 0.5, limits: Optional[DomainIndex] = None):
+        self.per_host = max(1, per_host)
+        self.delay = max(0.0, delay)
+        self.limits = limits or DomainIndex()
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's request slots, waiting for its spacing."""
+        host = self.host_for(url)
+        domain = host_of(url)
+        delay = max(0.0, self.limits.get(domain, 'delay', self.delay))
+        with self._lock:
+            semaphore = self._slots.get(host)
+            if semaphore is None:
+                per_host = max(1, self.limits.get(domain, 'per_host', self.per_host))
+                semaphore = threading.BoundedSemaphore(per_host)
+                self._slots[host] = semaphore
+
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
 class FeedFetcher:
     def __init__(
         self,
         user_agent: str,
         timeout: int = 15,
-        retry_config: Optional[RetryConfig] = None
+        retry_config: Optional[RetryConfig] = None,
+        concurrency: Optional[ConcurrencyConfig] = None,
+        cache: Optional[FeedCache] = None,
+        max_bytes: int = 2 * 1024 * 1024,
+        history: Optional[FeedHistory] = None
     ):
         self.session = requests.Session()
         self.session.headers.update({
@@ -30,39 +137,220 @@ class FeedFetcher:
         })
         self.timeout = timeout
         self.retry_config = retry_config or RetryConfig()
+        self.concurrency = concurrency or ConcurrencyConfig()
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.history = history
+
+        # Size the connection pool so concurrent workers don't discard connections
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency.max_workers,
+            pool_maxsize=self.concurrency.max_workers
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.throttle = HostThrottle(
+            per_host=self.concurrency.per_host,
+            delay=self.concurrency.host_delay,
+            limits=DomainIndex(self.concurrency.host_limits)
+        )
+
+    def _read_body(self, response: requests.Response, url: str):
+        """Stream the raw body, cutting it off at max_bytes.
+
+        Returns (content, truncated). No charset detection happens here;
+        FeedParser decodes the bytes using the response headers.
+        """
+        chunks = []
+        size = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            remaining = self.max_bytes - size
+            if len(chunk) > remaining:
+                chunks.append(chunk[:remaining])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+
+        if truncated:
+            logger.warning(f"Feed {url} exceeds {self.max_bytes} bytes, truncating")
+        return b''.join(chunks), truncated
+
+    def _record_success(self, url: str, started: float, size: int) -> None:
+        if self.history:
+            self.history.record_success(url, time.monotonic() - started, size)
 
-    def fetch(self, url: str, timeout: Optional[int] = None) -> Optional[str]:
+    def fetch(self, url: str, timeout: Optional[int] = None) -> Optional[FeedResponse]:
+        """Fetch RSS feed content from URL, sharing the request with other callers.
+
+        Fetches are single-flight across the process: while a URL is being
+        fetched, other fetches of it (from this run, a concurrent run or
+        another FeedFetcher) wait for that request and get its response. A
+        successful response is also reused for `share_window` seconds after
+        it arrived. URLs known to redirect are keyed by their target, so
+        aliases of one feed share a request too.
+
+        Args:
+            url: The feed URL to fetch
+            timeout: Optional per-request timeout override
+        """
+        return _FLIGHTS.do(
+            _flight_key(url), lambda: self._fetch(url, timeout), window=self.concurrency.share_window
+        )
+
+    def _fetch(self, url: str, timeout: Optional[int] = None) -> Optional[FeedResponse]:
         """Fetch RSS feed content from URL with retry logic.
 
+        The body is returned as raw bytes together with its decoding headers.
+
+        With a cache configured, the request is conditional on the cached
+        ETag/Last-Modified and a 304 reuses the cached body. If every attempt
+        fails, a cached body no older than the cache's stale_if_error age is
+        returned instead of None.
+
+        With a history configured, the default timeout adapts to the feed's
+        observed p95 latency, and circuit-broken feeds are skipped until a
+        probe is due, then probed with a single attempt. A skipped feed is
+        served from the cache on the same stale_if_error terms as a failed
+        one.
+
         Args:
             url: The feed URL to fetch
             timeout: Optional per-request timeout override
         """
+        max_attempts = self.retry_config.max_attempts
         effective_timeout = timeout if timeout is not None else self.timeout
+        cached = self.cache.get(url) if self.cache else None
+        if self.history:
+            if self.history.should_skip(url):
+                logger.info(f"Skipping circuit-broken feed {url}")
+                if self.cache and self.cache.can_serve_stale(cached):
+                    logger.warning(f"Serving cached copy of {url} ({cached.age() / 3600:.1f}h old)")
+                    return FeedResponse(cached.body, cached.headers, from_cache=True)
+                return None
+            if self.history.is_circuit_open(url):
+                logger.info(f"Probing circuit-broken feed {url}")
+                max_attempts = 1
+            if timeout is None:
+                effective_timeout = self.history.timeout_for(url, self.timeout)
 
-        for attempt in range(self.retry_config.max_attempts):
+        headers = cached.conditional_headers() if cached else {}
+
+        for attempt in range(max_attempts):
             try:
-                response = self.session.get(url, timeout=effective_timeout)
-                response.raise_for_status()
-                return response.text
+                with self.throttle.slot(url):
+                    started = time.monotonic()
+                    with self.session.get(
+                        url, timeout=effective_timeout, headers=headers, stream=True
+                    ) as response:
+                        _record_redirect(url, response.url or url)
+                        if response.status_code == 304 and cached:
+                            logger.debug(f"Not modified: {url}")
+                            self._record_success(url, started, len(cached.body))
+                            self.cache.revalidated(cached, response.headers)
+                            return FeedResponse(cached.body, cached.headers, from_cache=True)
+                        response.raise_for_status()
+                        content, truncated = self._read_body(response, url)
+
+                self._record_success(url, started, len(content))
+                response_headers = decode_headers(response.headers)
+                if self.cache:
+                    self.cache.store(url, content, response_headers, response.headers)
+                return FeedResponse(content, response_headers, truncated=truncated)
             except requests.RequestException as e:
-                is_last_attempt = attempt == self.retry_config.max_attempts - 1
+                is_last_attempt = attempt == max_attempts - 1
 
                 if is_last_attempt:
-                    logger.warning(f"Failed to fetch {url} after {self.retry_config.max_attempts} attempts: {e}")
+                    logger.warning(f"Failed to fetch {url} after {max_attempts} attempts: {e}")
+                    if self.history:
+                        self.history.record_failure(url)
+                    if self.cache and self.cache.can_serve_stale(cached):
+                        logger.warning(f"Serving cached copy of {url} ({cached.age() / 3600:.1f}h old)")
+                        return FeedResponse(cached.body, cached.headers, from_cache=True)
                     return None
 
                 # Calculate exponential backoff delay
                 delay = self.retry_config.base_delay * (self.retry_config.multiplier ** attempt)
-                logger.info(f"Retry {attempt + 1}/{self.retry_config.max_attempts} for {url} in {delay:.1f}s: {e}")
+                logger.info(f"Retry {attempt + 1}/{max_attempts} for {url} in {delay:.1f}s: {e}")
                 time.sleep(delay)
 
         return None
 
-    def fetch_all(self, urls: List[str], delay: float = 0.5) -> Dict[str, Optional[str]]:
-        """Fetch multiple feeds with rate limiting."""
-        results = {}
-        for url in urls:
-            results[url] = self.fetch(url)
-            time.sleep(delay)
-        return results
+    def start_all(
+        self,
+        urls: List[str],
+        timeouts: Optional[Dict[str, Optional[int]]] = None
+    ) -> 'PendingFetches':
+        """
+        Start fetching multiple feeds concurrently and return immediately.
+
+        Up to `max_workers` requests run at once, with per-host limits and
+        spacing enforced by the shared HostThrottle, so total wall-clock time
+        approaches that of the slowest single feed. With a history configured,
+        historically slow feeds are started first.
+
+        Args:
+            urls: Feed URLs to fetch (duplicates and known redirect aliases are fetched once)
+            timeouts: Optional per-URL timeout overrides
+        """
+        timeouts = timeouts or {}
+        unique_urls = list(dict.fromkeys(urls))
+        if self.history:
+            unique_urls = self.history.order(unique_urls)
+
+        workers = max(1, min(self.concurrency.max_workers, len(unique_urls)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch')
+        futures = {
+            url: executor.submit(self.fetch, url, timeouts.get(url))
+            for url in unique_urls
+        }
+        return PendingFetches(executor, futures)
+
+    def fetch_all(
+        self,
+        urls: List[str],
+        timeouts: Optional[Dict[str, Optional[int]]] = None
+    ) -> Dict[str, Optional[FeedResponse]]:
+        """Fetch multiple feeds concurrently and wait for all of them (see start_all)."""
+        with self.start_all(urls, timeouts) as pending:
+            return {url: pending.result(url) for url in pending.urls}
+
+
+class PendingFetches:
+    """
+    Feeds being fetched in the background by FeedFetcher.start_all().
+
+    Callers wait on individual URLs, so they can start processing the first
+    feeds while the rest are still downloading, and can cancel fetches they
+    no longer need.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, futures: Dict[str, Future]):
+        self._executor = executor
+        self._futures = futures
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self._futures)
+
+    def result(self, url: str) -> Optional[FeedResponse]:
+        """Wait for one feed; None if it failed, was cancelled or was never started."""
+        future = self._futures.get(url)
+        if future is None or future.cancelled():
+            return None
+        return future.result()
+
+    def cancel(self, urls: List[str]) -> int:
+        """Cancel fetches that haven't started yet; returns how many were cancelled."""
+        return sum(1 for url in urls if url in self._futures and self._futures[url].cancel())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'PendingFetches':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
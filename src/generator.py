@@ -2,7 +2,15 @@
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import Dict
 import json
+import logging
+from .output import OutputWriter
+
+logger = logging.getLogger(__name__)
+
+# Index of the per-region data shards, relative to the output directory
+SHARD_MANIFEST = 'data/manifest.json'
 
 
 class HTMLGenerator:
@@ -12,25 +20,84 @@ class HTMLGenerator:
             autoescape=True
         )
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = OutputWriter(self.output_dir)
 
     def generate(self, data: dict, default_region: str = 'us'):
-        """Generate static HTML files."""
+        """Generate static HTML files.
+
+        index.html carries every region's tab but only the default region's
+        articles; the page fetches the others from their data/<region>.json
+        shard when first shown.
+        """
         template = self.env.get_template('index.html')
 
-        generated_at = datetime.now(timezone.utc).strftime('%b %d, %I:%M %p UTC')
+        now = datetime.now(timezone.utc)
+        generated_at = now.strftime('%b %d, %I:%M %p UTC')
+        shards = self._write_shards(data, default_region, now)
 
         html = template.render(
             regions=data,
             default_region=default_region,
-            generated_at=generated_at
+            generated_at=generated_at,
+            shards=shards
         )
-
-        output_path = self.output_dir / 'index.html'
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        self.writer.write('index.html', html)
 
         # Also save JSON for potential API use
-        json_path = self.output_dir / 'data.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        self.writer.write('data.json', json.dumps(data, indent=2))
+
+    def _write_shards(self, data: dict, default_region: str, now: datetime) -> Dict[str, str]:
+        """
+        Write each region as compact JSON under data/, plus data/manifest.json.
+
+        Returns region ID -> shard URL. The URL carries the shard's content
+        hash, so browsers can cache shards and still see every change.
+        """
+        shards = {}
+        manifest = {'generated_at': now.isoformat(), 'default_region': default_region, 'regions': {}}
+        for region_id, region in data.items():
+            name = f'data/{region_id}.json'
+            body = json.dumps(region, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            self.writer.write(name, body)
+            digest = self.writer.hash_of(name)
+            shards[region_id] = f'{name}?v={digest[:12]}'
+            manifest['regions'][region_id] = {
+                'name': region['name'],
+                'url': shards[region_id],
+                'sha256': digest,
+                'size': len(body),
+                'articles': len(region['articles']),
+            }
+        self.writer.write(SHARD_MANIFEST, json.dumps(manifest, separators=(',', ':'), ensure_ascii=False))
+
+        # Drop shards of regions no longer generated
+        for name in list(self.writer.manifest):
+            if name.startswith('data/') and name.endswith('.json') and name != SHARD_MANIFEST \
+                    and name[len('data/'):-len('.json')] not in data:
+                self.writer.remove(name)
+        return shards
+
+    def load_existing(self) -> dict:
+        """Region data from the last generated data.json, or {} if there is none."""
+        try:
+            with open(self.output_dir / 'data.json', 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable data.json: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def merge(self, data: dict, default_region: str = 'us') -> dict:
+        """
+        Splice freshly aggregated regions into the existing output.
+
+        Regions already on the page are replaced in place and keep their tab
+        position; new regions are appended. Every other region is left as it
+        was last generated. Returns the merged data.
+        """
+        merged = self.load_existing()
+        merged.update(data)
+        self.generate(merged, default_region)
+        return merged
@@ -0,0 +1,180 @@
+"""Atomic, skip-unchanged output writes with precompressed siblings and a hash manifest."""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    import brotli
+except ImportError:  # Optional: .br siblings are skipped without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Files worth precompressing; images are already compressed
+COMPRESSIBLE_SUFFIXES = {'.html', '.json', '.css', '.js', '.txt', '.svg', '.xml'}
+
+# Precompressed sibling suffix for each Content-Encoding
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+class OutputWriter:
+    """
+    Writes site files so readers and deploys only ever see complete, real changes.
+
+    Each file is written to a temp file in the same directory and renamed
+    into place, so it is never seen half-written. A file whose content hash
+    matches the last write is left untouched, mtime included, so the Pages
+    deploy only sees files that actually changed. Text files also get
+    .gz and (with the brotli package) .br siblings, compressed once here
+    instead of on every request.
+
+    manifest.json in the output directory maps every written file to its
+    SHA-256, size and precompressed encodings.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, output_dir: Union[str, Path], compress: bool = True):
+        """
+        Initialize OutputWriter.
+
+        Args:
+            output_dir: Site root; file names are relative to it.
+            compress: Write .gz/.br siblings for text files.
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.manifest: Dict[str, dict] = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.output_dir / self.MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable output manifest: {e}")
+            return {}
+
+    def write(self, name: str, content: Union[bytes, str]) -> bool:
+        """
+        Write a file under the output directory unless its content is unchanged.
+
+        Args:
+            name: Path relative to the output directory (e.g. 'data/us.json').
+            content: File content; text is encoded as UTF-8.
+
+        Returns:
+            True if the file was (re)written.
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.output_dir / name
+        encodings = self._encodings_for(path)
+
+        entry = {'sha256': digest, 'size': len(data), 'encodings': encodings}
+        if self._is_current(name, path, digest, encodings):
+            logger.debug(f"Unchanged: {name}")
+            if name not in self.manifest:
+                self.manifest[name] = entry
+                self._save_manifest()
+            return False
+
+        self._atomic_write(path, data)
+        for encoding, suffix in ENCODINGS.items():
+            sibling = path.with_name(path.name + suffix)
+            if encoding in encodings:
+                self._atomic_write(sibling, self._compress(data, encoding))
+            elif sibling.exists():
+                sibling.unlink()  # Stale, e.g. brotli was uninstalled
+
+        self.manifest[name] = entry
+        self._save_manifest()
+        logger.debug(f"Wrote {name} ({len(data)} bytes)")
+        return True
+
+    def remove(self, name: str) -> None:
+        """Delete a file, its precompressed siblings and its manifest entry."""
+        path = self.output_dir / name
+        for target in [path] + [path.with_name(path.name + suffix) for suffix in ENCODINGS.values()]:
+            if target.exists():
+                target.unlink()
+        if self.manifest.pop(name, None) is not None:
+            self._save_manifest()
+
+    def copy(self, name: str, source: Union[str, Path]) -> bool:
+        """Write a copy of an existing file (see write())."""
+        return self.write(name, Path(source).read_bytes())
+
+    def _encodings_for(self, path: Path) -> list:
+        if not self.compress or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            return []
+        return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None]
+
+    def _is_current(self, name: str, path: Path, digest: str, encodings: list) -> bool:
+        """Whether the file and its siblings already hold this content."""
+        if not path.exists():
+            return False
+        entry = self.manifest.get(name)
+        if entry is None:
+            # No record (e.g. first run with a manifest): compare against the file itself
+            if hashlib.sha256(path.read_bytes()).hexdigest() != digest:
+                return False
+        elif entry['sha256'] != digest or entry['encodings'] != encodings:
+            return False
+        return all(path.with_name(path.name + ENCODINGS[encoding]).exists() for encoding in encodings)
+
+    @staticmethod
+    def _compress(data: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(data, quality=11)
+        # mtime=0 keeps the output, and so the deploy diff, deterministic
+        return gzip.compress(data, compresslevel=9, mtime=0)
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; the site must stay world-readable
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _save_manifest(self) -> None:
+        data = json.dumps(self.manifest, indent=2, sort_keys=True).encode('utf-8')
+        self._atomic_write(self.output_dir / self.MANIFEST, data)
+
+    def hash_of(self, name: str) -> Optional[str]:
+        """SHA-256 of a file as last written, if known."""
+        entry = self.manifest.get(name)
+        return entry['sha256'] if entry else None
+
+
+def precompressed(path: Path, accept_encoding: str) -> Optional[tuple]:
+    """
+    Best precompressed sibling of `path` the client accepts.
+
+    Returns (sibling path, Content-Encoding) or None to serve `path` as is.
+    Siblings older than the file (written by something other than
+    OutputWriter) are ignored.
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(','):
+        encoding, _, params = part.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(encoding.strip())
+    for encoding, suffix in ENCODINGS.items():
+        sibling = path.with_name(path.name + suffix)
+        if encoding in accepted and sibling.is_file() and sibling.stat().st_mtime >= path.stat().st_mtime:
+            return sibling, encoding
+    return None
@@ -0,0 +1,88 @@
+"""Process-pool workers for the CPU-bound stages: feed parsing and region selection."""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .deduplicator import ArticleDeduplicator
+from .features import title_features
+from .parser import ArticleBatch, FeedParser
+from .ranking import Ranker
+
+logger = logging.getLogger(__name__)
+
+# Per-worker parser, built once by the pool initializer
+_parser: Optional[FeedParser] = None
+
+
+def _init_worker(parser_options: dict) -> None:
+    global _parser
+    _parser = FeedParser(**parser_options)
+
+
+def worker_count(processes: int) -> int:
+    """Configured worker processes, with -1 meaning one per core."""
+    return processes if processes > 0 else os.cpu_count() or 1
+
+
+def start_pool(processes: int, parser_options: dict) -> ProcessPoolExecutor:
+    """
+    Start a pool of worker processes.
+
+    Workers come from a forkserver (spawn where unavailable) rather than a
+    plain fork, since the aggregator forks while fetch threads are running.
+
+    Args:
+        processes: Number of workers (-1 = one per core).
+        parser_options: FeedParser keyword arguments for the workers' parsers.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(
+        max_workers=worker_count(processes),
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(parser_options,)
+    )
+
+
+def parse_rows(content: bytes, source_name: str, headers: Dict[str, str]) -> List[list]:
+    """Parse a feed in a worker; articles come back as compact rows."""
+    return ArticleBatch(_parser.parse(content, source_name, headers)).to_rows()
+
+
+def select_rows(
+    rows: List[list],
+    dedup_options: dict,
+    settings: dict,
+    region_data: dict,
+    now: datetime
+) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Deduplicate and rank a region's annotated articles in a worker.
+
+    Runs the same keep-first DedupSession and Ranker as the in-process
+    pipeline over the region's articles in feed order, so the selection is
+    identical.
+
+    Args:
+        rows: The region's articles as rows, in feed order.
+        dedup_options: ArticleDeduplicator keyword arguments (no story index).
+        settings: feeds.yaml settings, for the Ranker.
+        region_data: The region's feeds.yaml entry, for the Ranker.
+        now: The run's reference time.
+
+    Returns:
+        (row index, cluster ID) of each selected article in page order, and
+        how many articles survived deduplication.
+    """
+    articles = ArticleBatch.from_rows(rows).articles
+    for article in articles:
+        article.features = title_features(article.title)
+    index_of = {id(article): index for index, article in enumerate(articles)}
+
+    kept = ArticleDeduplicator(**dedup_options).session().keep(articles)
+    selected = Ranker.from_config(settings, region_data, now).select(kept)
+    return [(index_of[id(article)], article.cluster_id) for article in selected], len(kept)
@@ -0,0 +1,104 @@
+"""Content-addressed cache of parsed feed articles."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .parser import Article, ArticleBatch
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCache:
+    """
+    Maps the hash of a feed payload to the articles it produced.
+
+    An unchanged feed body (a 304, a stale-if-error copy, or simply the
+    same bytes as last hour) therefore skips parsing. Articles are stored
+    before annotation: canonical URLs, sport tags and paywall verdicts are
+    redone on every hit, so verdicts still expire with the paywall verdict
+    cache. Entries are compact JSON row lists, one file per hash; reads
+    refresh an entry's mtime and prune() drops entries unused for longer
+    than max_age.
+    """
+
+    def __init__(self, cache_dir: str, max_age: float = 2 * 86400, salt: str = ''):
+        """
+        Initialize ParseCache.
+
+        Args:
+            cache_dir: Directory to keep entries in (created if missing).
+            max_age: Seconds an unused entry is kept before prune() removes it.
+            salt: Fingerprint of settings that change parse output (parser
+                  limits); part of every key.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.salt = salt.encode('utf-8')
+
+    def key(self, content: bytes, *context: str) -> str:
+        """
+        Cache key for a payload.
+
+        Args:
+            content: Raw feed bytes
+            context: Anything else the parsed result depends on (feed name,
+                     Content-Type)
+        """
+        digest = hashlib.sha256(self.salt)
+        for part in context:
+            digest.update(b'\0' + part.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.json'
+
+    def get(self, key: str) -> Optional[List[Article]]:
+        """Return the cached articles for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                rows = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable parse cache entry {key}: {e}")
+            return None
+
+        try:
+            return ArticleBatch.from_rows(rows).articles
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring malformed parse cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, articles: List[Article]) -> None:
+        """Store the articles produced for a key."""
+        data = json.dumps(ArticleBatch(articles).to_rows(), ensure_ascii=False, separators=(',', ':'))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Failed to write parse cache entry {key}: {e}")
+
+    def prune(self) -> int:
+        """Delete entries unused for longer than max_age; returns how many."""
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
@@ -1,15 +1,35 @@
 """Parses RSS feeds and normalizes article data."""
 import feedparser
-from dateutil import parser as date_parser
+import html
+import io
+import re
+from xml.etree import ElementTree
 from datetime import datetime, timezone
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Dict, Iterable, Iterator
 from dataclasses import dataclass
+from .dates import parse_date, from_struct
+from .features import TitleFeatures
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def format_age(published: datetime, now: datetime) -> str:
+    """Format time since publication (e.g., '2h ago')."""
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    delta = now - published
+
+    if delta.days > 0:
+        return f"{delta.days}d ago"
+    hours = delta.seconds // 3600
+    if hours > 0:
+        return f"{hours}h ago"
+    minutes = delta.seconds // 60
+    return f"{minutes}m ago"
+
+
+@dataclass(slots=True)
 class Article:
     title: str
     url: str
@@ -20,6 +40,14 @@ class Article:
     is_paywalled: bool = False
     country_flag: str = ''
     sport: str = ''  # For sports section categorization
+    cluster_id: int = -1  # Story cluster assigned by deduplication
+    canonical_url: str = ''  # Normalized URL key for exact dedup and lookups
+    features: Optional[TitleFeatures] = None  # Precomputed title features (not serialized)
+
+    @property
+    def url_key(self) -> str:
+        """Canonical URL if one was assigned, otherwise the raw URL."""
+        return self.canonical_url or self.url
 
     def calculate_popularity(self, total_items: int = 1) -> None:
         """
@@ -33,48 +61,160 @@ class Article:
         """
         self.popularity_score = 1.0 / (self.feed_position + 1)
 
-    def to_dict(self) -> dict:
+    def to_dict(self, now: Optional[datetime] = None) -> dict:
         return {
             'title': self.title,
             'url': self.url,
             'source': self.source,
             'published': self.published.isoformat(),
-            'age': self._format_age(),
+            'age': format_age(self.published, now or datetime.now(timezone.utc)),
             'popularity_score': round(self.popularity_score, 3),
             'feed_position': self.feed_position,
             'is_paywalled': self.is_paywalled,
             'country_flag': self.country_flag
         }
 
-    def _format_age(self) -> str:
-        """Format time since publication (e.g., '2 hours ago')."""
-        now = datetime.now(timezone.utc)
-        pub = self.published
-        if pub.tzinfo is None:
-            pub = pub.replace(tzinfo=timezone.utc)
-        delta = now - pub
+    def to_row(self) -> list:
+        """Compact positional form, for caches and process boundaries."""
+        return [
+            self.title, self.url, self.source, self.published.isoformat(),
+            self.feed_position, self.popularity_score, self.is_paywalled,
+            self.country_flag, self.sport, self.canonical_url
+        ]
+
+    @classmethod
+    def from_row(cls, row: list) -> 'Article':
+        title, url, source, published, position, score, paywalled, flag, sport, canonical = row
+        return cls(
+            title=title,
+            url=url,
+            source=source,
+            published=datetime.fromisoformat(published),
+            feed_position=position,
+            popularity_score=score,
+            is_paywalled=paywalled,
+            country_flag=flag,
+            sport=sport,
+            canonical_url=canonical
+        )
+
+
+class ArticleBatch:
+    """
+    A list of articles serialized together.
+
+    Serializing a batch evaluates "now" once for every article's age,
+    instead of once per article, and reuses formatted timestamps for
+    articles that share a publication time.
+    """
+    __slots__ = ('articles',)
+
+    def __init__(self, articles: Iterable[Article] = ()):
+        self.articles = list(articles)
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def __iter__(self) -> Iterator[Article]:
+        return iter(self.articles)
 
-        if delta.days > 0:
-            return f"{delta.days}d ago"
-        hours = delta.seconds // 3600
-        if hours > 0:
-            return f"{hours}h ago"
-        minutes = delta.seconds // 60
-        return f"{minutes}m ago"
+    def to_rows(self) -> List[list]:
+        return [article.to_row() for article in self.articles]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list]) -> 'ArticleBatch':
+        return cls(Article.from_row(row) for row in rows)
+
+    def to_dicts(self, now: Optional[datetime] = None) -> List[dict]:
+        """Serialize all articles, computing ages relative to one `now`."""
+        now = now or datetime.now(timezone.utc)
+        # (published, UTC offset) -> (isoformat, age). Aware datetimes for the
+        # same instant hash equal whatever their offset, but serialize differently
+        formatted = {}
+        dicts = []
+        for article in self.articles:
+            published = article.published
+            key = (published, published.utcoffset())
+            stamp = formatted.get(key)
+            if stamp is None:
+                stamp = formatted[key] = (published.isoformat(), format_age(published, now))
+            dicts.append({
+                'title': article.title,
+                'url': article.url,
+                'source': article.source,
+                'published': stamp[0],
+                'age': stamp[1],
+                'popularity_score': round(article.popularity_score, 3),
+                'feed_position': article.feed_position,
+                'is_paywalled': article.is_paywalled,
+                'country_flag': article.country_flag
+            })
+        return dicts
+
+
+# Namespaces understood by the fast path
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+RSS1_NS = '{http://purl.org/rss/1.0/}'
+RDF_NS = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_CHARSET_RE = re.compile(r'charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class UnsupportedFeed(Exception):
+    """Raised when the fast path can't handle a feed and feedparser must."""
 
 
 class FeedParser:
-    def parse(self, content: str, source_name: str) -> List[Article]:
-        """Parse RSS content and return list of articles with position tracking."""
+    def __init__(self, fast_path: bool = True, max_entries: int = 0):
+        """
+        Initialize FeedParser.
+
+        Args:
+            fast_path: Try the streaming RSS 2.0/RSS 1.0/Atom parser before
+                       falling back to feedparser.
+            max_entries: Stop after this many entries per feed (0 = no limit).
+        """
+        self.fast_path = fast_path
+        self.max_entries = max_entries
+
+    def parse(
+        self,
+        content: bytes,
+        source_name: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> List[Article]:
+        """
+        Parse RSS content and return list of articles with position tracking.
+
+        Args:
+            content: Raw feed bytes, decoded by the XML parser or feedparser
+            source_name: Display name of the feed
+            headers: Lower-cased response headers (Content-Type charset etc.)
+        """
         if not content:
             return []
 
+        if self.fast_path:
+            try:
+                return self._parse_fast(content, source_name, headers or {})
+            except (UnsupportedFeed, ElementTree.ParseError) as e:
+                logger.debug(f"Fast path declined {source_name}, using feedparser: {e}")
+            except Exception as e:
+                # Odd markup or encodings the fast path didn't anticipate:
+                # feedparser gets the final say, as it did before the fast path
+                logger.debug(f"Fast path failed on {source_name}, using feedparser: {e!r}")
+
         try:
-            feed = feedparser.parse(content)
+            feed = feedparser.parse(content, response_headers=headers)
             articles = []
-            total_entries = len(feed.entries)
+            entries = feed.entries
+            if self.max_entries:
+                entries = entries[:self.max_entries]
+            total_entries = len(entries)
 
-            for position, entry in enumerate(feed.entries):
+            for position, entry in enumerate(entries):
                 article = self._parse_entry(entry, source_name, position)
                 if article:
                     article.calculate_popularity(total_entries)
@@ -85,6 +225,115 @@ class FeedParser:
             logger.error(f"Failed to parse feed from {source_name}: {e}")
             return []
 
+    def _parse_fast(self, content: bytes, source_name: str, headers: Dict[str, str]) -> List[Article]:
+        """
+        Stream the common RSS 2.0, RSS 1.0 and Atom shapes with iterparse.
+
+        Only title, link and dates are pulled from each item, and parsing
+        stops once max_entries items have been read, so large feeds are never
+        fully parsed. Raises UnsupportedFeed (or ParseError) for anything
+        else, e.g. an unknown root element, a non-UTF-8 charset declared only
+        in the HTTP headers, HTML entities or relative links.
+        """
+        match = _CHARSET_RE.search(headers.get('content-type', ''))
+        if match and match.group(1).lower() not in ('utf-8', 'utf8', 'us-ascii'):
+            raise UnsupportedFeed(f"charset {match.group(1)}")
+
+        articles = []
+        position = 0
+        item_tags = None
+        root = None
+
+        for event, elem in ElementTree.iterparse(io.BytesIO(content), events=('start', 'end')):
+            if root is None:
+                root = elem
+                if elem.tag == 'rss':
+                    item_tags = ('item',)
+                elif elem.tag == ATOM_NS + 'feed':
+                    item_tags = (ATOM_NS + 'entry',)
+                elif elem.tag == RDF_NS + 'RDF':
+                    item_tags = (RSS1_NS + 'item', 'item')
+                else:
+                    raise UnsupportedFeed(f"root element {elem.tag}")
+                continue
+
+            if event != 'end' or elem.tag not in item_tags:
+                continue
+
+            if elem.tag == ATOM_NS + 'entry':
+                entry = self._atom_entry(elem)
+            else:
+                entry = self._rss_entry(elem, RSS1_NS if elem.tag.startswith(RSS1_NS) else '')
+
+            article = self._parse_entry(entry, source_name, position)
+            if article:
+                article.calculate_popularity()
+                articles.append(article)
+            position += 1
+
+            # Drop parsed items so memory stays flat on large feeds
+            elem.clear()
+
+            if self.max_entries and position >= self.max_entries:
+                break
+
+        if position == 0:
+            raise UnsupportedFeed("no items found")
+        return articles
+
+    @staticmethod
+    def _text(elem) -> str:
+        if elem is None:
+            return ''
+        text = ''.join(elem.itertext()).strip()
+        if '<' in text:
+            text = _TAG_RE.sub('', text)
+        return html.unescape(text).strip() if '&' in text else text
+
+    @staticmethod
+    def _check_link(link: str) -> str:
+        if link and not link.startswith(('http://', 'https://')):
+            raise UnsupportedFeed(f"relative link {link}")
+        return link
+
+    def _rss_entry(self, item, ns: str) -> dict:
+        """Title/link/dates of an RSS 2.0 or RSS 1.0 item."""
+        entry = {'title': self._text(item.find(ns + 'title'))}
+
+        link = (item.findtext(ns + 'link') or '').strip()
+        if not link:
+            guid = item.find('guid')
+            if guid is not None and guid.get('isPermaLink', 'true') != 'false':
+                link = (guid.text or '').strip()
+        entry['link'] = self._check_link(link)
+
+        published = item.findtext('pubDate')
+        updated = item.findtext(DC_NS + 'date')
+        if published:
+            entry['published'] = published.strip()
+        if updated:
+            entry['updated'] = updated.strip()
+        return entry
+
+    def _atom_entry(self, item) -> dict:
+        """Title/link/dates of an Atom entry."""
+        entry = {'title': self._text(item.find(ATOM_NS + 'title'))}
+
+        link = ''
+        for link_elem in item.findall(ATOM_NS + 'link'):
+            if link_elem.get('rel', 'alternate') == 'alternate':
+                link = link_elem.get('href', '')
+                break
+            if not link:
+                link = link_elem.get('href', '')
+        entry['link'] = self._check_link(link.strip())
+
+        for field in ('published', 'updated'):
+            value = item.findtext(ATOM_NS + field)
+            if value:
+                entry[field] = value.strip()
+        return entry
+
     def _parse_entry(
         self,
         entry: Any,
@@ -109,17 +358,23 @@ class FeedParser:
         )
 
     def _parse_date(self, entry: Any) -> datetime:
-        """Extract and parse publication date from entry."""
+        """Extract and parse publication date from entry.
+
+        Uses feedparser's pre-parsed *_parsed struct when present, and the
+        memoized RFC 822 / ISO 8601 parsers otherwise.
+        """
         date_fields = ['published', 'updated', 'created']
 
         for field in date_fields:
-            if field in entry:
-                try:
-                    parsed = date_parser.parse(entry[field])
-                    if parsed.tzinfo is None:
-                        parsed = parsed.replace(tzinfo=timezone.utc)
+            struct = entry.get(field + '_parsed')
+            if struct:
+                parsed = from_struct(struct)
+                if parsed:
+                    return parsed
+            value = entry.get(field)
+            if value:
+                parsed = parse_date(value)
+                if parsed:
                     return parsed
-                except (ValueError, TypeError):
-                    pass
 
         return datetime.now(timezone.utc)
@@ -1,12 +1,21 @@
 """Detects paywalled content using curated list and meta tag heuristics."""
 import requests
 import re
-from typing import Set, Optional
-from urllib.parse import urlparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Set, Optional
+from requests.adapters import HTTPAdapter
+from .domains import DomainIndex, host_of, registrable_domain
+from .fetcher import HostThrottle
+from .paywall_cache import PaywallVerdictCache
+from .singleflight import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Page probes in flight in this process, keyed by URL
+_PROBES = SingleFlight()
+
 
 class PaywallDetector:
     # Default known paywalled domains
@@ -42,7 +51,12 @@ class PaywallDetector:
         self,
         paywalled_domains: Optional[Set[str]] = None,
         check_meta: bool = False,
-        timeout: int = 5
+        timeout: int = 5,
+        max_bytes: int = 50 * 1024,
+        workers: int = 8,
+        per_host: int = 2,
+        verdict_cache: Optional[PaywallVerdictCache] = None,
+        infer_domains: bool = False
     ):
         """
         Initialize PaywallDetector.
@@ -51,11 +65,30 @@ class PaywallDetector:
             paywalled_domains: Set of known paywalled domains. If None, uses defaults.
             check_meta: Whether to fetch and check HTML meta tags for unknown sources.
             timeout: Timeout for meta tag checks.
+            max_bytes: Bytes of each page read before giving up on finding a marker.
+            workers: Pages probed concurrently by check_all().
+            per_host: Concurrent probes to any single host.
+            verdict_cache: Persistent probe verdicts; only used for successful probes.
+            infer_domains: Let verdict_cache promote consistent domains to a
+                           domain-wide verdict and skip probing their URLs.
         """
         self.paywalled_domains = paywalled_domains or self.DEFAULT_PAYWALLED_DOMAINS.copy()
+        self._domain_index = DomainIndex.from_domains(self.paywalled_domains, paywalled=True)
         self.check_meta = check_meta
         self.timeout = timeout
-        self._meta_cache = {}  # Cache meta check results
+        self.max_bytes = max_bytes
+        self.workers = max(1, workers)
+        self.verdict_cache = verdict_cache
+        self.infer_domains = infer_domains and verdict_cache is not None
+        self._meta_cache = {}  # This run's results, including failed probes
+        self._lock = threading.Lock()
+        self._throttle = HostThrottle(per_host=per_host, delay=0.0)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; NewsAggregator/1.0)'
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
         # Compile regex patterns
         self._paywall_pattern = re.compile(
@@ -65,50 +98,114 @@ class PaywallDetector:
 
     def _extract_domain(self, url: str) -> str:
         """Extract the base domain from a URL."""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            # Remove 'www.' prefix
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            return domain
-        except Exception:
-            return ''
+        return host_of(url)
 
     def _is_known_paywalled(self, url: str) -> bool:
-        """Check if URL is from a known paywalled domain."""
-        domain = self._extract_domain(url)
-
-        # Check exact match and subdomains
-        for paywalled in self.paywalled_domains:
-            if domain == paywalled or domain.endswith('.' + paywalled):
-                return True
-        return False
+        """Check if URL is from a known paywalled domain (or a subdomain of one)."""
+        return self._domain_index.get(self._extract_domain(url), 'paywalled', False)
 
-    def _check_meta_tags(self, url: str) -> bool:
-        """Fetch page and check for paywall meta tags."""
-        if url in self._meta_cache:
-            return self._meta_cache[url]
+    def _probe(self, url: str) -> Optional[bool]:
+        """
+        Stream the start of a page and look for paywall markers.
 
+        Reading stops at the first marker or after max_bytes. Returns None if
+        the page couldn't be fetched. The host slot is held until the
+        response is closed, so per_host also bounds body downloads.
+        """
         try:
-            response = requests.get(
-                url,
-                timeout=self.timeout,
-                headers={'User-Agent': 'Mozilla/5.0 (compatible; NewsAggregator/1.0)'}
-            )
+            with self._throttle.slot(url):
+                with self.session.get(
+                    url,
+                    timeout=self.timeout,
+                    stream=True,
+                    headers={'Range': f'bytes=0-{self.max_bytes - 1}'}
+                ) as response:
+                    response.raise_for_status()
+                    encoding = response.encoding or 'utf-8'
+                    body = b''
+                    for chunk in response.iter_content(chunk_size=16384):
+                        body += chunk
+                        # Markers are ASCII, so a partial trailing character is harmless
+                        if self._paywall_pattern.search(body[:self.max_bytes].decode(encoding, errors='replace')):
+                            return True
+                        if len(body) >= self.max_bytes:
+                            break
+                    return False
+        except (requests.RequestException, LookupError) as e:
+            logger.debug(f"Meta tag check failed for {url}: {e}")
+            return None
 
-            # Only check first 50KB to save bandwidth
-            content = response.text[:50000]
+    def _check_meta_tags(self, url: str, key: Optional[str] = None) -> bool:
+        """
+        Check a page for paywall meta tags.
 
-            has_paywall = bool(self._paywall_pattern.search(content))
-            self._meta_cache[url] = has_paywall
+        Uses, in order: this run's results, the URL's cached verdict, its
+        domain's promoted verdict, and finally a probe. Results are stored
+        under `key` (e.g. the canonical URL) when given, but the probe
+        always requests `url` itself.
+        """
+        key = key or url
+        with self._lock:
+            if key in self._meta_cache:
+                return self._meta_cache[key]
+        cached = self.verdict_cache.get(key) if self.verdict_cache else None
+        domain = registrable_domain(self._extract_domain(url)) if self.infer_domains else None
+        if cached is None and domain:
+            cached = self.verdict_cache.domain_verdict(domain)
+        if cached is not None:
+            has_paywall = cached
+        else:
+            result = _PROBES.do(key, lambda: self._probe(url))
+            has_paywall = bool(result)
+            if result is not None and self.verdict_cache:
+                self.verdict_cache.put(key, has_paywall, domain)
+        with self._lock:
+            self._meta_cache[key] = has_paywall
+        return has_paywall
+
+    def check_all(self, urls: Iterable[str], keys: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """
+        Paywall verdicts for many URLs, probing unknown pages concurrently.
 
-            return has_paywall
+        Known-domain matches and cached verdicts are answered without a
+        request; the remaining pages are probed on a bounded thread pool.
 
-        except Exception as e:
-            logger.debug(f"Meta tag check failed for {url}: {e}")
-            self._meta_cache[url] = False
-            return False
+        Args:
+            urls: Article URLs, as fetched.
+            keys: Cache key of each URL (e.g. its canonical form), used to
+                  share verdicts between URLs of the same page. Defaults to
+                  the URLs themselves.
+
+        Returns:
+            Verdict for each key.
+        """
+        pages = {}  # key -> first URL seen for it
+        for url, key in zip(urls, keys) if keys is not None else ((url, url) for url in urls):
+            pages.setdefault(key, url)
+
+        verdicts = {}
+        to_probe = []
+        for key, url in pages.items():
+            if self._is_known_paywalled(url):
+                verdicts[key] = True
+            elif not self.check_meta:
+                verdicts[key] = False
+            else:
+                to_probe.append(key)
+
+        if len(to_probe) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(to_probe))) as executor:
+                verdicts.update(zip(to_probe, executor.map(
+                    lambda key: self._check_meta_tags(pages[key], key), to_probe
+                )))
+        else:
+            verdicts.update((key, self._check_meta_tags(pages[key], key)) for key in to_probe)
+        return verdicts
+
+    def save(self) -> None:
+        """Persist probe verdicts, if a verdict cache is configured."""
+        if self.verdict_cache:
+            self.verdict_cache.save()
 
     def is_paywalled(self, url: str) -> bool:
         """
@@ -136,7 +233,9 @@ class PaywallDetector:
     def add_paywalled_domain(self, domain: str) -> None:
         """Add a domain to the paywalled list."""
         self.paywalled_domains.add(domain.lower())
+        self._domain_index.add(domain, paywalled=True)
 
     def remove_paywalled_domain(self, domain: str) -> None:
         """Remove a domain from the paywalled list."""
         self.paywalled_domains.discard(domain.lower())
+        self._domain_index.remove(domain)
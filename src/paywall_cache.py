@@ -0,0 +1,156 @@
+"""Persistent paywall probe verdicts, per URL and inferred per domain."""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DomainVerdict:
+    """Recent probe verdicts for one domain and the verdict inferred from them."""
+    recent: List[bool] = field(default_factory=list)  # Sliding window, oldest first
+    verdict: Optional[bool] = None  # Promoted domain-level verdict, if confident
+    promoted_at: float = 0.0
+    last_probe: float = 0.0
+
+
+class PaywallVerdictCache:
+    """
+    Paywall verdicts from meta-tag probes, kept across runs.
+
+    Per URL: verdicts older than ttl are treated as missing, and at most
+    max_entries are kept, least recently used dropped first.
+
+    Per domain: the last `window` probe verdicts are kept. Once at least
+    min_samples of them agree at `confidence` or better, the domain is
+    promoted and its URLs take the domain verdict instead of being probed,
+    apart from one sample per reprobe_interval that keeps the window
+    fresh. If the samples stop agreeing the promotion is dropped.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 7 * 86400,
+        max_entries: int = 20000,
+        window: int = 20,
+        min_samples: int = 5,
+        confidence: float = 0.9,
+        reprobe_interval: float = 6 * 3600
+    ):
+        """
+        Initialize PaywallVerdictCache.
+
+        Args:
+            path: JSON file to load from and save to.
+            ttl: Seconds a URL verdict stays valid.
+            max_entries: Maximum number of URL verdicts kept.
+            window: Probe verdicts kept per domain.
+            min_samples: Verdicts needed before a domain can be promoted.
+            confidence: Share of agreeing verdicts needed to promote (0-1).
+            reprobe_interval: Seconds between sample probes of a promoted domain.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.window = window
+        self.min_samples = min_samples
+        self.confidence = confidence
+        self.reprobe_interval = reprobe_interval
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, list]' = OrderedDict()  # url -> [verdict, checked_at]
+        self._domains: Dict[str, DomainVerdict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._entries = OrderedDict(data['urls'])
+            self._domains = {domain: DomainVerdict(**stats) for domain, stats in data['domains'].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable paywall verdict cache {self.path}: {e}")
+
+    def get(self, url: str) -> Optional[bool]:
+        """Cached verdict for a URL, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            if time.time() - entry[1] > self.ttl:
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            return entry[0]
+
+    def put(self, url: str, verdict: bool, domain: Optional[str] = None) -> None:
+        """Store a probe verdict, counting it towards the domain's verdict if given."""
+        now = time.time()
+        with self._lock:
+            self._entries[url] = [verdict, now]
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if domain:
+                self._record_domain(domain, verdict, now)
+
+    def _record_domain(self, domain: str, verdict: bool, now: float) -> None:
+        stats = self._domains.setdefault(domain, DomainVerdict())
+        stats.recent.append(verdict)
+        del stats.recent[:-self.window]
+        stats.last_probe = now
+
+        paywalled = sum(stats.recent)
+        majority = paywalled * 2 >= len(stats.recent)
+        agreeing = paywalled if majority else len(stats.recent) - paywalled
+        if len(stats.recent) >= self.min_samples and agreeing / len(stats.recent) >= self.confidence:
+            if stats.verdict != majority:
+                logger.info(f"Paywall verdict for {domain} promoted: {'paywalled' if majority else 'free'}")
+                stats.verdict = majority
+                stats.promoted_at = now
+        elif stats.verdict is not None:
+            logger.info(f"Paywall verdict for {domain} demoted, probing its URLs again")
+            stats.verdict = None
+
+    def domain_verdict(self, domain: str) -> Optional[bool]:
+        """
+        The promoted verdict for a domain, or None if its URLs should be
+        probed. A promoted domain returns None once per reprobe_interval,
+        so that URL gets probed as a sample.
+        """
+        with self._lock:
+            stats = self._domains.get(domain)
+            if stats is None or stats.verdict is None:
+                return None
+            now = time.time()
+            if now - stats.last_probe >= self.reprobe_interval:
+                stats.last_probe = now  # Claim the sample so concurrent callers don't probe too
+                return None
+            return stats.verdict
+
+    def save(self) -> None:
+        """Drop expired URL verdicts and write the cache to disk atomically."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            data = {
+                'urls': [(url, entry) for url, entry in self._entries.items() if entry[1] >= cutoff],
+                'domains': {domain: asdict(stats) for domain, stats in self._domains.items()},
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.tmp-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save paywall verdict cache: {e}")
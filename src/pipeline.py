@@ -0,0 +1,227 @@
+"""Streaming stage pipeline for per-region aggregation.
+
+A region is processed as a chain of generator stages:
+
+    fetch -> parse -> annotate -> dedup -> rank
+
+Each stage pulls items from the one before it, so a feed is parsed and
+deduplicated as soon as it has arrived (in configured feed order) while
+later feeds are still downloading. The last stage can stop pulling once
+the region's quotas are provably filled, which skips parsing, paywall
+probing and dedup for the remaining feeds.
+"""
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .deduplicator import DedupSession
+from .fetcher import FeedResponse, PendingFetches
+from .parser import Article
+from .ranking import Ranker
+
+logger = logging.getLogger(__name__)
+
+# hook(pipeline_name, stage_name, seconds, items_out)
+TimingHook = Callable[[str, str, float, int], None]
+
+
+@dataclass
+class FeedBatch:
+    """One feed's payload and articles as they move through the stages."""
+    feed: dict                              # Feed entry from feeds.yaml
+    response: Optional[FeedResponse] = None
+    articles: List[Article] = field(default_factory=list)
+    parse_key: Optional[str] = None         # Parse cache key, if caching
+
+
+class Stage:
+    """A pipeline step: consumes the upstream iterator, yields items downstream."""
+    name = 'stage'
+
+    def run(self, items: Iterator) -> Iterator:
+        raise NotImplementedError
+
+
+class MapStage(Stage):
+    """Applies a function to every item."""
+
+    def __init__(self, name: str, fn: Callable):
+        self.name = name
+        self.fn = fn
+
+    def run(self, items: Iterator) -> Iterator:
+        for item in items:
+            yield self.fn(item)
+
+
+class ParallelMapStage(Stage):
+    """
+    Like MapStage, but the work runs elsewhere (e.g. a process pool).
+
+    submit(item) starts an item's work and returns a handle such as a
+    Future, or None if there is nothing to do; finish(item, handle) waits
+    for it and returns the finished item. Up to `lookahead` items are in
+    flight at once, so later feeds are worked on while earlier ones are
+    consumed. Items are yielded in input order.
+    """
+
+    def __init__(self, name: str, submit: Callable, finish: Callable, lookahead: int):
+        self.name = name
+        self.submit = submit
+        self.finish = finish
+        self.lookahead = max(1, lookahead)
+
+    def run(self, items: Iterator) -> Iterator:
+        in_flight = deque()
+        try:
+            for item in items:
+                in_flight.append((item, self.submit(item)))
+                if len(in_flight) >= self.lookahead:
+                    yield self.finish(*in_flight.popleft())
+            while in_flight:
+                yield self.finish(*in_flight.popleft())
+        finally:
+            # Closed early: drop work nobody will consume
+            for _, handle in in_flight:
+                if handle is not None:
+                    handle.cancel()
+
+
+class FetchStage(Stage):
+    """Source stage: yields each feed of a region, in order, as soon as it has downloaded."""
+    name = 'fetch'
+
+    def __init__(self, feeds: List[dict], pending: PendingFetches):
+        self.feeds = feeds
+        self.pending = pending
+
+    def run(self, items: Iterator) -> Iterator[FeedBatch]:
+        for feed in self.feeds:
+            response = self.pending.result(feed['url'])
+            if response is None:
+                logger.warning(f"No content from {feed['name']}")
+                continue
+            yield FeedBatch(feed=feed, response=response)
+
+
+class DedupStage(Stage):
+    """Deduplicates each batch against every article kept so far in the region."""
+    name = 'dedup'
+
+    def __init__(self, session: DedupSession):
+        self.session = session
+
+    def run(self, items: Iterator[FeedBatch]) -> Iterator[FeedBatch]:
+        kept = 0
+        try:
+            for batch in items:
+                batch.articles = self.session.keep(batch.articles)
+                kept += len(batch.articles)
+                yield batch
+        finally:
+            logger.info(f"Deduplication: {self.session.total} -> {kept} articles")
+
+
+class RankStage(Stage):
+    """
+    Sink stage: collects deduplicated articles and yields the region's final
+    selection from the Ranker.
+
+    If the ranker's scores have an upper bound (e.g. feed position alone),
+    the stage checks after each feed whether `limit` articles at that bound
+    are already selected. Later articles could then only tie, and ties keep
+    feed order, so the selection is final. The stage stops pulling, and the
+    remaining feeds are never parsed, annotated or deduplicated.
+    """
+    name = 'rank'
+
+    def __init__(self, ranker: Ranker):
+        self.ranker = ranker
+
+    def run(self, items: Iterator[FeedBatch]) -> Iterator[Article]:
+        ranker = self.ranker
+        bound = ranker.upper_bound
+        candidates: List[Article] = []
+        at_bound: List[Article] = []
+        for batch in items:
+            candidates.extend(batch.articles)
+            if bound is None:
+                continue
+            at_bound.extend(a for a in batch.articles if ranker.score(a) >= bound)
+            if len(at_bound) >= ranker.limit and len(ranker.select(at_bound)) >= ranker.limit:
+                logger.info(f"Quotas filled after {batch.feed['name']}, skipping remaining feeds")
+                break
+        yield from ranker.select(candidates)
+
+
+class _Timed:
+    """Iterator wrapper that accumulates time spent producing items (inclusive of upstream)."""
+
+    def __init__(self, iterator: Iterator):
+        self.iterator = iterator
+        self.seconds = 0.0
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            item = next(self.iterator)
+        finally:
+            self.seconds += time.perf_counter() - start
+        self.count += 1
+        return item
+
+    def close(self) -> None:
+        close = getattr(self.iterator, 'close', None)
+        if close:
+            close()
+
+
+class Pipeline:
+    """
+    Chains stages lazily and reports how long each one took.
+
+    Stage time is exclusive: the time spent pulling an item from a stage
+    minus the time its upstream spent producing the items it consumed.
+    """
+
+    def __init__(self, name: str, stages: List[Stage], hooks: Iterable[TimingHook] = ()):
+        """
+        Args:
+            name: Label passed to timing hooks (e.g. the region ID).
+            stages: Stages in order; the first one is the source.
+            hooks: Called once per stage when the pipeline finishes.
+        """
+        self.name = name
+        self.stages = stages
+        self.hooks = list(hooks)
+
+    def run(self) -> list:
+        """Run all stages and return the last stage's items."""
+        timed: List[_Timed] = []
+        iterator: Iterator = iter(())
+        for stage in self.stages:
+            iterator = _Timed(stage.run(iterator))
+            timed.append(iterator)
+        try:
+            return list(iterator)
+        finally:
+            # Close from the sink up so stages that stopped early release their sources
+            for stage_iterator in reversed(timed):
+                stage_iterator.close()
+            upstream = 0.0
+            for stage, stage_iterator in zip(self.stages, timed):
+                exclusive = max(0.0, stage_iterator.seconds - upstream)
+                upstream = stage_iterator.seconds
+                for hook in self.hooks:
+                    hook(self.name, stage.name, exclusive, stage_iterator.count)
+
+
+def log_timing(pipeline: str, stage: str, seconds: float, count: int) -> None:
+    """Default timing hook."""
+    logger.debug(f"[{pipeline}] {stage}: {seconds * 1000:.1f}ms, {count} items")
@@ -4,7 +4,10 @@ import json
 import logging
 import random
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .article_store import ArticleStore
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +32,26 @@ class QuizGenerator:
     def __init__(self, api_key: str):
         self.client = anthropic.Anthropic(api_key=api_key)
 
-    def generate_quiz(self, articles: dict, config: dict) -> Optional[dict]:
-        """Generate quiz questions from headlines."""
+    def generate_quiz(
+        self, articles: dict, config: dict, store: Optional['ArticleStore'] = None
+    ) -> Optional[dict]:
+        """Generate quiz questions from headlines.
+
+        With an article store and quiz.lookback_days set, headlines come from
+        every page built in that many past days, most often shown first,
+        instead of only the current run's pages.
+        """
         quiz_config = config.get('quiz', {})
         source_regions = quiz_config.get('source_regions', ['us', 'global'])
         questions_count = quiz_config.get('questions_count', 10)
+        lookback_days = quiz_config.get('lookback_days', 0)
+        if store and lookback_days:
+            since = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).timestamp()
+            articles = {
+                region: {'articles': store.region_history(region, since)}
+                for region in source_regions
+                if store.latest_run(region) is not None
+            }
 
         # Collect headlines from specified regions
         headlines = []
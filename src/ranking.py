@@ -0,0 +1,162 @@
+"""Single-pass top-k article ranking with source, sport and total quotas."""
+import heapq
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .parser import Article
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreTerm:
+    """One weighted component of an article's ranking score."""
+
+    # Largest value the term can take, or None if unbounded
+    upper_bound: Optional[float] = 1.0
+
+    def __init__(self, weight: float = 1.0, **options):
+        self.weight = weight
+
+    def value(self, article: Article, now: datetime) -> float:
+        raise NotImplementedError
+
+
+class PositionTerm(ScoreTerm):
+    """Feed position as 1 / (position + 1): the feed's top story scores 1.0."""
+
+    def value(self, article: Article, now: datetime) -> float:
+        return article.popularity_score
+
+
+class RecencyTerm(ScoreTerm):
+    """Exponential decay with age: 1.0 when just published, 0.5 after half_life seconds."""
+
+    def __init__(self, weight: float = 1.0, half_life: float = 6 * 3600, **options):
+        super().__init__(weight)
+        self.half_life = half_life
+
+    def value(self, article: Article, now: datetime) -> float:
+        age = max(0.0, (now - article.published).total_seconds())
+        return 0.5 ** (age / self.half_life)
+
+
+class PublishedTerm(ScoreTerm):
+    """Publication time as a Unix timestamp, for plain newest-first ordering."""
+    upper_bound = None
+
+    def value(self, article: Article, now: datetime) -> float:
+        return article.published.timestamp()
+
+
+SCORE_TERMS: Dict[str, type] = {
+    'position': PositionTerm,
+    'recency': RecencyTerm,
+    'published': PublishedTerm,
+}
+
+
+class Ranker:
+    """
+    Picks a region's headlines in one pass.
+
+    Articles are scored once and heapified; the best are popped in score
+    order (ties keep input order) and pass two quotas in turn: at most
+    max_per_source per source, then at most max_per_sport per sport among
+    those. Popping stops at `limit` accepted articles, so the cost is
+    O(n + m log n) for m popped instead of a full sort plus one pass per
+    quota.
+
+    Scores are weighted sums of terms declared in feeds.yaml
+    (settings.ranking.terms); without terms, `sort_by` picks position
+    ('popularity') or publication time ('published').
+    """
+
+    def __init__(
+        self,
+        terms: List[ScoreTerm],
+        limit: int,
+        max_per_source: int = 0,
+        max_per_sport: int = 0,
+        now: Optional[datetime] = None
+    ):
+        """
+        Initialize Ranker.
+
+        Args:
+            terms: Weighted score terms, summed.
+            limit: Maximum number of articles selected.
+            max_per_source: Per-source quota (0 = unlimited).
+            max_per_sport: Per-sport quota (0 = unlimited).
+            now: Reference time for recency terms.
+        """
+        self.terms = terms
+        self.limit = limit
+        self.max_per_source = max_per_source
+        self.max_per_sport = max_per_sport
+        self.now = now
+
+    @classmethod
+    def from_config(cls, settings: dict, region_data: dict, now: datetime) -> 'Ranker':
+        """Build the ranker for a region from feeds.yaml settings."""
+        term_configs = settings.get('ranking', {}).get('terms') or [
+            {'type': 'position' if settings.get('sort_by', 'published') == 'popularity' else 'published'}
+        ]
+        terms = []
+        for term_config in term_configs:
+            options = dict(term_config)
+            term_type = options.pop('type')
+            if term_type not in SCORE_TERMS:
+                raise ValueError(f"Unknown ranking term '{term_type}' (expected one of {sorted(SCORE_TERMS)})")
+            terms.append(SCORE_TERMS[term_type](**options))
+
+        return cls(
+            terms=terms,
+            limit=region_data.get('headlines_override', settings['headlines_per_region']),
+            max_per_source=settings.get('max_per_source', 0),
+            max_per_sport=region_data.get('max_per_sport', 0),
+            now=now
+        )
+
+    def score(self, article: Article) -> float:
+        return sum(term.weight * term.value(article, self.now) for term in self.terms)
+
+    @property
+    def upper_bound(self) -> Optional[float]:
+        """Highest score any article can reach, or None if unbounded."""
+        bound = 0.0
+        for term in self.terms:
+            if term.weight < 0:
+                continue  # Contributes at most 0
+            if term.upper_bound is None:
+                return None
+            bound += term.weight * term.upper_bound
+        return bound
+
+    def select(self, articles: List[Article]) -> List[Article]:
+        """The top `limit` articles that fit the quotas, best first."""
+        heap = [(-self.score(article), index) for index, article in enumerate(articles)]
+        heapq.heapify(heap)
+
+        source_counts: Dict[str, int] = {}
+        sport_counts: Dict[str, int] = {}
+        selected = []
+        while heap and len(selected) < self.limit:
+            _, index = heapq.heappop(heap)
+            article = articles[index]
+
+            if self.max_per_source > 0:
+                count = source_counts.get(article.source, 0)
+                if count >= self.max_per_source:
+                    continue
+                source_counts[article.source] = count + 1
+
+            if self.max_per_sport > 0:
+                sport = article.sport or 'general'
+                count = sport_counts.get(sport, 0)
+                if count >= self.max_per_sport:
+                    continue
+                sport_counts[sport] = count + 1
+
+            selected.append(article)
+        return selected
@@ -0,0 +1,78 @@
+"""Collapses duplicate concurrent work (fetches, parses, probes) across a process."""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'expires')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.expires = float('inf')  # Until finished
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers arriving while it runs
+    wait for it and get its result (or its exception) instead of repeating
+    the work.
+
+    With a window, a successful (non-None) result is also handed to callers
+    arriving up to `window` seconds after it finished, so back-to-back runs
+    in one process share work too. Failures are never kept.
+
+    Instances are meant to be module-level, shared by every caller in the
+    process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], window: float = 0.0) -> Any:
+        """Return fn()'s result, sharing it with other callers using the same key."""
+        with self._lock:
+            now = time.monotonic()
+            call = self._calls.get(key)
+            leader = call is None or call.expires < now
+            if leader:
+                self._sweep(now)
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if window > 0 and call.error is None and call.result is not None:
+                    call.expires = time.monotonic() + window
+                else:
+                    call.expires = 0.0
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+            call.done.set()
+
+    def _sweep(self, now: float) -> None:
+        """Drop shared results whose window has passed (lock held)."""
+        expired = [key for key, call in self._calls.items() if call.expires < now]
+        for key in expired:
+            del self._calls[key]
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a shared result so the next call for the key runs again."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.done.is_set():
+                del self._calls[key]
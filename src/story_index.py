@@ -0,0 +1,182 @@
+"""Persistent cross-run index of story clusters for incremental deduplication."""
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+from .deduplicator import BlockIndex, ExactIndex
+
+logger = logging.getLogger(__name__)
+
+
+class StoryIndex:
+    """
+    Remembers which story cluster every seen URL and normalized title
+    belongs to, across hourly runs.
+
+    Most candidates in a run were already clustered an hour earlier, so
+    they resolve with a dict lookup on their URL or sorted-token title.
+    Only genuinely new titles are fuzzy-matched, against each story's
+    stored representative and, within a session (see StorySession), the
+    first title of each story seen in it. Per-run cost therefore follows
+    the hourly delta rather than the size of the candidate pool.
+
+    On an empty index a session clusters exactly like keep-first dedup.
+    Once stories carry over, results can differ from a fresh keep-first
+    pass: a title remembered from an earlier run keeps its story, and a
+    new title may join a story through its stored representative.
+
+    Entries not seen for max_age seconds are evicted on save.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        similarity_threshold: float = 0.85,
+        max_age: float = 3 * 86400,
+        index: str = 'exact'
+    ):
+        """
+        Initialize StoryIndex.
+
+        Args:
+            path: JSON file to load from and save to.
+            similarity_threshold: Minimum similarity ratio (0-1) for a new
+                                  title to join an existing story.
+            max_age: Seconds after which unseen stories, URLs and titles are dropped.
+            index: 'exact' scores new titles against every representative;
+                   'token' only against those sharing a block key.
+        """
+        self.path = Path(path)
+        self.threshold = similarity_threshold * 100  # rapidfuzz uses 0-100 scale
+        self.max_age = max_age
+        self.index = index
+        self.next_id = 0
+        self.stories: Dict[int, list] = {}  # id -> [sorted_title, first_seen, last_seen]
+        self.urls: Dict[str, list] = {}     # url -> [id, last_seen]
+        self.titles: Dict[str, list] = {}   # sorted_title -> [id, last_seen]
+        self._load()
+        self._rebuild_reps()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.next_id = data['next_id']
+            self.stories = {int(story_id): entry for story_id, entry in data['stories'].items()}
+            self.urls = data['urls']
+            self.titles = data['titles']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable story index {self.path}: {e}")
+
+    def matcher(self) -> Union[BlockIndex, ExactIndex]:
+        """An empty representative matcher in this index's mode."""
+        return BlockIndex(self.threshold) if self.index == 'token' else ExactIndex(self.threshold)
+
+    def _rebuild_reps(self) -> None:
+        self.reps = self.matcher()
+        for story_id in sorted(self.stories):
+            self.reps.add(self.stories[story_id][0], story_id)
+
+    def session(self) -> 'StorySession':
+        """Start assigning one session's articles (e.g. one region's) to stories."""
+        return StorySession(self)
+
+    def assign(
+        self,
+        url: str,
+        sorted_title: str,
+        now: Optional[float] = None,
+        run_reps: Optional[Union[BlockIndex, ExactIndex]] = None
+    ) -> int:
+        """
+        Return the story ID for an article, creating a story if it is new.
+
+        Args:
+            url: The article's canonical URL.
+            sorted_title: Its sorted-token title.
+            now: Timestamp recorded as last seen.
+            run_reps: Further representatives to match against, e.g. a
+                      session's first title of each story.
+        """
+        now = now or time.time()
+
+        known = self.urls.get(url) or self.titles.get(sorted_title)
+        if known and known[0] in self.stories:
+            story_id = known[0]
+        else:
+            # The lowest matching ID wins, as in keep-first dedup
+            matches = [self.reps.find(sorted_title)]
+            if run_reps is not None:
+                matches.append(run_reps.find(sorted_title))
+            matches = [match for match in matches if match is not None]
+            if matches:
+                story_id = min(matches)
+            else:
+                story_id = self.next_id
+                self.next_id += 1
+                self.stories[story_id] = [sorted_title, now, now]
+                self.reps.add(sorted_title, story_id)
+
+        self.stories[story_id][2] = now
+        self.urls[url] = [story_id, now]
+        self.titles[sorted_title] = [story_id, now]
+        return story_id
+
+    def evict(self, now: Optional[float] = None) -> None:
+        """Drop stories, URLs and titles not seen within max_age."""
+        cutoff = (now or time.time()) - self.max_age
+        self.stories = {k: v for k, v in self.stories.items() if v[2] >= cutoff}
+        self.urls = {k: v for k, v in self.urls.items() if v[1] >= cutoff and v[0] in self.stories}
+        self.titles = {k: v for k, v in self.titles.items() if v[1] >= cutoff and v[0] in self.stories}
+        self._rebuild_reps()
+
+    def save(self) -> None:
+        """Evict stale entries and write the index to disk atomically."""
+        self.evict()
+        data = {
+            'next_id': self.next_id,
+            'stories': self.stories,
+            'urls': self.urls,
+            'titles': self.titles,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.tmp-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save story index: {e}")
+
+
+class StorySession:
+    """
+    Story assignment for one dedup session, e.g. one region in one run.
+
+    The first title of each story seen in the session also becomes a
+    representative for the rest of it, so a title that joined an existing
+    story through its URL, its stored title or a fuzzy match still
+    catches later near-duplicates of itself, as keep-first dedup would.
+    """
+
+    def __init__(self, index: StoryIndex):
+        self.index = index
+        self.run_reps = index.matcher()
+        self.represented: Set[int] = set()
+
+    def assign_all(self, urls: List[str], sorted_titles: List[str]) -> List[int]:
+        now = time.time()
+        story_ids = []
+        for url, title in zip(urls, sorted_titles):
+            story_id = self.index.assign(url, title, now, self.run_reps)
+            if story_id not in self.represented:
+                self.represented.add(story_id)
+                self.run_reps.add(title, story_id)
+            story_ids.append(story_id)
+        return story_ids
@@ -0,0 +1,133 @@
+"""Canonical article URLs, so one story linked several ways dedups exactly."""
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+class URLCanonicalizer:
+    """
+    Reduces an article URL to a key that is equal for every variant of the
+    same page: http/https, www./m./amp. hosts, AMP paths, trailing slashes,
+    fragments, tracking parameters and query parameter order.
+
+    The key looks like a URL (always https) so it can also be used for
+    paywall lookups, but it is not guaranteed to resolve and is never shown.
+
+    Per-domain rules apply to the host and its subdomains (longest match
+    wins) and may set:
+        strip_params: extra parameters (or 'prefix*' patterns) to drop
+        keep_params: drop every parameter not listed
+        drop_query: drop the whole query string
+    """
+
+    DEFAULT_STRIP_PARAMS = (
+        'utm_*', 'at_*', 'ns_*', 'cmpid', 'cmp', 'fbclid', 'gclid', 'ocid',
+        'smid', 'smtyp', 'mc_cid', 'mc_eid', 'amp', 'outputtype',
+    )
+    HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+    MEMO_SIZE = 50000
+
+    def __init__(
+        self,
+        strip_params: Iterable[str] = DEFAULT_STRIP_PARAMS,
+        domains: Optional[Dict[str, dict]] = None
+    ):
+        """
+        Initialize URLCanonicalizer.
+
+        Args:
+            strip_params: Query parameters removed everywhere; a trailing '*'
+                          matches any parameter with that prefix.
+            domains: Per-domain rules, keyed by domain (see class docstring).
+        """
+        self.strip_params = self._compile(strip_params)
+        self.domains = {
+            domain.lower(): {
+                'strip_params': self._compile(rules.get('strip_params', ())),
+                'keep_params': {p.lower() for p in rules.get('keep_params', ())} or None,
+                'drop_query': rules.get('drop_query', False),
+            }
+            for domain, rules in (domains or {}).items()
+        }
+        self._memo: Dict[str, str] = {}
+
+    @staticmethod
+    def _compile(params: Iterable[str]) -> Tuple[frozenset, Tuple[str, ...]]:
+        exact, prefixes = set(), []
+        for param in params:
+            param = param.lower()
+            if param.endswith('*'):
+                prefixes.append(param[:-1])
+            else:
+                exact.add(param)
+        return frozenset(exact), tuple(prefixes)
+
+    @staticmethod
+    def _matches(param: str, compiled: Tuple[frozenset, Tuple[str, ...]]) -> bool:
+        exact, prefixes = compiled
+        return param in exact or (bool(prefixes) and param.startswith(prefixes))
+
+    def _rules_for(self, host: str) -> Optional[dict]:
+        best = None
+        for domain, rules in self.domains.items():
+            if (host == domain or host.endswith('.' + domain)) and (best is None or len(domain) > len(best)):
+                best = domain
+        return self.domains[best] if best else None
+
+    def canonicalize(self, url: str) -> str:
+        """Return the canonical key for a URL (memoized; unparseable URLs come back as-is)."""
+        key = self._memo.get(url)
+        if key is None:
+            try:
+                key = self._canonicalize(url)
+            except ValueError as e:
+                logger.debug(f"Cannot canonicalize {url}: {e}")
+                key = url
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[url] = key
+        return key
+
+    def _canonicalize(self, url: str) -> str:
+        parts = urlsplit(url.strip())
+        if parts.scheme.lower() not in ('http', 'https') or not parts.hostname:
+            return url
+
+        host = parts.hostname
+        for prefix in self.HOST_PREFIXES:
+            if host.startswith(prefix) and host.count('.') > 1:
+                host = host[len(prefix):]
+                break
+        if parts.port and parts.port not in (80, 443):
+            host = f'{host}:{parts.port}'
+
+        # AMP variants: /amp/..., .../amp, story.amp.html
+        segments = [s for s in parts.path.split('/') if s]
+        if segments and segments[0] == 'amp':
+            segments = segments[1:]
+        if segments and segments[-1] == 'amp':
+            segments = segments[:-1]
+        if segments and '.amp.' in segments[-1]:
+            segments[-1] = segments[-1].replace('.amp.', '.', 1)
+        path = '/' + '/'.join(segments) if segments else ''
+
+        query = ''
+        rules = self._rules_for(host)
+        if parts.query and not (rules and rules['drop_query']):
+            params = []
+            for name, value in parse_qsl(parts.query, keep_blank_values=True):
+                lowered = name.lower()
+                if self._matches(lowered, self.strip_params):
+                    continue
+                if rules:
+                    if self._matches(lowered, rules['strip_params']):
+                        continue
+                    if rules['keep_params'] is not None and lowered not in rules['keep_params']:
+                        continue
+                params.append((name, value))
+            if params:
+                query = '?' + urlencode(sorted(params))
+
+        return f'https://{host}{path}{query}'
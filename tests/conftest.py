@@ -0,0 +1,131 @@
+"""Shared fixtures; makes `src` importable when pytest runs from anywhere."""
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.parser import Article  # noqa: E402
+
+
+@pytest.fixture
+def now() -> datetime:
+    return datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def make_article(now):
+    """Build an Article with sensible defaults."""
+    def make(title: str, url: str = '', source: str = 'Feed', published: datetime = None, **fields) -> Article:
+        return Article(
+            title=title,
+            url=url or f"https://example.com/{abs(hash(title))}",
+            source=source,
+            published=published or now,
+            **fields
+        )
+    return make
+
+
+def rss(*titles: str, base: str = 'https://example.com') -> bytes:
+    """An RSS 2.0 feed with one item per title, newest first, an hour apart."""
+    items = ''.join(
+        f"<item><title>{title}</title><link>{base}/{i}</link>"
+        f"<pubDate>Thu, 01 Jan 2026 {11 - i % 12:02d}:00:00 GMT</pubDate></item>"
+        for i, title in enumerate(titles)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{items}</channel></rss>'.encode()
+
+
+@pytest.fixture
+def feed_server():
+    """
+    Serves `server.feeds[path]` bytes over HTTP on localhost; unknown paths 404.
+
+    Paths are logged to `server.requests`. `server.headers[path]` adds or
+    overrides response headers, `server.delays[path]` seconds pass between
+    the headers and the body, and `server.peak` is the most requests served
+    at once.
+    """
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    feeds = {}
+    headers = {}
+    delays = {}
+    requests = []
+    lock = threading.Lock()
+    active = [0]
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with lock:
+                requests.append(self.path)
+                active[0] += 1
+                server.peak = max(server.peak, active[0])
+            try:
+                self._respond()
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        def _respond(self):
+            body = feeds.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            for name, value in {'Content-Type': 'application/rss+xml', **headers.get(self.path, {})}.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.flush()
+            time.sleep(delays.get(self.path, 0))
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.feeds = feeds
+    server.headers = headers
+    server.delays = delays
+    server.requests = requests
+    server.peak = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_aggregator(tmp_path):
+    """Build a NewsAggregator from regions and settings, with its state under tmp_path."""
+    import yaml
+
+    from src.aggregator import NewsAggregator
+
+    def make(regions: dict, **settings):
+        config = {
+            'regions': regions,
+            'settings': {
+                'user_agent': 'NewsAggregator/test',
+                'request_timeout': 5,
+                'headlines_per_region': 15,
+                'retry': {'max_attempts': 1, 'base_delay': 0},
+                'history': {'enabled': False},
+                'country_table': '',
+                **settings,
+            },
+        }
+        path = tmp_path / 'config' / 'feeds.yaml'
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(yaml.safe_dump(config))
+        return NewsAggregator(str(path))
+    return make
@@ -0,0 +1,51 @@
+"""End-to-end aggregation against a local feed server."""
+import pytest
+
+from .conftest import rss
+from .test_story_index import near_duplicate_titles
+
+
+@pytest.fixture
+def regions(feed_server):
+    titles = near_duplicate_titles(120, seed=9)
+    for i in range(4):
+        feed_server.feeds[f'/feed{i}'] = rss(*titles[i * 30:(i + 1) * 30], base=f'https://site{i}.example.com')
+    feed_server.feeds['/sports'] = rss('Team wins cup final', 'Coach wins record', base='https://sport.example.com')
+    url = feed_server.url
+    return {
+        'us': {'name': 'US', 'feeds': [{'name': 'One', 'url': url + '/feed0'}, {'name': 'Two', 'url': url + '/feed1'}]},
+        'global': {'name': 'Global', 'feeds': [{'name': 'Two', 'url': url + '/feed1'}, {'name': 'Three', 'url': url + '/feed2'},
+                                               {'name': 'Four', 'url': url + '/feed3'}]},
+        'sports': {'name': 'Sports', 'max_per_sport': 1, 'feeds': [{'name': 'Sport', 'sport': 'soccer', 'url': url + '/sports'}]},
+    }
+
+
+SETTINGS = dict(
+    deduplication={'similarity_threshold': 0.72},
+    max_per_source=5,
+    sort_by='popularity',
+    cache={'enabled': False},
+    parse_cache={'enabled': False},
+)
+
+
+def test_partial_run_fetches_only_its_feeds(feed_server, make_aggregator, regions):
+    aggregator = make_aggregator(regions, **SETTINGS)
+    full = aggregator.aggregate()
+    feed_server.requests.clear()
+
+    partial = aggregator.aggregate(regions=['sports'])
+    assert list(partial) == ['sports']
+    assert feed_server.requests == ['/sports']
+    assert partial['sports']['articles'][0]['title'] == full['sports']['articles'][0]['title']
+
+    with pytest.raises(ValueError):
+        aggregator.aggregate(regions=['mars'])
+
+
+def test_worker_processes_match_in_process(make_aggregator, regions):
+    serial = make_aggregator(regions, **SETTINGS).aggregate()
+    parallel = make_aggregator(regions, processes=2, **SETTINGS).aggregate()
+    strip = lambda data: {k: [(a['title'], a['url'], a['source']) for a in v['articles']] for k, v in data.items()}
+    assert strip(parallel) == strip(serial)
+    assert len(serial['us']['articles']) == 10  # Two feeds, max_per_source 5
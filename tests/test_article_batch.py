@@ -0,0 +1,37 @@
+"""ArticleBatch serialization must match per-article to_dict() output."""
+from datetime import timedelta, timezone
+
+from src.parser import Article, ArticleBatch
+
+
+def test_to_dicts_matches_to_dict(make_article, now):
+    articles = [
+        make_article('First', published=now - timedelta(minutes=5), feed_position=0, popularity_score=0.12345),
+        make_article('Second', published=now - timedelta(hours=3), feed_position=1, is_paywalled=True),
+        make_article('Third', published=now - timedelta(hours=3), feed_position=2, country_flag='🇫🇷'),
+        make_article('Fourth', published=now - timedelta(days=2), feed_position=3),
+    ]
+    assert ArticleBatch(articles).to_dicts(now) == [article.to_dict(now) for article in articles]
+
+
+def test_to_dicts_keeps_each_utc_offset(make_article, now):
+    # Same instant, different offsets: equal and hash-equal, but serialized differently
+    utc = now
+    eastern = now.astimezone(timezone(timedelta(hours=-4)))
+    assert utc == eastern and hash(utc) == hash(eastern)
+
+    dicts = ArticleBatch([make_article('UTC', published=utc), make_article('EDT', published=eastern)]).to_dicts(now)
+    assert dicts[0]['published'] == '2026-01-01T12:00:00+00:00'
+    assert dicts[1]['published'] == '2026-01-01T08:00:00-04:00'
+
+
+def test_rows_round_trip(make_article, now):
+    articles = [
+        make_article('One', published=now, feed_position=4, popularity_score=0.5, sport='football'),
+        make_article('Two', published=now - timedelta(hours=1), is_paywalled=True, canonical_url='https://example.com/two'),
+    ]
+    restored = ArticleBatch.from_rows(ArticleBatch(articles).to_rows()).articles
+    for original, copy in zip(articles, restored):
+        assert isinstance(copy, Article)
+        assert copy.to_dict(now) == original.to_dict(now)
+        assert (copy.sport, copy.url_key) == (original.sport, original.url_key)
@@ -0,0 +1,45 @@
+"""Article store history and the paywall verdicts reused from it."""
+from datetime import timedelta
+
+from src.article_store import ArticleStore
+
+from .conftest import rss
+
+
+def test_record_and_query(tmp_path, make_article, now):
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    run = now.timestamp()
+    articles = [
+        make_article('Storm hits Florida coast', url='https://example.com/storm', feed_position=0),
+        make_article('Stocks rally', url='https://example.com/stocks', feed_position=1, published=now - timedelta(hours=1)),
+    ]
+    store.record_feed(articles, run)
+    store.record_feed([make_article('Storm hits Florida coast', url='https://example.com/storm', feed_position=3)], run + 3600)
+    store.record_selection('us', articles[::-1], run)
+
+    assert [a['title'] for a in store.region_articles('us')] == ['Stocks rally', 'Storm hits Florida coast']
+    storm = store.articles(since=run)[0]
+    assert (storm['title'], storm['times_seen'], storm['best_position'], storm['feed_position']) == \
+        ('Storm hits Florida coast', 2, 0, 3)
+    assert [a['title'] for a in store.articles(since=run + 1, new_only=True)] == []
+    assert store.positions('https://example.com/storm') == [(run, 'Feed', 0), (run + 3600, 'Feed', 3)]
+
+
+def test_reused_verdicts_expire_with_verdict_ttl(feed_server, make_aggregator):
+    feed_server.feeds['/news'] = rss('Storm hits Florida coast')
+    aggregator = make_aggregator(
+        {'us': {'name': 'US', 'feeds': [{'name': 'News', 'url': feed_server.url + '/news'}]}},
+        paywall={'enabled': True, 'verdict_cache': {'ttl': 3600}},
+        store={'enabled': True},
+    )
+    assert aggregator.aggregate()['us']['articles'][0]['is_paywalled'] is False
+    aggregator.paywall_detector.add_paywalled_domain('example.com')
+
+    # Checked just now: the stored verdict is reused
+    assert aggregator.aggregate()['us']['articles'][0]['is_paywalled'] is False
+
+    # Checked longer ago than the TTL: checked again
+    with aggregator.store._conn:
+        aggregator.store._conn.execute('UPDATE articles SET checked_at = checked_at - 7200')
+    assert aggregator.aggregate()['us']['articles'][0]['is_paywalled'] is True
+
@@ -0,0 +1,113 @@
+"""The country automaton must match like the regex alternation it replaced."""
+import json
+import random
+import re
+
+import pytest
+
+from src import country_detector
+from src.country_detector import COUNTRY_FLAGS, KeywordMatcher, detect_countries, detect_country, find_countries
+
+FILLER = 'troops talks leave after new south north city man president _id 2026 vs - , : \' "'.split(' ')
+
+
+def regex_pattern(keywords):
+    """The matcher before KeywordMatcher: longest-first alternation between \\b anchors."""
+    escaped = [re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)]
+    return re.compile(r'\b(' + '|'.join(escaped) + r')\b', re.IGNORECASE)
+
+
+def random_titles(count, seed=3):
+    """Titles mixing keywords (some glued to words or each other) with filler, in random case."""
+    rng = random.Random(seed)
+    # 'u.s.' starts and ends in non-word characters, where \b behaves differently (see below)
+    keywords = sorted(set(COUNTRY_FLAGS) - {'u.s.'})
+    titles = []
+    for _ in range(count):
+        parts = [rng.choice(keywords) if rng.random() < 0.4 else rng.choice(FILLER) for _ in range(rng.randint(2, 9))]
+        glue = rng.choice([' ', ' ', ' ', '', '-', "'s ", ', '])
+        title = glue.join(parts)
+        titles.append(''.join(c.upper() if rng.random() < 0.3 else c for c in title))
+    return titles
+
+
+@pytest.fixture
+def matcher(monkeypatch):
+    """A freshly built country matcher, restoring the module's cached matcher afterwards."""
+    monkeypatch.setattr(country_detector, '_MATCHER', None)
+    monkeypatch.setattr(country_detector, '_TABLE_PATH', None)
+    return country_detector._get_matcher()
+
+
+def test_matches_regex(matcher):
+    pattern = regex_pattern(COUNTRY_FLAGS)
+    titles = random_titles(3000) + [
+        'South Korea and North Korea talks', 'Korean talks', 'Papua New Guinea quake',
+        'New Zealand-Australia trade', 'Parisian cafe', 'Frenchman wins', 'Cote d\'Ivoire votes',
+        'SriLanka', 'Hong Kong_protest', 'Iran, Iraq', '',
+    ]
+    for title in titles:
+        expected = [match.lower() for match in pattern.findall(title)]
+        assert find_countries(title) == expected, title
+        first = pattern.search(title)
+        if first:
+            country = first.group(1).lower()
+            assert detect_country(title) == (country.title(), COUNTRY_FLAGS[country]), title
+        else:
+            assert detect_country(title) == (None, '🌍'), title
+
+
+def test_us_abbreviation_matches_before_a_space(matcher):
+    # Under \b, 'u.s.' only matched when a word character followed it. Now it
+    # matches when none does, like every other keyword, and no longer in 'U.S.A'
+    pattern = regex_pattern(COUNTRY_FLAGS)
+    for title in ('U.S. troops leave', 'Troops leave the U.S.'):
+        assert pattern.search(title) is None
+        assert find_countries(title) == ['u.s.']
+    assert pattern.findall('U.S.-China talks') == ['China']
+    assert find_countries('U.S.-China talks') == ['u.s.', 'china']
+    assert find_countries('Troops leave the U.S.A') == []
+    assert find_countries('Bus.s. stop') == []
+
+
+def test_batch_detection(matcher):
+    assert detect_countries(['Russia and Moscow talks with Ukraine', 'Weather']) == [
+        [('Russia', COUNTRY_FLAGS['russia']), ('Ukraine', COUNTRY_FLAGS['ukraine'])],
+        [],
+    ]
+
+
+def test_table_round_trip():
+    built = KeywordMatcher(COUNTRY_FLAGS)
+    loaded = KeywordMatcher.from_table(json.loads(json.dumps(built.to_table())))
+    assert loaded.keywords == built.keywords
+    for title in random_titles(500, seed=5):
+        assert loaded.find_all(title) == built.find_all(title)
+
+    with pytest.raises(ValueError):
+        KeywordMatcher.from_table({**built.to_table(), 'version': 0})
+
+
+def test_table_file_written_once_and_reused(tmp_path, monkeypatch, matcher):
+    path = tmp_path / 'cache' / 'country_matcher.json'
+    country_detector.use_table(str(path))
+    built = country_detector._get_matcher()
+    assert path.exists()
+
+    # The next process loads the table instead of building
+    country_detector.use_table(str(path))
+    monkeypatch.setattr(KeywordMatcher, '_build', lambda self: pytest.fail('rebuilt'))
+    loaded = country_detector._get_matcher()
+    assert loaded is not built and loaded.keywords == built.keywords
+    assert find_countries('Talks in Kyiv and Paris') == built.find_all('Talks in Kyiv and Paris')
+
+
+@pytest.mark.parametrize('content', ['not json', json.dumps({'version': 99}), 'stale'])
+def test_unusable_table_is_rebuilt(tmp_path, matcher, content):
+    path = tmp_path / 'country_matcher.json'
+    if content == 'stale':
+        content = json.dumps(KeywordMatcher(['atlantis']).to_table())
+    path.write_text(content)
+    country_detector.use_table(str(path))
+    assert find_countries('Talks in Paris') == ['paris']
+    assert KeywordMatcher.from_table(json.loads(path.read_text())).keywords == matcher.keywords
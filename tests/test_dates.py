@@ -0,0 +1,48 @@
+"""The fast date parsers must agree with dateutil, which they replace."""
+import time
+from datetime import timezone
+
+import pytest
+from dateutil import parser as date_parser
+
+from src.dates import from_struct, parse_date
+
+SAMPLES = [
+    'Thu, 15 Oct 2026 10:00:00 GMT',
+    'Thu, 15 Oct 2026 10:00:00 +0000',
+    'Thu, 15 Oct 2026 06:00:00 -0400',
+    'Thu, 15 Oct 2026 06:00:00 EDT',
+    'Thu, 15 Oct 26 10:00:00 GMT',
+    '15 Oct 2026 10:00 GMT',
+    'Thursday, 15 October 2026 10:00:00 +0530',
+    '2026-10-15T10:00:00Z',
+    '2026-10-15T10:00:00+05:30',
+    '2026-10-15T10:00:00.123456Z',
+    '2026-10-15 10:00:00',
+    '2026-10-15',
+    'October 15, 2026 10:00 AM',  # Neither fast path: dateutil
+]
+
+
+def dateutil_parse(value):
+    parsed = date_parser.parse(value, tzinfos={'EDT': -4 * 3600})
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('value', SAMPLES)
+def test_matches_dateutil(value):
+    parsed = parse_date(value)
+    expected = dateutil_parse(value)
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+
+
+@pytest.mark.parametrize('value', ['', 'not a date', '32 Foo 2026 99:99'])
+def test_unparseable(value):
+    assert parse_date(value) is None
+
+
+def test_from_struct_is_utc():
+    struct = time.strptime('2026-10-15 10:00:00', '%Y-%m-%d %H:%M:%S')
+    assert from_struct(struct) == dateutil_parse('2026-10-15T10:00:00Z')
+    assert from_struct(None) is None
@@ -0,0 +1,82 @@
+"""Bulk and blocked dedup against the pairwise keep-first definition."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from rapidfuzz import fuzz
+
+from src.deduplicator import ArticleDeduplicator
+from src.features import title_features
+
+from .test_story_index import near_duplicate_titles
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def keep_first(titles: list, threshold: float) -> list:
+    """Reference clustering: each title joins the first earlier cluster whose first title it matches."""
+    reps, ids = [], []
+    for title in titles:
+        key = title_features(title).sorted_tokens
+        match = next((i for i, rep in enumerate(reps) if fuzz.ratio(key, rep) >= threshold * 100), None)
+        if match is None:
+            match = len(reps)
+            reps.append(key)
+        ids.append(match)
+    return ids
+
+
+def test_exact_matches_pairwise_reference(make_article):
+    titles = near_duplicate_titles(300, seed=7)
+    articles = [make_article(title, url=f"https://example.com/{i}") for i, title in enumerate(titles)]
+    assert ArticleDeduplicator(0.72, index='exact').cluster(articles) == keep_first(titles, 0.72)
+
+
+def test_deduplicate_keeps_first_of_each_cluster(make_article):
+    titles = near_duplicate_titles(200, seed=3)
+    articles = [make_article(title, url=f"https://example.com/{i}") for i, title in enumerate(titles)]
+    ids = keep_first(titles, 0.72)
+    expected = [article for i, article in enumerate(articles) if ids[i] not in ids[:i]]
+    assert ArticleDeduplicator(0.72).deduplicate(articles) == expected
+
+
+def test_urls_dedup_before_titles(make_article):
+    articles = [
+        make_article('Storm hits Florida coast', url='https://example.com/storm'),
+        make_article('Completely different words here', url='https://example.com/storm'),
+    ]
+    assert ArticleDeduplicator().cluster(articles) == [0, 0]
+
+
+def test_block_probe_is_deterministic_across_hash_seeds():
+    # Five keys with one posting each, but only four are probed: which one
+    # is left out must not depend on set iteration order
+    script = (
+        "from src.deduplicator import BlockIndex\n"
+        "stop = 'about after amid from into over that the this with'\n"
+        "blocks = BlockIndex(70)\n"
+        "blocks.add(' '.join(sorted((stop + ' zebra').split())), 0)\n"
+        "for i, word in enumerate(['alpha', 'bravo', 'charl', 'delta'], 1):\n"
+        "    blocks.add(word + ' qq', i)\n"
+        "print(blocks.find(' '.join(sorted((stop + ' zebra alpha bravo charl delta').split()))))\n"
+    )
+    results = set()
+    for seed in range(1, 7):
+        env = dict(os.environ, PYTHONHASHSEED=str(seed))
+        output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+        results.add(output.stdout.strip())
+    assert results == {'None'}
+
+
+@pytest.mark.parametrize('index', ['exact', 'token'])
+def test_batches_match_one_call(make_article, index):
+    titles = near_duplicate_titles(250, seed=5)
+    articles = [make_article(title, url=f"https://example.com/{i}") for i, title in enumerate(titles)]
+    dedup = ArticleDeduplicator(0.72, index=index)
+    session = dedup.session()
+    ids = []
+    for start in range(0, len(articles), 20):
+        ids += session.add(articles[start:start + 20])
+    assert ids == dedup.cluster(articles)
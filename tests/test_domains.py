@@ -0,0 +1,56 @@
+"""Suffix-indexed domain lookups must match the old per-domain endswith() scan."""
+from src.domains import DomainIndex, host_of, registrable_domain
+from src.paywall import PaywallDetector
+
+HOSTS = [
+    'ft.com', 'markets.ft.com', 'a.b.ft.com', 'notft.com', 'ft.com.evil.net',
+    'nytimes.com', 'cooking.nytimes.com', 'telegraph.co.uk', 'www2.telegraph.co.uk',
+    'co.uk', 'bbc.co.uk', 'example.com', 'localhost', '',
+]
+
+
+def endswith_scan(domains, host):
+    """How _is_known_paywalled() matched before the index."""
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+def test_matches_endswith_scan():
+    domains = PaywallDetector.DEFAULT_PAYWALLED_DOMAINS
+    index = DomainIndex.from_domains(domains, paywalled=True)
+    for host in HOSTS:
+        assert index.get(host, 'paywalled', False) == endswith_scan(domains, host), host
+
+
+def test_most_specific_entry_wins():
+    index = DomainIndex({'example.com': {'per_host': 2}, 'feeds.example.com': {'per_host': 6}})
+    assert index.get('feeds.example.com', 'per_host') == 6
+    assert index.get('a.feeds.example.com', 'per_host') == 6
+    assert index.get('www.example.com', 'per_host') == 2
+    assert index.get('example.org', 'per_host', 1) == 1
+
+
+def test_public_suffixes_are_not_indexed():
+    index = DomainIndex.from_domains(['co.uk', 'com', 'bbc.co.uk'], paywalled=True)
+    assert list(index) == ['bbc.co.uk']
+    assert index.lookup('telegraph.co.uk') is None
+
+
+def test_changes_clear_memo():
+    index = DomainIndex(memo_size=2)
+    assert index.lookup('news.example.com') is None
+    index.add('www.example.com', paywalled=True)
+    assert 'example.com' in index
+    assert index.get('news.example.com', 'paywalled') is True
+    index.remove('example.com')
+    assert index.lookup('news.example.com') is None
+    for host in ('a.com', 'b.com', 'c.com'):
+        index.lookup(host)
+    assert len(index._memo) == 2
+
+
+def test_hosts_and_registrable_domains():
+    assert host_of('https://WWW.Example.com:8080/a') == 'example.com'
+    assert host_of('not a url') == ''
+    assert registrable_domain('feeds.bbci.co.uk') == 'bbci.co.uk'
+    assert registrable_domain('a.b.example.com') == 'example.com'
+    assert registrable_domain('127.0.0.1') == '127.0.0.1'
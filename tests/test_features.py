@@ -0,0 +1,30 @@
+"""Shared title features must agree with the helpers they replace."""
+from src import features
+from src.country_detector import detect_country, find_countries
+from src.features import normalize_title, title_features
+
+TITLES = [
+    'BREAKING: France and Germany sign trade pact',
+    'Update: Storm hits Florida coast',
+    'Local man wins lottery twice',
+    "Japan's PM visits Kenya, Brazil",
+]
+
+
+def test_features_match_helpers():
+    for title in TITLES:
+        feats = title_features(title)
+        assert feats.normalized == normalize_title(title)
+        assert feats.tokens == frozenset(normalize_title(title).split())
+        assert feats.sorted_tokens == ' '.join(sorted(normalize_title(title).split()))
+        assert feats.countries == tuple(find_countries(title))
+        assert detect_country(title, feats) == detect_country(title)
+
+
+def test_countries_are_matched_lazily(monkeypatch):
+    calls = []
+    monkeypatch.setattr(features, 'find_countries', lambda title: calls.append(title) or [])
+    feats = title_features('A headline only dedup ever looks at')
+    assert calls == []
+    assert feats.countries == ()
+    assert calls == ['A headline only dedup ever looks at']
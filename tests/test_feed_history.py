@@ -0,0 +1,82 @@
+"""Per-feed fetch history and the fetch policy derived from it."""
+import json
+
+import pytest
+
+from src import feed_history
+from src.feed_history import FeedHistory, FeedStats
+
+
+@pytest.fixture
+def history(tmp_path):
+    return FeedHistory(str(tmp_path / 'history.json'), window=5, min_timeout=2.0, failure_threshold=3, probe_interval=600)
+
+
+def test_percentile_is_nearest_rank():
+    stats = FeedStats(latencies=[0.5, 0.1, 0.4, 0.2, 0.3])
+    assert stats.percentile(95) == 0.5
+    assert stats.percentile(50) == 0.3
+    assert stats.percentile(1) == 0.1
+    assert FeedStats().percentile(95) is None
+
+
+def test_timeout_follows_p95_within_bounds(history):
+    url = 'https://example.com/feed'
+    assert history.timeout_for(url, 15) == 15
+    for latency in (0.2, 0.3):
+        history.record_success(url, latency, 1000)
+    assert history.timeout_for(url, 15) == 15  # Too few samples
+    history.record_success(url, 0.25, 1000)
+    assert history.timeout_for(url, 15) == 2.0  # 0.3 * 3 is below min_timeout
+
+    for _ in range(5):
+        history.record_success(url, 4.0, 1000)
+    assert history.get(url).latencies == [4.0] * 5  # Window of 5
+    assert history.timeout_for(url, 15) == 12.0
+    assert history.timeout_for(url, 10) == 10  # Never above the default
+
+
+def test_circuit_opens_after_consecutive_failures(history, monkeypatch):
+    url = 'https://example.com/feed'
+    for _ in range(2):
+        history.record_failure(url)
+    assert not history.is_circuit_open(url) and not history.should_skip(url)
+    history.record_failure(url)
+    assert history.is_circuit_open(url) and history.should_skip(url)
+
+    # A probe is due after probe_interval
+    later = feed_history.time.time() + 601
+    monkeypatch.setattr(feed_history.time, 'time', lambda: later)
+    assert history.is_circuit_open(url) and not history.should_skip(url)
+
+    history.record_success(url, 0.1, 1000)
+    assert not history.is_circuit_open(url)
+    assert history.get(url).total_failures == 3
+
+
+def test_slowest_feeds_first(history):
+    history.record_success('https://a.example.com', 0.1, 1)
+    history.record_success('https://b.example.com', 3.0, 1)
+    assert history.order(['https://a.example.com', 'https://b.example.com', 'https://new.example.com']) == [
+        'https://new.example.com', 'https://b.example.com', 'https://a.example.com'
+    ]
+
+
+def test_persists(history, tmp_path):
+    history.record_success('https://example.com/feed', 0.5, 2048)
+    history.record_failure('https://example.com/other')
+    history.record_survivors('https://example.com/feed', 4)
+    history.save()
+
+    loaded = FeedHistory(str(tmp_path / 'history.json'))
+    assert loaded.get('https://example.com/feed') == history.get('https://example.com/feed')
+    assert loaded.get('https://example.com/other').consecutive_failures == 1
+    assert not list(tmp_path.glob('.tmp-*'))
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / 'history.json'
+    path.write_text(json.dumps({'https://example.com/feed': {'unknown_field': 1}}))
+    assert FeedHistory(str(path)).get('https://example.com/feed') == FeedStats()
+    path.write_text('{')
+    assert FeedHistory(str(path)).get('https://example.com/feed') == FeedStats()
@@ -0,0 +1,175 @@
+"""Feed fetching against a local feed server: caching, history and limits."""
+import time
+
+import pytest
+
+from src import feed_cache, feed_history
+from src.feed_cache import FeedCache
+from src.feed_history import FeedHistory
+from src.fetcher import ConcurrencyConfig, FeedFetcher, HostThrottle, RetryConfig
+from src.parser import FeedParser
+
+from .conftest import rss
+
+
+@pytest.fixture
+def make_fetcher():
+    def make(**options) -> FeedFetcher:
+        options.setdefault('retry_config', RetryConfig(max_attempts=1, base_delay=0))
+        options.setdefault('concurrency', ConcurrencyConfig(host_delay=0))
+        return FeedFetcher('NewsAggregator/test', timeout=5, **options)
+    return make
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeedCache(str(tmp_path / 'feeds'))
+
+
+@pytest.fixture
+def history(tmp_path):
+    return FeedHistory(str(tmp_path / 'history.json'), failure_threshold=2)
+
+
+def test_failed_fetch_serves_stale_copy(feed_server, make_fetcher, cache):
+    feed_server.feeds['/feed'] = body = rss('Storm hits coast')
+    fetcher = make_fetcher(cache=cache)
+    assert fetcher.fetch(feed_server.url + '/feed').content == body
+
+    del feed_server.feeds['/feed']
+    response = fetcher.fetch(feed_server.url + '/feed')
+    assert response.content == body and response.from_cache
+    assert make_fetcher().fetch(feed_server.url + '/feed') is None
+
+
+def test_circuit_broken_feed_serves_stale_copy(feed_server, make_fetcher, cache, history, monkeypatch):
+    url = feed_server.url + '/feed'
+    feed_server.feeds['/feed'] = body = rss('Storm hits coast')
+    fetcher = make_fetcher(cache=cache, history=history)
+    assert fetcher.fetch(url).content == body
+    for _ in range(2):
+        history.record_failure(url)
+    assert history.should_skip(url)
+    feed_server.requests.clear()
+
+    response = fetcher.fetch(url)
+    assert response.content == body and response.from_cache
+    assert feed_server.requests == []  # Skipped, not fetched
+
+    monkeypatch.setattr(feed_cache.CachedFeed, 'age', lambda entry: 2 * 86400)
+    assert fetcher.fetch(url) is None
+    assert feed_server.requests == []
+
+
+def slow_feeds(feed_server, count, delay=0.2):
+    """Paths of `count` feeds whose bodies take `delay` seconds to start."""
+    urls = []
+    for i in range(count):
+        feed_server.feeds[f'/slow{i}'] = rss(f'Story {i}')
+        feed_server.delays[f'/slow{i}'] = delay
+        urls.append(f'{feed_server.url}/slow{i}')
+    return urls
+
+
+@pytest.mark.parametrize('per_host, host_limits, expected', [
+    (2, {}, 2),
+    (6, {}, 6),
+    (6, {'127.0.0.1': {'per_host': 1}}, 1),  # Per-domain override
+])
+def test_requests_per_host_are_capped(feed_server, make_fetcher, per_host, host_limits, expected):
+    urls = slow_feeds(feed_server, 6)
+    fetcher = make_fetcher(concurrency=ConcurrencyConfig(
+        max_workers=8, per_host=per_host, host_delay=0, host_limits=host_limits
+    ))
+    responses = fetcher.fetch_all(urls)
+    assert all(response.content for response in responses.values())
+    assert feed_server.peak == expected
+
+
+def test_workers_cap_all_requests(feed_server, make_fetcher):
+    urls = slow_feeds(feed_server, 6)
+    fetcher = make_fetcher(concurrency=ConcurrencyConfig(max_workers=3, per_host=6, host_delay=0))
+    assert len(fetcher.fetch_all(urls + urls[:2])) == 6  # Duplicates fetched once
+    assert feed_server.peak == 3
+    assert len(feed_server.requests) == 6
+
+
+def test_request_starts_are_spaced_per_host():
+    throttle = HostThrottle(per_host=3, delay=0.1)
+    starts = []
+    for _ in range(3):
+        with throttle.slot('http://a.example.com/feed'):
+            starts.append(time.monotonic())
+    with throttle.slot('http://b.example.com/feed'):
+        other_host = time.monotonic()
+    assert starts[1] - starts[0] >= 0.09 and starts[2] - starts[1] >= 0.09
+    assert other_host - starts[2] < 0.09  # Other hosts don't wait
+
+
+def test_results_arrive_while_others_download(feed_server, make_fetcher):
+    feed_server.feeds['/fast'] = rss('Quick story')
+    slow = slow_feeds(feed_server, 1, delay=1.0)
+    fetcher = make_fetcher(concurrency=ConcurrencyConfig(max_workers=4, per_host=4, host_delay=0))
+    started = time.monotonic()
+    with fetcher.start_all(slow + [feed_server.url + '/fast']) as pending:
+        assert pending.result(feed_server.url + '/fast').content == rss('Quick story')
+        assert time.monotonic() - started < 0.8
+        assert pending.result(slow[0]).content == rss('Story 0')
+
+
+def test_bodies_are_capped_at_max_bytes(feed_server, make_fetcher):
+    feed_server.feeds['/big'] = body = rss(*(f'Story number {i}' for i in range(200)))
+    url = feed_server.url + '/big'
+
+    response = make_fetcher(max_bytes=len(body)).fetch(url)
+    assert response.content == body and not response.truncated
+
+    response = make_fetcher(max_bytes=4000).fetch(url)
+    assert response.content == body[:4000] and response.truncated
+    # The items that arrived in full are still used
+    titles = [a.title for a in FeedParser(max_entries=0).parse(response.content, 'Big', response.headers)]
+    assert titles[:10] == [f'Story number {i}' for i in range(10)]
+    assert len(titles) < 200
+
+
+def test_raw_bytes_decoded_by_declared_charset(feed_server, make_fetcher):
+    feed_server.feeds['/latin1'] = rss('Café owners in Zürich protest').decode().encode('iso-8859-1')
+    feed_server.headers['/latin1'] = {'Content-Type': 'application/rss+xml; charset=iso-8859-1', 'Content-Language': 'de'}
+    response = make_fetcher().fetch(feed_server.url + '/latin1')
+    assert response.headers == {'content-type': 'application/rss+xml; charset=iso-8859-1', 'content-language': 'de'}
+    articles = FeedParser().parse(response.content, 'Latin', response.headers)
+    assert [a.title for a in articles] == ['Café owners in Zürich protest']
+
+
+def test_adaptive_timeout_from_history(feed_server, make_fetcher, tmp_path):
+    url = slow_feeds(feed_server, 1, delay=1.0)[0]
+    history = FeedHistory(str(tmp_path / 'history.json'), min_timeout=0.3)
+    for _ in range(3):
+        history.record_success(url, 0.05, 100)
+    assert history.timeout_for(url, 5) == 0.3
+
+    assert make_fetcher(history=history).fetch(url) is None  # Body took longer than 0.3s
+    assert history.get(url).consecutive_failures == 1
+    assert make_fetcher(history=history).fetch(url, timeout=5).content == rss('Story 0')  # Explicit timeouts win
+
+
+def test_circuit_broken_feed_is_skipped_then_probed_once(feed_server, make_fetcher, tmp_path, monkeypatch):
+    url = feed_server.url + '/down'
+    history = FeedHistory(str(tmp_path / 'history.json'), failure_threshold=2, probe_interval=600)
+    fetcher = make_fetcher(history=history, retry_config=RetryConfig(max_attempts=3, base_delay=0))
+    for _ in range(2):
+        assert fetcher.fetch(url) is None
+    assert len(feed_server.requests) == 6
+
+    assert fetcher.fetch(url) is None
+    assert len(feed_server.requests) == 6  # Skipped
+
+    later = feed_history.time.time() + 601
+    monkeypatch.setattr(feed_history.time, 'time', lambda: later)
+    assert fetcher.fetch(url) is None
+    assert len(feed_server.requests) == 7  # One probe attempt, no retries
+
+    later += 601
+    feed_server.feeds['/down'] = rss('Back up')
+    assert fetcher.fetch(url).content == rss('Back up')
+    assert not history.is_circuit_open(url)
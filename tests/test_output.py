@@ -0,0 +1,98 @@
+"""Output writer, region shards and merging partial refreshes into existing output."""
+import gzip
+import json
+import os
+
+from src.generator import SHARD_MANIFEST, HTMLGenerator
+from src.output import OutputWriter, precompressed
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+
+def region(name, *titles):
+    return {'name': name, 'articles': [
+        {
+            'title': title, 'url': f'https://example.com/{i}', 'source': 'Feed',
+            'published': '2026-01-01T12:00:00+00:00', 'age': '1h ago', 'popularity_score': 1.0,
+            'feed_position': i, 'is_paywalled': False, 'country_flag': ''
+        }
+        for i, title in enumerate(titles)
+    ]}
+
+
+def test_writes_atomically_and_skips_unchanged(tmp_path):
+    writer = OutputWriter(tmp_path)
+    assert writer.write('data/a.json', '{"a": 1}') is True
+    path = tmp_path / 'data' / 'a.json'
+    os.utime(path, (1, 1))
+    assert writer.write('data/a.json', '{"a": 1}') is False
+    assert path.stat().st_mtime == 1
+    assert gzip.decompress((tmp_path / 'data' / 'a.json.gz').read_bytes()) == b'{"a": 1}'
+    assert not list(tmp_path.glob('**/.tmp-*'))
+
+    assert writer.write('data/a.json', '{"a": 2}') is True
+    assert path.read_bytes() == b'{"a": 2}'
+    assert gzip.decompress((tmp_path / 'data' / 'a.json.gz').read_bytes()) == b'{"a": 2}'
+
+    # A fresh writer (next run) trusts the manifest
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    assert manifest['data/a.json']['sha256'] == writer.hash_of('data/a.json')
+    assert OutputWriter(tmp_path).write('data/a.json', '{"a": 2}') is False
+
+
+def test_images_are_not_compressed_and_remove_cleans_up(tmp_path):
+    writer = OutputWriter(tmp_path)
+    writer.write('logo.png', b'\x89PNG')
+    assert not (tmp_path / 'logo.png.gz').exists()
+    writer.write('index.html', '<html></html>')
+    writer.remove('index.html')
+    assert not (tmp_path / 'index.html').exists() and not (tmp_path / 'index.html.gz').exists()
+    assert writer.hash_of('index.html') is None
+
+
+def test_precompressed_negotiation(tmp_path):
+    OutputWriter(tmp_path).write('index.html', '<html></html>')
+    path = tmp_path / 'index.html'
+    assert precompressed(path, 'gzip, deflate') == (tmp_path / 'index.html.gz', 'gzip')
+    assert precompressed(path, 'gzip;q=0, deflate') is None
+    assert precompressed(path, '') is None
+
+
+def test_shards_hold_each_region(tmp_path):
+    data = {'us': region('United States', 'Storm hits Florida coast'), 'global': region('Global', 'Talks resume')}
+    HTMLGenerator(TEMPLATES, str(tmp_path)).generate(data, default_region='us')
+
+    manifest = json.loads((tmp_path / SHARD_MANIFEST).read_text())
+    assert manifest['default_region'] == 'us'
+    for region_id, region_data in data.items():
+        shard = tmp_path / 'data' / f'{region_id}.json'
+        assert json.loads(shard.read_text()) == region_data
+        assert manifest['regions'][region_id]['articles'] == 1
+        assert manifest['regions'][region_id]['url'].startswith(f'data/{region_id}.json?v=')
+    assert json.loads((tmp_path / 'data.json').read_text()) == data
+
+    html = (tmp_path / 'index.html').read_text()
+    assert 'Storm hits Florida coast' in html  # Default region inline
+    assert 'Talks resume' not in html           # Others loaded from their shard
+    assert f'data-src="{manifest["regions"]["global"]["url"]}"' in html
+
+
+def test_removed_region_shard_is_deleted(tmp_path):
+    generator = HTMLGenerator(TEMPLATES, str(tmp_path))
+    generator.generate({'us': region('US', 'One'), 'sports': region('Sports', 'Two')}, default_region='us')
+    generator.generate({'us': region('US', 'One')}, default_region='us')
+    assert not (tmp_path / 'data' / 'sports.json').exists()
+    assert list(json.loads((tmp_path / SHARD_MANIFEST).read_text())['regions']) == ['us']
+
+
+def test_merge_replaces_only_refreshed_regions(tmp_path):
+    generator = HTMLGenerator(TEMPLATES, str(tmp_path))
+    generator.generate({'us': region('US', 'Old US'), 'global': region('Global', 'Old global')}, default_region='us')
+    global_shard = (tmp_path / 'data' / 'global.json').stat().st_mtime_ns
+
+    merged = generator.merge({'us': region('US', 'New US'), 'sports': region('Sports', 'New sports')}, default_region='us')
+    assert list(merged) == ['us', 'global', 'sports']
+    assert merged['global'] == region('Global', 'Old global')
+    assert json.loads((tmp_path / 'data.json').read_text()) == merged
+    assert json.loads((tmp_path / 'data' / 'us.json').read_text()) == region('US', 'New US')
+    assert (tmp_path / 'data' / 'global.json').stat().st_mtime_ns == global_shard
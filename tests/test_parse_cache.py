@@ -0,0 +1,41 @@
+"""Parse cache hits must give the same articles as parsing, annotated afresh."""
+from src.parse_cache import ParseCache
+from src.parser import FeedParser
+
+from .conftest import rss
+
+
+def test_round_trip(tmp_path):
+    content = rss('Storm hits Florida coast', 'Stocks rally as Fed holds rates')
+    cache = ParseCache(str(tmp_path), salt='test')
+    articles = FeedParser().parse(content, 'Feed', {})
+    key = cache.key(content, 'Feed', 'application/rss+xml')
+    assert cache.get(key) is None
+
+    cache.put(key, articles)
+    cached = cache.get(key)
+    assert [(a.title, a.url, a.source, a.published, a.feed_position, a.popularity_score) for a in cached] == \
+        [(a.title, a.url, a.source, a.published, a.feed_position, a.popularity_score) for a in articles]
+    assert cache.key(content, 'Other feed', 'application/rss+xml') != key
+    assert ParseCache(str(tmp_path), salt='other').key(content, 'Feed', 'application/rss+xml') != key
+
+
+def test_hit_skips_parsing_but_not_annotation(feed_server, make_aggregator, monkeypatch):
+    feed_server.feeds['/news'] = rss('Storm hits Florida coast', 'Stocks rally as Fed holds rates')
+    aggregator = make_aggregator(
+        {'us': {'name': 'US', 'feeds': [{'name': 'News', 'url': feed_server.url + '/news'}]}},
+        paywall={'enabled': True, 'known_paywalled_domains': ['nytimes.com']},
+    )
+    first = aggregator.aggregate()['us']['articles']
+    assert first and not any(article['is_paywalled'] for article in first)
+
+    parses = []
+    parse = aggregator.parser.parse
+    monkeypatch.setattr(aggregator.parser, 'parse', lambda *args: parses.append(args) or parse(*args))
+    # A verdict that changes between runs must reach cached articles
+    aggregator.paywall_detector.add_paywalled_domain('example.com')
+
+    second = aggregator.aggregate()['us']['articles']
+    assert parses == []
+    assert [article['title'] for article in second] == [article['title'] for article in first]
+    assert all(article['is_paywalled'] for article in second)
@@ -0,0 +1,56 @@
+"""The streaming fast path must give the same articles as feedparser."""
+import pytest
+
+from src.parser import FeedParser
+
+RSS = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>Example</title>
+<item><title>Storm hits Florida coast</title><link>https://example.com/storm</link>
+<pubDate>Thu, 01 Jan 2026 10:00:00 GMT</pubDate></item>
+<item><title>Stocks rally as Fed holds rates</title><link>https://example.com/stocks</link>
+<pubDate>Thu, 01 Jan 2026 08:30:00 -0500</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Example</title>
+<entry><title>Ukraine talks resume in Geneva</title>
+<link rel="alternate" href="https://example.com/talks"/><updated>2026-01-01T10:00:00Z</updated></entry>
+<entry><title>China unveils new trade plan</title>
+<link rel="alternate" href="https://example.com/trade"/><published>2026-01-01T09:00:00+02:00</published>
+<updated>2026-01-01T11:00:00+02:00</updated></entry>
+</feed>"""
+
+RDF = b"""<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+ xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel><title>Example</title></channel>
+<item><title>Local man wins lottery twice</title><link>https://example.com/lottery</link>
+<dc:date>2026-01-01T07:00:00Z</dc:date></item>
+</rdf:RDF>"""
+
+
+def _fields(articles):
+    return [(a.title, a.url, a.source, a.published, a.feed_position, a.popularity_score) for a in articles]
+
+
+@pytest.mark.parametrize('content', [RSS, ATOM, RDF], ids=['rss2', 'atom', 'rss1'])
+@pytest.mark.parametrize('max_entries', [0, 1])
+def test_fast_path_matches_feedparser(content, max_entries):
+    fast = FeedParser(fast_path=True, max_entries=max_entries).parse(content, 'Example', {})
+    slow = FeedParser(fast_path=False, max_entries=max_entries).parse(content, 'Example', {})
+    assert fast and _fields(fast) == _fields(slow)
+
+
+def test_unexpected_fast_path_error_falls_back(monkeypatch):
+    parser = FeedParser(fast_path=True)
+
+    def broken(*args):
+        raise ValueError('odd markup')
+    monkeypatch.setattr(parser, '_parse_fast', broken)
+
+    expected = FeedParser(fast_path=False).parse(RSS, 'Example', {})
+    assert _fields(parser.parse(RSS, 'Example', {})) == _fields(expected)
+
+
+def test_unparseable_feed_returns_nothing():
+    assert FeedParser().parse(b'\x00not a feed', 'Example', {}) == []
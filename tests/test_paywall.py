@@ -0,0 +1,124 @@
+"""Paywall verdicts: batch checks, the persistent verdict cache and domain inference."""
+import pytest
+
+from src import paywall_cache
+from src.paywall import PaywallDetector
+from src.paywall_cache import PaywallVerdictCache
+
+URLS = [
+    'https://www.nytimes.com/2026/01/01/world/story.html',
+    'https://markets.ft.com/data',
+    'https://example.com/free',
+    'https://news.example.org/locked',
+]
+
+
+@pytest.fixture
+def probes():
+    """Pages the fake probe knows (URL -> verdict, None = fetch failed), and the URLs it was asked for."""
+    return {'pages': {}, 'asked': []}
+
+
+def detector(probes, **options) -> PaywallDetector:
+    found = PaywallDetector(check_meta=True, **options)
+
+    def probe(url):
+        probes['asked'].append(url)
+        return probes['pages'].get(url, False)
+    found._probe = probe
+    return found
+
+
+def test_check_all_matches_is_paywalled(probes):
+    probes['pages'] = {'https://news.example.org/locked': True}
+    batch = detector(probes).check_all(URLS)
+    single = detector(probes)
+    assert batch == {url: single.is_paywalled(url) for url in URLS}
+    assert batch == {URLS[0]: True, URLS[1]: True, URLS[2]: False, URLS[3]: True}
+
+
+def test_probes_real_url_under_cache_key(probes):
+    found = detector(probes)
+    verdicts = found.check_all(
+        ['http://m.example.com/a?id=1', 'https://www.example.com/a?id=1'],
+        ['https://example.com/a', 'https://example.com/a']
+    )
+    assert verdicts == {'https://example.com/a': False}
+    assert probes['asked'] == ['http://m.example.com/a?id=1']
+
+
+def test_verdict_cache_persists_and_expires(tmp_path, probes, monkeypatch):
+    path = str(tmp_path / 'verdicts.json')
+    probes['pages'] = {'https://example.com/a': True}
+    first = detector(probes, verdict_cache=PaywallVerdictCache(path, ttl=3600))
+    assert first.check_all(['https://example.com/a']) == {'https://example.com/a': True}
+    first.save()
+
+    probes['pages'] = {'https://example.com/a': False}
+    assert detector(probes, verdict_cache=PaywallVerdictCache(path, ttl=3600)).is_paywalled('https://example.com/a')
+    assert probes['asked'] == ['https://example.com/a']
+
+    later = paywall_cache.time.time() + 7200
+    monkeypatch.setattr(paywall_cache.time, 'time', lambda: later)
+    assert not detector(probes, verdict_cache=PaywallVerdictCache(path, ttl=3600)).is_paywalled('https://example.com/a')
+
+
+def test_failed_probes_are_not_cached(tmp_path, probes):
+    cache = PaywallVerdictCache(str(tmp_path / 'verdicts.json'))
+    probes['pages'] = {'https://example.com/down': None}
+    assert detector(probes, verdict_cache=cache).is_paywalled('https://example.com/down') is False
+    assert cache.get('https://example.com/down') is None
+
+
+def test_least_recently_used_dropped(tmp_path):
+    cache = PaywallVerdictCache(str(tmp_path / 'verdicts.json'), max_entries=2)
+    cache.put('https://example.com/1', True)
+    cache.put('https://example.com/2', False)
+    cache.get('https://example.com/1')
+    cache.put('https://example.com/3', False)
+    assert cache.get('https://example.com/2') is None
+    assert cache.get('https://example.com/1') is True
+
+
+def test_domain_promotion_and_demotion(tmp_path):
+    cache = PaywallVerdictCache(str(tmp_path / 'verdicts.json'), window=5, min_samples=3, confidence=0.8)
+    for i in range(3):
+        assert cache.domain_verdict('example.com') is None
+        cache.put(f'https://example.com/{i}', True, 'example.com')
+    assert cache.domain_verdict('example.com') is True
+
+    cache.put('https://example.com/free-1', False, 'example.com')
+    assert cache.domain_verdict('example.com') is None  # 3 of 4 is below 0.8
+
+
+def test_promoted_domain_skips_probes_but_samples(tmp_path, probes, monkeypatch):
+    cache = PaywallVerdictCache(str(tmp_path / 'verdicts.json'), min_samples=3, reprobe_interval=3600)
+    probes['pages'] = {f'https://news.example.com/{i}': True for i in range(10)}
+    found = detector(probes, verdict_cache=cache, infer_domains=True)
+    assert found.check_all([f'https://news.example.com/{i}' for i in range(3)]) == {
+        f'https://news.example.com/{i}': True for i in range(3)
+    }
+    assert len(probes['asked']) == 3
+
+    # Promoted: other URLs on the domain take its verdict unprobed
+    assert found.is_paywalled('https://www.example.com/4')
+    assert len(probes['asked']) == 3
+
+    # One sample per reprobe interval
+    later = paywall_cache.time.time() + 3600
+    monkeypatch.setattr(paywall_cache.time, 'time', lambda: later)
+    assert found.check_all(['https://news.example.com/5', 'https://news.example.com/6']) == {
+        'https://news.example.com/5': True, 'https://news.example.com/6': True
+    }
+    assert len(probes['asked']) == 4
+
+
+def test_probe_holds_host_slot_until_body_is_read(feed_server):
+    for i in range(3):
+        feed_server.feeds[f'/page{i}'] = b'<html><body>Free to read</body></html>'
+        feed_server.delays[f'/page{i}'] = 0.3
+    found = PaywallDetector(check_meta=True, workers=4, per_host=1)
+    urls = [f'{feed_server.url}/page{i}' for i in range(3)]
+    assert found.check_all(urls) == dict.fromkeys(urls, False)
+    assert len(feed_server.requests) == 3
+    assert feed_server.peak == 1
@@ -0,0 +1,137 @@
+"""Streaming region pipeline: stage order, early stop at the rank stage and cancellation."""
+import pytest
+
+from src.deduplicator import ArticleDeduplicator
+from src.fetcher import ConcurrencyConfig, FeedFetcher, RetryConfig
+from src.parser import FeedParser
+from src.pipeline import DedupStage, FetchStage, MapStage, ParallelMapStage, Pipeline, RankStage
+from src.ranking import Ranker
+
+from .conftest import rss
+
+
+HEADLINES = [
+    'Senate passes budget after all-night session', 'Storm floods coastal towns', 'Court blocks new tariffs',
+    'Rocket launch delayed by high winds', 'Mayor unveils housing plan',
+    'Oil prices slide on demand fears', 'Coach fired after losing streak', 'Wildfire forces thousands to evacuate',
+    'Central bank holds rates steady', 'Chip maker opens factory',
+    'Quake shakes island nation', 'Police arrest bank robbery suspect', 'Drought threatens wheat harvest',
+    'Museum returns looted statues', 'Teachers strike over pay',
+    'Heat wave breaks records', 'Startup unveils electric ferry', 'Rescuers free trapped miners',
+    'Parliament debates voting age', 'Festival draws record crowds',
+]
+
+
+def feed_body(i):
+    return rss(*HEADLINES[i * 5:(i + 1) * 5], base=f'https://site{i}.example.com')
+
+
+@pytest.fixture
+def feeds(feed_server):
+    found = []
+    for i in range(4):
+        feed_server.feeds[f'/feed{i}'] = feed_body(i)
+        found.append({'name': f'Feed {i}', 'url': f'{feed_server.url}/feed{i}'})
+    return found
+
+
+def run_region(feeds, now, settings, region_data=None):
+    """Run fetch -> parse -> dedup -> rank; returns the selection, the parsed feed names and timings."""
+    fetcher = FeedFetcher(
+        'NewsAggregator/test', retry_config=RetryConfig(max_attempts=1), concurrency=ConcurrencyConfig(host_delay=0)
+    )
+    parser = FeedParser()
+    parsed, timings = [], {}
+
+    def parse(batch):
+        parsed.append(batch.feed['name'])
+        batch.articles = parser.parse(batch.response.content, batch.feed['name'], batch.response.headers)
+        return batch
+
+    ranker = Ranker.from_config(settings, region_data or {}, now)
+    with fetcher.start_all([feed['url'] for feed in feeds]) as pending:
+        selected = Pipeline('test', [
+            FetchStage(feeds, pending),
+            MapStage('parse', parse),
+            DedupStage(ArticleDeduplicator(0.85).session()),
+            RankStage(ranker),
+        ], hooks=[lambda name, stage, seconds, count: timings.__setitem__(stage, count)]).run()
+    return selected, parsed, timings
+
+
+def test_stops_pulling_once_quotas_are_filled(feeds, now):
+    settings = {'sort_by': 'popularity', 'headlines_per_region': 2}
+    selected, parsed, timings = run_region(feeds, now, settings)
+    # Each feed's top story is at the score bound, so two feeds fill the page
+    assert parsed == ['Feed 0', 'Feed 1']
+    assert [a.title for a in selected] == [HEADLINES[0], HEADLINES[5]]
+    assert timings == {'fetch': 2, 'parse': 2, 'dedup': 2, 'rank': 2}
+
+
+@pytest.mark.parametrize('settings', [
+    {'sort_by': 'published', 'headlines_per_region': 2},  # No upper bound
+    {'sort_by': 'popularity', 'headlines_per_region': 6},  # Only four stories at the bound
+])
+def test_reads_every_feed_when_quotas_stay_open(feeds, now, settings):
+    selected, parsed, _ = run_region(feeds, now, settings)
+    assert parsed == [feed['name'] for feed in feeds]
+    assert len(selected) == settings['headlines_per_region']
+
+
+def test_early_stop_selects_what_a_full_run_selects(feeds, now):
+    settings = {'sort_by': 'popularity', 'headlines_per_region': 3, 'max_per_source': 1}
+    selected, parsed, _ = run_region(feeds, now, settings)
+    assert len(parsed) == 3
+    parser = FeedParser()
+    everything = [
+        article for i, feed in enumerate(feeds)
+        for article in parser.parse(feed_body(i), feed['name'], {'content-type': 'application/rss+xml'})
+    ]
+    expected = Ranker.from_config(settings, {}, now).select(everything)
+    assert [(a.title, a.source) for a in selected] == [(a.title, a.source) for a in expected]
+
+
+class Handle:
+    def __init__(self, item):
+        self.item = item
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_parallel_stage_keeps_order_and_cancels_unconsumed_work():
+    handles = []
+
+    def submit(item):
+        handles.append(Handle(item))
+        return handles[-1]
+
+    stage = ParallelMapStage('work', submit, lambda item, handle: item * 10, lookahead=3)
+    assert list(stage.run(iter(range(5)))) == [0, 10, 20, 30, 40]
+    assert not any(handle.cancelled for handle in handles)
+
+    handles.clear()
+    results = stage.run(iter(range(10)))
+    assert [next(results), next(results)] == [0, 10]
+    results.close()
+    assert [h.item for h in handles if h.cancelled] == [2, 3]  # Submitted, never consumed
+
+
+def test_aggregator_cancels_feeds_no_region_needs(feed_server, feeds, make_aggregator):
+    for feed in feeds:
+        feed_server.delays[feed['url'].replace(feed_server.url, '')] = 0.3
+    feed_server.feeds['/later'] = rss('Later region story')
+    regions = {
+        'a_first': {'name': 'First', 'feeds': feeds},
+        'b_later': {'name': 'Later', 'feeds': [{'name': 'Later', 'url': feed_server.url + '/later'}]},
+    }
+    aggregator = make_aggregator(
+        regions, sort_by='popularity', headlines_per_region=2, rate_limit_delay=0,
+        concurrency={'max_workers': 1}, cache={'enabled': False}, parse_cache={'enabled': False}
+    )
+    result = aggregator.aggregate()
+    assert len(result['a_first']['articles']) == 2 and len(result['b_later']['articles']) == 1
+    # Feeds 0 and 1 fill the first page while feed 2 downloads. Feed 3 is
+    # cancelled rather than fetched ahead of the later region's feed.
+    assert feed_server.requests == ['/feed0', '/feed1', '/feed2', '/later']
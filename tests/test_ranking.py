@@ -0,0 +1,70 @@
+"""Ranker must select what the old sort-then-filter passes selected."""
+import random
+from datetime import timedelta
+
+import pytest
+
+from src.ranking import Ranker
+
+
+def sort_then_filter(articles, sort_by, max_per_source, max_per_sport, limit):
+    """The selection as aggregate() made it before the Ranker."""
+    if sort_by == 'popularity':
+        articles = sorted(articles, key=lambda a: a.popularity_score, reverse=True)
+    else:
+        articles = sorted(articles, key=lambda a: a.published, reverse=True)
+    for quota, group in ((max_per_source, lambda a: a.source), (max_per_sport, lambda a: a.sport or 'general')):
+        if quota > 0:
+            counts, kept = {}, []
+            for article in articles:
+                if counts.get(group(article), 0) < quota:
+                    counts[group(article)] = counts.get(group(article), 0) + 1
+                    kept.append(article)
+            articles = kept
+    return articles[:limit]
+
+
+@pytest.fixture
+def candidates(make_article, now):
+    rng = random.Random(4)
+    articles = []
+    for i in range(200):
+        position = rng.randrange(10)
+        articles.append(make_article(
+            f'Headline {i}',
+            source=f'Feed {rng.randrange(8)}',
+            sport=rng.choice(['', 'soccer', 'golf', 'tennis']),
+            # Coarse times and positions, so plenty of ties
+            published=now - timedelta(hours=rng.randrange(24)),
+            feed_position=position,
+            popularity_score=1 / (position + 1),
+        ))
+    return articles
+
+
+@pytest.mark.parametrize('sort_by', ['popularity', 'published'])
+@pytest.mark.parametrize('max_per_source', [0, 3])
+@pytest.mark.parametrize('max_per_sport', [0, 2])
+@pytest.mark.parametrize('limit', [5, 15, 500])
+def test_matches_sort_then_filter(candidates, now, sort_by, max_per_source, max_per_sport, limit):
+    settings = {'sort_by': sort_by, 'max_per_source': max_per_source, 'headlines_per_region': limit}
+    region = {'max_per_sport': max_per_sport}
+    selected = Ranker.from_config(settings, region, now).select(candidates)
+    assert selected == sort_then_filter(candidates, sort_by, max_per_source, max_per_sport, limit)
+
+
+def test_weighted_terms(make_article, now):
+    fresh_low = make_article('Fresh', published=now, feed_position=9, popularity_score=0.1)
+    old_top = make_article('Old', published=now - timedelta(hours=24), feed_position=0, popularity_score=1.0)
+    settings = {
+        'headlines_per_region': 2,
+        'ranking': {'terms': [{'type': 'position', 'weight': 1.0}, {'type': 'recency', 'weight': 2.0, 'half_life': 3600}]},
+    }
+    ranker = Ranker.from_config(settings, {}, now)
+    assert ranker.select([old_top, fresh_low]) == [fresh_low, old_top]
+    assert ranker.upper_bound == 3.0
+
+
+def test_unknown_term():
+    with pytest.raises(ValueError):
+        Ranker.from_config({'headlines_per_region': 1, 'ranking': {'terms': [{'type': 'clicks'}]}}, {}, None)
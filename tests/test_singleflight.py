@@ -0,0 +1,115 @@
+"""Single-flight sharing of in-progress work, directly and through the fetcher."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.fetcher import _FLIGHTS, ConcurrencyConfig, FeedFetcher, RetryConfig
+from src.singleflight import SingleFlight
+
+from .conftest import rss
+
+
+def run_together(flight, key, fn, callers=5, window=0.0):
+    """Call flight.do from several threads at once; returns each result or exception."""
+    def call():
+        try:
+            return flight.do(key, fn, window=window)
+        except Exception as e:
+            return e
+    with ThreadPoolExecutor(callers) as executor:
+        return list(executor.map(lambda _: call(), range(callers)))
+
+
+def slow(result, calls, seconds=0.2):
+    def fn():
+        calls.append(1)
+        time.sleep(seconds)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return fn
+
+
+def test_concurrent_callers_share_one_call():
+    flight, calls = SingleFlight(), []
+    assert run_together(flight, 'a', slow('payload', calls)) == ['payload'] * 5
+    assert len(calls) == 1
+
+    # Finished without a window: the next call runs again
+    assert flight.do('a', slow('again', calls)) == 'again'
+    assert len(calls) == 2
+
+
+def test_keys_do_not_share():
+    flight, calls = SingleFlight(), []
+    with ThreadPoolExecutor(2) as executor:
+        results = list(executor.map(lambda key: flight.do(key, slow(key, calls)), ['a', 'b']))
+    assert results == ['a', 'b'] and len(calls) == 2
+
+
+def test_errors_reach_every_waiter_and_are_not_kept():
+    flight, calls = SingleFlight(), []
+    error = ValueError('feed down')
+    results = run_together(flight, 'a', slow(error, calls), window=60)
+    assert all(result is error for result in results)
+    assert len(calls) == 1
+    assert flight.do('a', slow('recovered', calls), window=60) == 'recovered'
+
+
+def test_window_shares_finished_results():
+    flight, calls = SingleFlight(), []
+    assert flight.do('a', slow('first', calls, 0), window=0.2) == 'first'
+    assert flight.do('a', slow('second', calls, 0), window=0.2) == 'first'
+    assert len(calls) == 1
+
+    time.sleep(0.25)
+    assert flight.do('a', slow('third', calls, 0), window=0.2) == 'third'
+    flight.forget('a')
+    assert flight.do('a', slow('fourth', calls, 0), window=0.2) == 'fourth'
+
+    # None counts as a failure and is never shared
+    assert flight.do('b', slow(None, calls, 0), window=60) is None
+    assert flight.do('b', slow('found', calls, 0), window=60) == 'found'
+
+
+def test_forget_leaves_running_calls_alone():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fn():
+        started.set()
+        release.wait()
+        return 'done'
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, 'a', fn)
+        started.wait()
+        flight.forget('a')
+        follower = executor.submit(flight.do, 'a', lambda: pytest.fail('ran twice'))
+        time.sleep(0.05)
+        release.set()
+        assert leader.result() == follower.result() == 'done'
+
+
+def test_fetchers_share_a_request(feed_server):
+    feed_server.feeds['/shared'] = rss('Shared story')
+    feed_server.delays['/shared'] = 0.3
+    url = feed_server.url + '/shared'
+
+    def fetcher(window=0.0):
+        return FeedFetcher('NewsAggregator/test', retry_config=RetryConfig(max_attempts=1),
+                           concurrency=ConcurrencyConfig(host_delay=0, share_window=window))
+
+    with ThreadPoolExecutor(3) as executor:
+        responses = list(executor.map(lambda f: f.fetch(url), [fetcher(), fetcher(), fetcher()]))
+    assert all(response.content == rss('Shared story') for response in responses)
+    assert feed_server.requests == ['/shared']
+
+    # Finished fetches are reused within share_window
+    fetcher(window=60).fetch(url)
+    fetcher(window=60).fetch(url)
+    assert len(feed_server.requests) == 2
+    _FLIGHTS.forget(url)
+    fetcher().fetch(url)
+    assert len(feed_server.requests) == 3
@@ -0,0 +1,71 @@
+"""The story index must cluster like keep-first dedup within a session."""
+import random
+
+import pytest
+
+from src.deduplicator import ArticleDeduplicator
+from src.story_index import StoryIndex
+
+WORDS = (
+    'president senate vote budget storm flood court judge ruling election minister talks peace '
+    'deal trade tariffs market stocks rally oil prices inflation rates bank school fire rescue '
+    'police team coach wins final cup record city mayor council housing climate heat wildfire'
+).split()
+
+
+def near_duplicate_titles(count: int, seed: int = 1) -> list:
+    """Headlines where about a third rework an earlier one (shuffle, swap or add a word)."""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        if titles and rng.random() < 0.35:
+            words = rng.choice(titles).split()
+            operation = rng.random()
+            if operation < 0.4:
+                rng.shuffle(words)
+            elif operation < 0.7:
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            else:
+                words.append(rng.choice(WORDS))
+        else:
+            words = [rng.choice(WORDS) for _ in range(rng.randint(5, 9))]
+        titles.append(' '.join(words).capitalize())
+    return titles
+
+
+def cluster_in_batches(dedup: ArticleDeduplicator, articles: list, size: int = 25) -> list:
+    session = dedup.session()
+    ids = []
+    for start in range(0, len(articles), size):
+        ids += session.add(articles[start:start + size])
+    return ids
+
+
+@pytest.mark.parametrize('index', ['exact', 'token'])
+def test_empty_index_matches_keep_first(tmp_path, make_article, index):
+    articles = [make_article(title, url=f"https://example.com/{i}") for i, title in enumerate(near_duplicate_titles(400))]
+    # Repeat a few URLs, as feeds shared between regions do
+    articles += [make_article(articles[i].title, url=articles[i].url) for i in range(0, 400, 37)]
+
+    expected = cluster_in_batches(ArticleDeduplicator(0.72, index=index), articles)
+    stories = StoryIndex(str(tmp_path / 'stories.json'), 0.72, index=index)
+    assert cluster_in_batches(ArticleDeduplicator(0.72, index=index, story_index=stories), articles) == expected
+    assert len(set(expected)) < len(articles)
+
+
+@pytest.mark.parametrize('index', ['exact', 'token'])
+def test_joined_title_catches_later_near_duplicates(tmp_path, make_article, index):
+    path = str(tmp_path / 'stories.json')
+    stories = StoryIndex(path, 0.8, index=index)
+    dedup = ArticleDeduplicator(0.8, index=index, story_index=stories)
+    earlier = dedup.session().add([make_article('Senate passes budget bill after long night', url='https://example.com/1')])
+    stories.save()
+
+    # Next run: the first title joins the stored story by similarity, the
+    # second only resembles the first
+    later = StoryIndex(path, 0.8, index=index)
+    ids = ArticleDeduplicator(0.8, index=index, story_index=later).session().add([
+        make_article('Senate passes budget bill after long debate', url='https://example.com/2'),
+        make_article('Senate passes budget plan after long debate', url='https://example.com/3'),
+    ])
+    assert ids == earlier * 2
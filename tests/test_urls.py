@@ -0,0 +1,86 @@
+"""Canonical URL keys: every variant of one page must map to the same key."""
+import pytest
+
+from src.deduplicator import ArticleDeduplicator
+from src.urls import URLCanonicalizer
+
+
+@pytest.fixture
+def canonicalizer():
+    return URLCanonicalizer(domains={
+        'example.com': {'strip_params': ['ref*']},
+        'news.example.com': {'keep_params': ['id']},
+        'video.example.org': {'drop_query': True},
+    })
+
+
+@pytest.mark.parametrize('url, key', [
+    # Scheme, host prefixes, ports, trailing slashes and fragments
+    ('http://www.bbc.co.uk/news/world-1/', 'https://bbc.co.uk/news/world-1'),
+    ('https://m.bbc.co.uk/news/world-1#comments', 'https://bbc.co.uk/news/world-1'),
+    ('https://mobile.reuters.com/a', 'https://reuters.com/a'),
+    ('https://WWW.Reuters.com:443/a', 'https://reuters.com/a'),
+    ('https://reuters.com:8443/a', 'https://reuters.com:8443/a'),
+    ('https://m.co/a', 'https://m.co/a'),  # Prefix is the whole registrable name
+    # AMP paths
+    ('https://amp.cnn.com/amp/2026/story', 'https://cnn.com/2026/story'),
+    ('https://cnn.com/2026/story/amp', 'https://cnn.com/2026/story'),
+    ('https://cnn.com/2026/story.amp.html', 'https://cnn.com/2026/story.html'),
+    # Tracking parameters, including prefixes; the rest are sorted
+    ('https://site.net/a?utm_source=x&b=2&UTM_Medium=y&a=1&fbclid=z', 'https://site.net/a?a=1&b=2'),
+    ('https://site.net/a?utm_source=x', 'https://site.net/a'),
+    ('https://site.net/a?q=', 'https://site.net/a?q='),
+    # Per-domain rules apply to subdomains, longest domain first
+    ('https://example.com/a?ref_src=tw&page=2', 'https://example.com/a?page=2'),
+    ('https://blog.example.com/a?referrer=x', 'https://blog.example.com/a'),
+    ('https://news.example.com/story?id=7&ref=x&page=2', 'https://news.example.com/story?id=7'),
+    ('https://video.example.org/v?id=7', 'https://video.example.org/v'),
+    # Not web URLs: returned unchanged
+    ('mailto:desk@example.com', 'mailto:desk@example.com'),
+    ('/relative/path', '/relative/path'),
+    ('https://[::1/a', 'https://[::1/a'),
+])
+def test_canonical_key(canonicalizer, url, key):
+    assert canonicalizer.canonicalize(url) == key
+
+
+def test_variants_share_a_key():
+    variants = [
+        'https://www.theguardian.com/world/2026/jan/01/storm?utm_source=rss&CMP=share',
+        'http://amp.theguardian.com/world/2026/jan/01/storm/amp',
+        'https://m.theguardian.com/amp/world/2026/jan/01/storm/#top',
+        'https://theguardian.com/world/2026/jan/01/storm/?cmp=share&utm_medium=social',
+    ]
+    canonicalizer = URLCanonicalizer(domains={'theguardian.com': {'strip_params': ['CMP']}})
+    assert {canonicalizer.canonicalize(url) for url in variants} == {
+        'https://theguardian.com/world/2026/jan/01/storm'
+    }
+
+
+def test_variants_dedup_exactly(canonicalizer, make_article):
+    articles = [
+        make_article('Storm hits the coast', url='https://www.example.net/storm?utm_source=rss'),
+        make_article('Coast braces as storm arrives, live updates', url='https://example.net/amp/storm'),
+    ]
+    for article in articles:
+        article.canonical_url = canonicalizer.canonicalize(article.url)
+    assert articles[0].url_key == articles[1].url_key
+    ids = ArticleDeduplicator(0.9).cluster(articles)
+    assert ids[0] == ids[1]
+
+
+def test_memo(canonicalizer, monkeypatch):
+    monkeypatch.setattr(URLCanonicalizer, 'MEMO_SIZE', 2)
+    calls = []
+    original = canonicalizer._canonicalize
+    monkeypatch.setattr(canonicalizer, '_canonicalize', lambda url: calls.append(url) or original(url))
+
+    for _ in range(2):
+        assert canonicalizer.canonicalize('https://www.a.com/x') == 'https://a.com/x'
+    assert calls == ['https://www.a.com/x']
+
+    canonicalizer.canonicalize('https://b.com/x')
+    canonicalizer.canonicalize('https://c.com/x')  # Full: the memo starts over
+    assert len(canonicalizer._memo) == 1
+    canonicalizer.canonicalize('https://www.a.com/x')
+    assert calls[-1] == 'https://www.a.com/x' and len(calls) == 4